@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Instantánea del estado de la app entre ejecuciones, sin dependencias de Kivy.
+# Al cerrar (o al pasar a segundo plano en Android/iOS) se guarda un JSON pequeño con lo que el
+# usuario veía: tasas y su hora, frase, montos escritos, moneda y pantalla. Al arrancar se lee
+# de forma síncrona en build, así el primer frame ya es esa pantalla con sus datos y la red
+# solo refresca en segundo plano.
+import json
+import os
+import time
+
+from parsing import try_parse_decimal
+from rate_matrix import CURRENCIES
+
+APP_STATE_FILENAME = 'app_state.json'
+STATE_VERSION = 1 # Se cambia si cambia el formato; una instantánea de otra versión se ignora
+RESTORABLE_SCREENS = ('main', 'result', 'ves_to_usd')
+_INPUT_FIELDS = ('amount', 'date')
+_MAX_TEXT = 64 # Longitud máxima de un texto escrito que se guarda (los campos son de una línea)
+
+
+def _clean_text(value, limit=_MAX_TEXT):
+    return value[:limit] if isinstance(value, str) else ''
+
+
+def _clean(data):
+    """Valida una instantánea leída del disco; descarta los campos que no tienen el tipo esperado."""
+    if not isinstance(data, dict) or data.get('version') != STATE_VERSION:
+        raise ValueError("versión de instantánea desconocida")
+    prices = data.get('prices')
+    prices = {currency: float(price) for currency, price in prices.items()
+              if currency in CURRENCIES and isinstance(price, (int, float)) and price > 0} if isinstance(prices, dict) else {}
+    inputs = data.get('inputs') if isinstance(data.get('inputs'), dict) else {}
+    usd_amount = try_parse_decimal(data['usd_amount']) if isinstance(data.get('usd_amount'), str) else None
+    return {
+        'version': STATE_VERSION,
+        'saved_at': float(data.get('saved_at', 0.0)),
+        'prices': prices,
+        'fetched_at': float(data.get('fetched_at', 0.0)),
+        'quote': _clean_text(data.get('quote'), limit=1000),
+        'currency': data.get('currency') if data.get('currency') in CURRENCIES else '',
+        'conversion_date': _clean_text(data.get('conversion_date')),
+        'usd_amount': str(usd_amount) if usd_amount is not None else '0',
+        'inputs': {screen: {field: _clean_text(fields.get(field)) for field in _INPUT_FIELDS}
+                   for screen, fields in inputs.items()
+                   if screen in RESTORABLE_SCREENS and isinstance(fields, dict)},
+        'screen': data.get('screen') if data.get('screen') in RESTORABLE_SCREENS else '',
+    }
+
+
+class AppState:
+    """
+    Última instantánea guardada (self.snapshot, vacía si no hay ninguna utilizable).
+    Campos: prices ({moneda: bolívares por unidad}) y fetched_at (time.time() de su descarga),
+    quote, currency, conversion_date, usd_amount (texto decimal exacto del monto de la pantalla de resultados),
+    inputs ({pantalla: {'amount': texto, 'date': texto}}) y screen.
+    Solo se usa desde el hilo principal.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.snapshot = {}
+
+    def load(self):
+        """Lee la instantánea. Un archivo ausente, dañado o de otra versión equivale a no tener ninguna."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.snapshot = _clean(json.load(f))
+        except FileNotFoundError:
+            self.snapshot = {}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Warning: Ignoring unreadable app state '{self.path}': {e}")
+            self.snapshot = {}
+        return self
+
+    def usable_prices(self, max_age, now=None):
+        """Tasas de la instantánea si no superan max_age segundos de antigüedad; {} si no."""
+        now = time.time() if now is None else now
+        if not self.snapshot.get('prices') or now - self.snapshot['fetched_at'] > max_age:
+            return {}
+        return dict(self.snapshot['prices'])
+
+    def save(self, **fields):
+        """
+        Guarda una instantánea con los campos dados (ver la clase). Escritura atómica (archivo temporal
+        + reemplazo); no escribe si nada cambió desde la última instantánea leída o guardada.
+        """
+        snapshot = _clean(dict(fields, version=STATE_VERSION, saved_at=0.0))
+        previous = dict(self.snapshot, saved_at=0.0)
+        if snapshot == previous:
+            return False
+        snapshot['saved_at'] = time.time()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write app state '{self.path}': {e}")
+            return False
+        self.snapshot = snapshot
+        return True
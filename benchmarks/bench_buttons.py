@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de RoundedShadowButton: anima muchos botones (posición, tamaño y estado
+presionado) y mide el tiempo por frame y cuántas instrucciones gráficas se crean por frame.
+Compara la implementación actual (instrucciones retenidas) con la anterior
+(canvas.before.clear() y nuevas instrucciones en cada cambio).
+
+Uso: SDL_VIDEODRIVER=offscreen python benchmarks/bench_buttons.py [--buttons 200] [--frames 120]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from kivy.base import EventLoop # noqa: E402
+from kivy.graphics import Color, Rectangle, RoundedRectangle # noqa: E402
+from kivy.metrics import dp # noqa: E402
+from kivy.uix.floatlayout import FloatLayout # noqa: E402
+
+from main import RoundedShadowButton # noqa: E402
+
+
+class LegacyRoundedShadowButton(RoundedShadowButton):
+    """Versión anterior del dibujo: borra y vuelve a crear las instrucciones en cada cambio."""
+
+    def update_canvas_instructions(self, *args):
+        self.canvas.before.clear()
+        with self.canvas.before:
+            current_shadow_offset_y = self.shadow_offset_y
+            current_shadow_color = list(self.shadow_color)
+            if self.state == 'down':
+                current_shadow_offset_y = dp(1)
+                current_shadow_color[3] = 0.5
+            else:
+                current_shadow_color[3] = 1.0
+            Color(*current_shadow_color)
+            shadow_pos = (self.x - self.shadow_spread + self.shadow_offset_x,
+                          self.y - self.shadow_spread - current_shadow_offset_y)
+            shadow_size = (self.width + 2 * self.shadow_spread, self.height + 2 * self.shadow_spread)
+            if all(r == 0 for r in self.shadow_radius):
+                Rectangle(pos=shadow_pos, size=shadow_size)
+            else:
+                RoundedRectangle(pos=shadow_pos, size=shadow_size, radius=self.button_radius)
+            Color(*self.background_color)
+            RoundedRectangle(pos=self.pos, size=self.size, radius=self.button_radius)
+
+
+def run(button_class, count, frames):
+    """Devuelve (ms por frame [lista], instrucciones gráficas creadas por frame [mediana])."""
+    EventLoop.ensure_window()
+    window = EventLoop.window
+    root = FloatLayout()
+    buttons = [button_class(text=f"{i}", size_hint=(None, None), size=(dp(80), dp(40)),
+                            background_color=(0.1, 0.1, 0.1, 1), button_radius=[dp(12)] * 4,
+                            shadow_radius=[0] * 4)
+               for i in range(count)]
+    for button in buttons:
+        root.add_widget(button)
+    window.add_widget(root)
+    EventLoop.idle()
+
+    frame_times = []
+    created = []
+    for frame in range(frames):
+        before = {id(instruction) for button in buttons for instruction in button.canvas.before.children}
+        start = time.perf_counter()
+        for i, button in enumerate(buttons):
+            button.pos = ((i % 20) * dp(20) + frame % 7, (i // 20) * dp(30) + frame % 5)
+            button.width = dp(80) + frame % 3
+            button.state = 'down' if (i + frame) % 4 == 0 else 'normal'
+        EventLoop.idle() # Procesa el reloj y dibuja el frame
+        frame_times.append((time.perf_counter() - start) * 1000)
+        created.append(sum(1 for button in buttons for instruction in button.canvas.before.children
+                           if id(instruction) not in before))
+    window.remove_widget(root)
+    return frame_times, statistics.median(created)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--buttons', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=120)
+    args = parser.parse_args()
+
+    print(f"{args.buttons} botones, {args.frames} frames")
+    for label, button_class in (("anterior (clear + recrear)", LegacyRoundedShadowButton),
+                                ("actual (instrucciones retenidas)", RoundedShadowButton)):
+        frame_times, created = run(button_class, args.buttons, args.frames)
+        frame_times.sort()
+        p95 = frame_times[int(len(frame_times) * 0.95) - 1]
+        print(f"{label:<34} frame mediana {statistics.median(frame_times):7.2f} ms   p95 {p95:7.2f} ms   "
+              f"instrucciones creadas/frame {created:8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark del motor de conversión: rendimiento de convert_batch con 1.000.000 de montos.
+Uso: python benchmarks/bench_conversion.py [cantidad]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import conversion # noqa: E402
+import money # noqa: E402
+
+RATE = 36.5372
+
+
+def timed(label, func, count, repeat=3):
+    """Ejecuta func varias veces y muestra el mejor tiempo y los montos por segundo."""
+    best = min(_time_once(func) for _ in range(repeat))
+    print(f"{label:<32} {best * 1000:9.1f} ms   {count / best:14,.0f} montos/s")
+
+
+def _time_once(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+    amounts = [round(rng.uniform(0, 10_000), 2) for _ in range(count)]
+    np = money.load_numpy()
+    print(f"{count:,} montos, tasa {RATE}, NumPy: {'sí' if np is not None else 'no'}")
+
+    timed("bucle usd_to_ves (referencia)", lambda: [conversion.usd_to_ves(a, RATE) for a in amounts], count, repeat=1)
+    timed("convert_batch lista USD->VES", lambda: conversion.convert_batch(amounts, RATE), count)
+    if np is not None:
+        array = np.asarray(amounts)
+        timed("convert_batch ndarray USD->VES", lambda: conversion.convert_batch(array, RATE), count)
+        timed("convert_batch ndarray VES->USD",
+              lambda: conversion.convert_batch(array, RATE, conversion.VES_TO_USD), count)
+        timed("convert_batch generador", lambda: conversion.convert_batch(iter(amounts), RATE), count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark del layout de las pantallas sin pantalla física: arranca ConverterApp con la ventana
+offscreen de SDL y, en cada pantalla, cuenta los widgets y mide lo que cuesta rehacer el layout
+al cambiar el tamaño de la ventana:
+  rotate: alterna vertical / horizontal (rotación de un teléfono)
+  drag:   agranda el ancho de a poco (arrastrar el borde de la ventana)
+Por escenario se mide el tiempo de cada cambio de tamaño (hasta que no quedan layouts pendientes)
+y las pasadas de do_layout por clase.
+
+El resultado es JSON (a la salida estándar o a --output) y puede compararse con uno anterior:
+  python benchmarks/bench_layout.py --output layout.json
+  python benchmarks/bench_layout.py --baseline layout.json [--tolerance 0.25]
+Sale con código 1 si alguna pantalla empeora más que la tolerancia respecto a la base
+(widgets, pasadas de layout por cambio de tamaño o mediana del tiempo por cambio).
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_ui import LayoutCounter, percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_PREFIX = 'LAYOUT_RESULT '
+SCREENS = ('main', 'result', 'ves_to_usd')
+PORTRAIT, LANDSCAPE = (480, 800), (800, 480)
+DRAG_STEP = 4 # Píxeles de ancho por paso al arrastrar
+COMPARED_METRICS = ('widgets', 'layout_passes_per_resize', 'resize_ms_p50')
+# Diferencias de tiempo por debajo de esto se consideran ruido aunque superen la tolerancia
+MIN_RESIZE_DELTA_MS = 0.05
+
+
+def count_widgets(widget):
+    """Widgets del subárbol (incluido el propio widget)."""
+    count, stack = 0, [widget]
+    while stack:
+        widget = stack.pop()
+        count += 1
+        stack.extend(widget.children)
+    return count
+
+
+def scenario_sizes(name, resizes):
+    if name == 'rotate':
+        return [LANDSCAPE if i % 2 == 0 else PORTRAIT for i in range(resizes)]
+    return [(PORTRAIT[0] + DRAG_STEP * (i + 1), PORTRAIT[1]) for i in range(resizes)]
+
+
+def child(resizes):
+    """Arranca la app, mide cada pantalla y emite una línea RESULT_PREFIX + JSON."""
+    import runpy
+    sys.path.insert(0, ROOT)
+    sys.argv = [os.path.join(ROOT, 'main.py')]
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+
+    from kivy.app import App
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from kivy.uix.screenmanager import NoTransition
+
+    layouts = LayoutCounter()
+
+    def wait_until_ready(dt):
+        app = App.get_running_app()
+        if app is None or 'interactive' not in app.startup_times:
+            return True
+        if not set(SCREENS) <= set(app.sm.screen_names):
+            return True # Esperar a que prebuild_screens construya todas las pantallas
+        layouts.install()
+        app.sm.transition = NoTransition()
+        Clock.schedule_once(lambda dt: show(0), 0)
+        return False
+
+    results = []
+
+    def show(index):
+        if index == len(SCREENS):
+            print(RESULT_PREFIX + json.dumps(results), flush=True)
+            App.get_running_app().stop()
+            return
+        App.get_running_app().sm.current = SCREENS[index]
+        Window.size = PORTRAIT
+        # Se mide en otro frame: hasta entonces la pantalla anterior sigue en el árbol
+        Clock.schedule_once(lambda dt: measure(index), 0.1)
+
+    def measure(index):
+        screen_name = SCREENS[index]
+        widgets = count_widgets(App.get_running_app().sm.get_screen(screen_name))
+        for scenario in ('rotate', 'drag'):
+            sizes = scenario_sizes(scenario, resizes)
+            Window.size = PORTRAIT
+            Clock.tick_draw()
+            layouts.take()
+            gc.collect()
+            times = []
+            for size in sizes:
+                start = time.perf_counter()
+                Window.size = size
+                Clock.tick_draw() # Ejecuta los do_layout encadenados, como antes de dibujar un frame
+                times.append((time.perf_counter() - start) * 1000)
+            passes = layouts.take()
+            times.sort()
+            results.append({
+                'screen': screen_name,
+                'scenario': scenario,
+                'widgets': widgets,
+                'resizes': len(sizes),
+                'resize_ms_p50': round(statistics.median(times), 4),
+                'resize_ms_p95': round(percentile(times, 0.95), 4),
+                'resize_ms_max': round(times[-1], 4),
+                'layout_passes': sum(passes.values()),
+                'layout_passes_per_resize': round(sum(passes.values()) / len(sizes), 3),
+                'layout_passes_by_class': passes,
+            })
+        Clock.schedule_once(lambda dt: show(index + 1), 0)
+
+    Clock.schedule_interval(wait_until_ready, 0.05)
+    runpy.run_path(sys.argv[0], run_name='__main__')
+
+
+def compare(results, baseline, tolerance, min_resize_delta_ms=MIN_RESIZE_DELTA_MS):
+    """Lista de regresiones: métricas que superan a la base en más de `tolerance` (proporción)."""
+    base_by_key = {(item['screen'], item['scenario']): item for item in baseline}
+    regressions = []
+    for item in results:
+        base = base_by_key.get((item['screen'], item['scenario']), {})
+        for key in COMPARED_METRICS:
+            if not base.get(key):
+                continue
+            if key == 'resize_ms_p50' and item[key] - base[key] < min_resize_delta_ms:
+                continue
+            if item[key] > base[key] * (1 + tolerance):
+                regressions.append({'screen': item['screen'], 'scenario': item['scenario'], 'metric': key,
+                                    'baseline': base[key], 'current': item[key]})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resizes', type=int, default=200, help="Cambios de tamaño por pantalla y escenario")
+    parser.add_argument('--output', help="Archivo JSON de resultados (por defecto, la salida estándar)")
+    parser.add_argument('--baseline', help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Empeoramiento permitido respecto a la base (0.25 = 25%%)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.resizes)
+        return 0
+
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--resizes', str(args.resizes)]
+    env = dict(os.environ, SDL_VIDEODRIVER=os.environ.get('SDL_VIDEODRIVER', 'offscreen'))
+    proc = subprocess.run(command, capture_output=True, text=True, timeout=600, env=env)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+    if not lines:
+        print(f"La app no completó la medición.\n{proc.stderr[-2000:]}", file=sys.stderr)
+        return 2
+
+    report = {'python': sys.version.split()[0], 'resizes': args.resizes,
+              'results': json.loads(lines[-1][len(RESULT_PREFIX):])}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare(report['results'], json.load(f)['results'], args.tolerance)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    # Resumen legible en stderr, para no mezclarlo con el JSON
+    for item in report['results']:
+        print(f"{item['screen']:<11} {item['scenario']:<7} widgets {item['widgets']:3d}  "
+              f"cambio p50 {item['resize_ms_p50']:7.3f} ms  p95 {item['resize_ms_p95']:7.3f} ms  "
+              f"layouts/cambio {item['layout_passes_per_resize']:6.2f}", file=sys.stderr)
+    for regression in report.get('regressions', []):
+        print(f"REGRESIÓN {regression['screen']} ({regression['scenario']}): {regression['metric']} "
+              f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark del motor de dinero exacto (money.py) frente a float y decimal.Decimal.
+Convierte los mismos montos USD -> VES de las tres formas, mide el tiempo y compara
+los resultados y el total con el de Decimal (la referencia exacta).
+Uso: python benchmarks/bench_money.py [cantidad]
+"""
+import os
+import random
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import conversion # noqa: E402
+from money import Money, Rate, cents_batch, load_numpy, scale_batch # noqa: E402
+
+RATE = '36.5372'
+CENT = Decimal('0.01')
+
+
+def timed(label, func, count, repeat=3):
+    """Ejecuta func varias veces, muestra el mejor tiempo y los montos por segundo y devuelve el resultado."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<36} {best * 1000:9.1f} ms   {count / best:14,.0f} montos/s")
+    return result
+
+
+def float_engine(amounts, rate):
+    """Lo que hacían las pantallas: producto en float y round() a 2 decimales."""
+    return [round(a * rate, 2) for a in amounts]
+
+
+def decimal_engine(amounts, rate):
+    return [(a * rate).quantize(CENT, rounding=ROUND_HALF_UP) for a in amounts]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(42)
+    texts = [f"{rng.randrange(0, 1_000_000) / 100:.2f}" for _ in range(count)] # Montos con céntimos
+    floats = [float(t) for t in texts]
+    decimals = [Decimal(t) for t in texts]
+    moneys = [Money.of(t) for t in texts]
+    rate_float, rate_decimal, rate = float(RATE), Decimal(RATE), Rate.of(RATE)
+    np = load_numpy()
+    print(f"{count:,} montos, tasa {RATE}, NumPy: {'sí' if np is not None else 'no'}")
+
+    reference = timed("Decimal (quantize)", lambda: decimal_engine(decimals, rate_decimal), count)
+    as_float = timed("float (round)", lambda: float_engine(floats, rate_float), count)
+    as_money = timed("Money.mul (céntimos, uno a uno)", lambda: [m.mul(rate) for m in moneys], count)
+    batch = timed("convert_cents_batch (lista de floats)",
+                  lambda: conversion.convert_cents_batch(floats, rate)[0], count)
+    if np is not None:
+        cents = cents_batch(floats)
+        timed("scale_batch (int64 ya en céntimos)", lambda: scale_batch(cents, rate.num, rate.den), count)
+
+    expected = [int(d * 100) for d in reference]
+    total = sum(reference)
+    float_total = sum(as_float)
+    batch = batch.tolist() if hasattr(batch, 'tolist') else batch
+    print()
+    print(f"Total exacto (Decimal):          {total:,.2f}")
+    print(f"Total sumando floats:            {float_total:,.10f}  (error {float(Decimal(repr(float_total)) - total):+.2e})")
+    print(f"Total Money (sum):               {sum(as_money):,.2f}")
+    print(f"Total por lotes (céntimos):      {Money(sum(batch)):,.2f}")
+    print(f"Montos distintos de Decimal:     float {sum(round(f * 100) != e for f, e in zip(as_float, expected)):,}"
+          f" | Money {sum(m.cents != e for m, e in zip(as_money, expected)):,}"
+          f" | lotes {sum(b != e for b, e in zip(batch, expected)):,}")
+
+
+if __name__ == '__main__':
+    main()
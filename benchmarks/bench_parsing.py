@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark del lector de montos (parsing.parse_amount) frente a float() y a la
+limpieza anterior basada en replace()/split().
+Uso: python benchmarks/bench_parsing.py [cantidad]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsing import parse_amount # noqa: E402
+
+
+def legacy_clean(raw_price_str):
+    """Limpieza de precios usada antes de parsing.py (solo como referencia)."""
+    cleaned = raw_price_str.replace(',', '.')
+    if cleaned.count('.') > 1:
+        parts = cleaned.split('.')
+        if len(parts) > 1 and parts[-1].isdigit():
+            cleaned = "".join(parts[:-1]) + "." + parts[-1]
+        else:
+            cleaned = cleaned.replace('.', '', 1)
+    return float(cleaned) if cleaned.replace('.', '', 1).isdigit() else 0.0
+
+
+def timed(label, func, values):
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1e9 / len(values):8.0f} ns/monto   {len(values) / elapsed:12,.0f} montos/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(7)
+    amounts = [rng.uniform(0, 1_000_000) for _ in range(count)]
+    plain = [f"{a:.2f}" for a in amounts]
+    venezuelan = [f"{a:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.') for a in amounts]
+    international = [f"{a:,.2f}" for a in amounts]
+
+    print(f"{count:,} montos por caso")
+    timed("float() '1234.56' (referencia)", float, plain)
+    timed("legacy_clean '1234.56'", legacy_clean, plain)
+    timed("parse_amount '1234.56'", parse_amount, plain)
+    timed("legacy_clean '1.234,56'", legacy_clean, venezuelan)
+    timed("parse_amount '1.234,56'", parse_amount, venezuelan)
+    timed("parse_amount '1,234.56'", parse_amount, international)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Simulación de las fuentes de la tasa con servidores locales de latencia configurable.
+Mide cuánto tarda cada consulta con hedging (ProviderPool.fetch_hedged), qué fuente responde
+y cómo cambia la preferencia cuando la fuente principal es lenta o falla.
+
+Uso: python benchmarks/bench_providers.py [--requests 30] [--delays 2.0,0.1] [--errors 0,0]
+                                           [--hedge-delay 0.3]
+  --delays: segundos de respuesta de cada servidor, en el orden de preferencia inicial.
+  --errors: proporción de respuestas 503 de cada servidor.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_loop import FetchLoop # noqa: E402
+from http_client import HttpClient # noqa: E402
+from rate_sources import ProviderPool, RateProvider # noqa: E402
+
+
+def start_server(delay, error_rate, price):
+    """Servidor local que responde {"price": ...} tras `delay` segundos (o 503 con `error_rate`)."""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(delay)
+            if random.random() < error_rate:
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = json.dumps({'price': price}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--delays', default='2.0,0.1')
+    parser.add_argument('--errors', default=None)
+    parser.add_argument('--hedge-delay', type=float, default=0.3)
+    args = parser.parse_args()
+
+    delays = [float(d) for d in args.delays.split(',')]
+    errors = [float(e) for e in args.errors.split(',')] if args.errors else [0.0] * len(delays)
+    servers = [start_server(delay, error_rate, '36,75') for delay, error_rate in zip(delays, errors)]
+    providers = [RateProvider(f"local-{i} ({delay}s, {error_rate:.0%} err)",
+                              f"http://127.0.0.1:{server.server_port}/rate")
+                 for i, (server, delay, error_rate) in enumerate(zip(servers, delays, errors))]
+    pool = ProviderPool(providers, hedge_delay=args.hedge_delay)
+    http = HttpClient(retries=0)
+    loop = FetchLoop(deliver=lambda callback, result, error: callback(result, error),
+                     max_workers=len(providers) * 2).start()
+
+    latencies, winners, failures = [], {}, 0
+    sys.stdout, real_stdout = open(os.devnull, 'w'), sys.stdout # Silencia los DEBUG de las fuentes
+    try:
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            try:
+                price, provider = loop.submit(pool.fetch_hedged(loop.run_blocking, http)).result()
+            except Exception:
+                failures += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            name = provider.name if provider else 'sin precio'
+            winners[name] = winners.get(name, 0) + 1
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+        loop.stop()
+        http.close()
+        for server in servers:
+            server.shutdown()
+
+    print(f"{args.requests} consultas, hedge_delay {args.hedge_delay}s, fallidas {failures}")
+    if latencies:
+        latencies.sort()
+        p95 = latencies[max(0, int(round(len(latencies) * 0.95)) - 1)]
+        print(f"latencia de extremo a extremo: p50 {statistics.median(latencies):8.1f} ms   p95 {p95:8.1f} ms")
+    print("respuestas usadas por fuente:")
+    for name, count in sorted(winners.items(), key=lambda item: -item[1]):
+        print(f"  {name:<28} {count}")
+    print("estadísticas por fuente (intentos recientes):")
+    for name, stats in pool.stats().items():
+        print(f"  {name:<28} {stats}")
+    print("orden de preferencia final:", [provider.name for provider in pool.ranked()])
+
+
+if __name__ == '__main__':
+    main()
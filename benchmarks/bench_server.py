@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Prueba de carga del modo servicio ("python main.py --serve").
+Abre varias conexiones persistentes y mide peticiones por segundo y latencias p50/p95/p99.
+Sin --url arranca un servidor propio en otro proceso, con un caché temporal (no usa la red).
+
+Uso: python benchmarks/bench_server.py [--url http://127.0.0.1:8765] [--connections 50]
+                                       [--duration 5] [--path "/convert?amount=10&from=EUR"]
+                                       [--batch 0]
+  --batch N: en vez de GET a --path, envía POST /convert/batch con N montos por petición.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_local_server(cache_dir):
+    """Servidor en un proceso aparte con tasas fijas en un caché recién escrito (sin refrescos)."""
+    cache_path = os.path.join(cache_dir, 'bcv_rate_cache.json')
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'price': 36.5, 'fetched_at': time.time(), 'source': 'benchmark', 'validators': None,
+                   'prices': {'USD': 36.5, 'EUR': 39.8, 'CNY': 5.05}}, f)
+    port = free_port()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'main.py'), '--serve', '--port', str(port),
+                                '--cache', cache_path, '--refresh-interval', '0'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("El servidor no arrancó a tiempo")
+
+
+def build_request(host, path, batch):
+    if batch:
+        body = json.dumps({'amounts': [f"{i},50" for i in range(batch)], 'from': 'USD', 'to': 'VES'}).encode()
+        return (f"POST /convert/batch HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+    return f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+
+
+async def client(host, port, request, stop_at, latencies, statuses):
+    """Una conexión keep-alive que repite la petición hasta stop_at; registra latencia y código de cada respuesta."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = int(head[9:12])
+            length = int(head.lower().split(b'content-length:')[1].split(b'\r\n')[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(url, connections, duration, path, batch):
+    parts = urlsplit(url)
+    request = build_request(parts.netloc, path, batch)
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    stop_at = start + duration
+    await asyncio.gather(*(client(parts.hostname, parts.port, request, stop_at, latencies, statuses)
+                           for _ in range(connections)))
+    return latencies, statuses, time.perf_counter() - start
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[max(0, int(round(len(sorted_values) * fraction)) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url')
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--path', default='/convert?amount=10&from=EUR&to=VES')
+    parser.add_argument('--batch', type=int, default=0)
+    args = parser.parse_args()
+
+    process = None
+    with tempfile.TemporaryDirectory() as cache_dir:
+        url = args.url
+        if url is None:
+            process, url = start_local_server(cache_dir)
+        try:
+            latencies, statuses, seconds = asyncio.run(run(url, args.connections, args.duration, args.path, args.batch))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    target = f"POST /convert/batch ({args.batch} montos)" if args.batch else f"GET {args.path}"
+    print(f"{target} | {args.connections} conexiones | {seconds:.1f} s | respuestas por código: {statuses}")
+    if latencies:
+        latencies.sort()
+        print(f"{len(latencies) / seconds:,.0f} peticiones/s")
+        print(f"latencia: p50 {percentile(latencies, 0.50) * 1000:7.2f} ms   "
+              f"p95 {percentile(latencies, 0.95) * 1000:7.2f} ms   "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.2f} ms   "
+              f"máx {latencies[-1] * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
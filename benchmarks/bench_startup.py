@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de arranque en frío: lanza la app varias veces en procesos nuevos y mide
+el tiempo hasta el primer frame, hasta que la pantalla inicial es usable (interactive) y hasta
+que además muestra una tasa (useful_screen).
+
+Por defecto usa los datos guardados del usuario: a partir de la segunda ejecución la app
+arranca desde la instantánea del último cierre (app_state.json). Con --fresh cada ejecución
+usa una carpeta de datos vacía, como un primer arranque (la tasa depende entonces de la red).
+
+Uso: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 1500] [--fresh] [--useful-timeout 10]
+Sin pantalla (CI/servidores): SDL_VIDEODRIVER=offscreen python benchmarks/bench_startup.py
+Sale con código 1 si la mediana de 'interactive' supera el presupuesto.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_PREFIX = 'STARTUP_RESULT '
+
+
+def child(useful_timeout):
+    """
+    Arranca la app, espera a que sea interactiva y a que muestre una tasa (como mucho
+    useful_timeout segundos más), imprime los tiempos y sale.
+    """
+    import runpy
+    sys.path.insert(0, ROOT)
+    sys.argv = [os.path.join(ROOT, 'main.py')]
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+    from kivy.app import App
+    from kivy.clock import Clock
+
+    interactive_at = []
+
+    def check(dt):
+        app = App.get_running_app()
+        if app is None or 'interactive' not in app.startup_times:
+            return True
+        if not interactive_at:
+            interactive_at.append(time.monotonic())
+        if 'useful_screen' in app.startup_times or time.monotonic() - interactive_at[0] >= useful_timeout:
+            print(RESULT_PREFIX + json.dumps(app.startup_times), flush=True)
+            app.stop()
+            return False
+        return True
+
+    Clock.schedule_interval(check, 0.02)
+    runpy.run_path(sys.argv[0], run_name='__main__')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=1500.0, help="Presupuesto para 'interactive' (mediana)")
+    parser.add_argument('--fresh', action='store_true',
+                        help='Cada ejecución con una carpeta de datos vacía (sin caché ni instantánea)')
+    parser.add_argument('--useful-timeout', type=float, default=10.0,
+                        help="Segundos que se espera a 'useful_screen' después de 'interactive'")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.useful_timeout)
+        return 0
+
+    runs = []
+    for i in range(args.runs):
+        env = dict(os.environ)
+        with tempfile.TemporaryDirectory() as data_home:
+            if args.fresh:
+                env['XDG_CONFIG_HOME'] = data_home # user_data_dir de Kivy en Linux
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child',
+                                   '--useful-timeout', str(args.useful_timeout)],
+                                  capture_output=True, text=True, timeout=120 + args.useful_timeout, env=env)
+        lines = [line for line in proc.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+        if not lines:
+            print(f"Ejecución {i + 1}: la app no llegó a ser interactiva.\n{proc.stderr[-2000:]}")
+            return 2
+        runs.append(json.loads(lines[-1][len(RESULT_PREFIX):]))
+
+    phases = sorted({phase for run in runs for phase in run}, key=lambda phase: max(run.get(phase, 0) for run in runs))
+    kind = 'primeros arranques (sin datos guardados)' if args.fresh else 'arranques en frío'
+    print(f"{args.runs} {kind} (ms desde el inicio del proceso):")
+    for phase in phases:
+        values = [run[phase] for run in runs if phase in run]
+        missing = f"   (falta en {len(runs) - len(values)})" if len(values) < len(runs) else ''
+        print(f"  {phase:<20} mediana {statistics.median(values):8.1f}   min {min(values):8.1f}"
+              f"   max {max(values):8.1f}{missing}")
+    useful = [run['useful_screen'] for run in runs if 'useful_screen' in run]
+    print("useful_screen: " + (f"{statistics.median(useful):.1f} ms (mediana)" if useful
+                                else f"sin tasa que mostrar tras {args.useful_timeout:.0f} s"))
+
+    interactive = statistics.median(run['interactive'] for run in runs)
+    within_budget = interactive <= args.budget_ms
+    print(f"interactive: {interactive:.1f} ms / presupuesto {args.budget_ms:.0f} ms -> "
+          f"{'OK' if within_budget else 'EXCEDIDO'}")
+    return 0 if within_budget else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
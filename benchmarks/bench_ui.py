@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la interfaz sin pantalla: arranca ConverterApp con la ventana offscreen de SDL,
+recorre main -> result -> main -> ves_to_usd -> main varias veces y mide en cada transición:
+tiempos de frame, pasadas de layout (do_layout) por clase, widgets e instrucciones gráficas
+en el árbol, y asignaciones (bloques de memoria y recolecciones del GC; bytes con --tracemalloc).
+
+El resultado es JSON (a la salida estándar o a --output) y puede compararse con uno anterior:
+  python benchmarks/bench_ui.py --output ui.json
+  python benchmarks/bench_ui.py --baseline ui.json [--tolerance 0.25]
+Sale con código 1 si alguna transición empeora más que la tolerancia respecto a la base
+(mediana del frame, pasadas de layout por frame, widgets o instrucciones).
+
+Los frames no se limitan a 60 fps (maxfps = 0), así el tiempo de frame refleja el trabajo de cada uno.
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_PREFIX = 'UI_RESULT '
+
+# (nombre, pantalla de origen, acción que navega) en el orden del recorrido
+FLOW = (
+    ('main->result', 'main', lambda sm: _convert_on_main(sm)),
+    ('result->main', 'result', lambda sm: sm.get_screen('result').go_back(None)),
+    ('main->ves_to_usd', 'main', lambda sm: sm.get_screen('main').go_to_ves_usd_screen(None)),
+    ('ves_to_usd->main', 'ves_to_usd', lambda sm: sm.get_screen('ves_to_usd').go_back(None)),
+)
+# Métricas que se comparan con la base (valores mayores son peores). Las pasadas de layout se comparan
+# por frame porque su total depende de cuántos frames dure la animación de la transición.
+COMPARED_METRICS = ('frame_ms_p50', 'layout_passes_per_frame', 'widgets', 'instructions')
+# Diferencias de tiempo de frame por debajo de esto se consideran ruido aunque superen la tolerancia
+MIN_FRAME_DELTA_MS = 0.5
+
+
+def _convert_on_main(sm):
+    screen = sm.get_screen('main')
+    screen.usd_input.text = '125,50'
+    screen.convert_currency(None)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[max(0, int(round(len(sorted_values) * fraction)) - 1)]
+
+
+class LayoutCounter:
+    """Cuenta las pasadas de do_layout por clase; las llamadas anidadas de super() cuentan una vez."""
+
+    def __init__(self):
+        self.counts = {}
+        self._active = set()
+
+    def install(self):
+        from kivy.uix.layout import Layout
+        pending, classes = [Layout], []
+        while pending:
+            cls = pending.pop()
+            classes.append(cls)
+            pending.extend(cls.__subclasses__())
+        for cls in classes:
+            if 'do_layout' in vars(cls):
+                cls.do_layout = self._wrap(cls.do_layout)
+        return self
+
+    def _wrap(self, do_layout):
+        counter = self
+
+        def counted_do_layout(self, *args, **kwargs):
+            key = id(self)
+            if key in counter._active:
+                return do_layout(self, *args, **kwargs)
+            counter._active.add(key)
+            name = type(self).__name__
+            counter.counts[name] = counter.counts.get(name, 0) + 1
+            try:
+                return do_layout(self, *args, **kwargs)
+            finally:
+                counter._active.discard(key)
+        return counted_do_layout
+
+    def take(self):
+        counts, self.counts = self.counts, {}
+        return counts
+
+
+def count_tree(sm):
+    """Widgets e instrucciones gráficas de todas las pantallas construidas (visibles o no)."""
+    widgets = instructions = 0
+    stack = [sm] + [screen for screen in sm.screens if screen.parent is None]
+    while stack:
+        widget = stack.pop()
+        widgets += 1
+        for canvas in (widget.canvas.before, widget.canvas, widget.canvas.after):
+            instructions += len(canvas.children)
+        stack.extend(widget.children)
+    return widgets, instructions
+
+
+def gc_collections():
+    return sum(stats['collections'] for stats in gc.get_stats())
+
+
+def child(rounds, warmup, use_tracemalloc):
+    """Arranca la app, recorre el flujo y emite una línea RESULT_PREFIX + JSON."""
+    import runpy
+    sys.path.insert(0, ROOT)
+    sys.argv = [os.path.join(ROOT, 'main.py')]
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+
+    from kivy.config import Config
+    Config.set('graphics', 'maxfps', '0')
+    from kivy.app import App
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    if use_tracemalloc:
+        import tracemalloc
+        tracemalloc.start()
+
+    layouts = LayoutCounter()
+    transitions = []
+    steps = [(round_index, step) for round_index in range(warmup + rounds) for step in FLOW]
+    state = {'frames': [], 'measuring': None}
+
+    def on_flip(window):
+        if state['measuring'] is not None:
+            state['frames'].append(time.perf_counter())
+
+    def wait_until_ready(dt):
+        app = App.get_running_app()
+        if app is None or 'interactive' not in app.startup_times:
+            return True
+        if not {'main', 'result', 'ves_to_usd'} <= set(app.sm.screen_names):
+            return True # Esperar a que prebuild_screens construya todas las pantallas
+        if app.sm.current != 'main' or app.sm.transition.is_active:
+            app.sm.current = 'main' # La app pudo abrir la pantalla guardada en el último cierre
+            return True
+        layouts.install()
+        Window.bind(on_flip=on_flip)
+        app.sm.transition.bind(on_complete=lambda *args: Clock.schedule_once(finish_step, 0))
+        Clock.schedule_once(start_step, 0.1)
+        return False
+
+    def start_step(dt):
+        app = App.get_running_app()
+        if not steps:
+            print(RESULT_PREFIX + json.dumps({'startup_ms': app.startup_times, 'transitions': transitions}),
+                  flush=True)
+            app.stop()
+            return
+        round_index, (name, origin, action) = steps[0]
+        if app.sm.current != origin:
+            print(f"Error: expected screen '{origin}' before {name}, found '{app.sm.current}'", file=sys.stderr)
+            app.stop()
+            return
+        layouts.take()
+        gc.collect()
+        state.update(frames=[time.perf_counter()], measuring=name,
+                     blocks=sys.getallocatedblocks(), collections=gc_collections(), started=time.perf_counter())
+        if use_tracemalloc:
+            tracemalloc.reset_peak()
+            state['traced'] = tracemalloc.get_traced_memory()[0]
+        action(app.sm)
+
+    def finish_step(dt):
+        # Se mide un frame más tras on_complete: el primero que ya se dibuja con la pantalla final
+        Clock.schedule_once(record_step, 0)
+
+    def record_step(dt):
+        app = App.get_running_app()
+        round_index, (name, origin, action) = steps.pop(0)
+        frames = state['frames']
+        frame_ms = sorted((b - a) * 1000 for a, b in zip(frames, frames[1:]))
+        widgets, instructions = count_tree(app.sm)
+        passes = layouts.take()
+        result = {
+            'name': name,
+            'round': round_index,
+            'warmup': round_index < warmup,
+            'duration_ms': round((time.perf_counter() - state['started']) * 1000, 2),
+            'frames': len(frame_ms),
+            'frame_ms_p50': round(statistics.median(frame_ms), 3) if frame_ms else None,
+            'frame_ms_p95': round(percentile(frame_ms, 0.95), 3) if frame_ms else None,
+            'frame_ms_max': round(frame_ms[-1], 3) if frame_ms else None,
+            'layout_passes': sum(passes.values()),
+            'layout_passes_per_frame': round(sum(passes.values()) / max(1, len(frame_ms)), 3),
+            'layout_passes_by_class': passes,
+            'widgets': widgets,
+            'instructions': instructions,
+            'allocated_blocks_delta': sys.getallocatedblocks() - state['blocks'],
+            'gc_collections': gc_collections() - state['collections'],
+        }
+        if use_tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            result['traced_bytes_delta'] = current - state['traced']
+            result['traced_bytes_peak'] = peak - state['traced']
+        transitions.append(result)
+        state['measuring'] = None
+        Clock.schedule_once(start_step, 0.05)
+
+    Clock.schedule_interval(wait_until_ready, 0.05)
+    runpy.run_path(sys.argv[0], run_name='__main__')
+
+
+def summarize(transitions):
+    """Por transición (sin las rondas de calentamiento): medianas de cada métrica numérica."""
+    summary = {}
+    for name, _, _ in FLOW:
+        runs = [t for t in transitions if t['name'] == name and not t['warmup']]
+        if not runs:
+            continue
+        metrics = {}
+        for key, value in runs[0].items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and key != 'round':
+                values = [run[key] for run in runs if run.get(key) is not None]
+                if values:
+                    metrics[key] = round(statistics.median(values), 3)
+        metrics['runs'] = len(runs)
+        summary[name] = metrics
+    return summary
+
+
+def compare(summary, baseline, tolerance, min_frame_delta_ms=MIN_FRAME_DELTA_MS):
+    """Lista de regresiones: métricas que superan a la base en más de `tolerance` (proporción)."""
+    regressions = []
+    for name, metrics in summary.items():
+        base = baseline.get(name, {})
+        for key in COMPARED_METRICS:
+            if key in metrics and base.get(key):
+                if key == 'frame_ms_p50' and metrics[key] - base[key] < min_frame_delta_ms:
+                    continue
+                if metrics[key] > base[key] * (1 + tolerance):
+                    regressions.append({'transition': name, 'metric': key,
+                                        'baseline': base[key], 'current': metrics[key]})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=5, help="Recorridos completos medidos")
+    parser.add_argument('--warmup', type=int, default=1, help="Recorridos iniciales excluidos del resumen")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="Mide también los bytes asignados (más lento: afecta a los tiempos de frame)")
+    parser.add_argument('--output', help="Archivo JSON de resultados (por defecto, la salida estándar)")
+    parser.add_argument('--baseline', help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Empeoramiento permitido respecto a la base (0.25 = 25%%)")
+    parser.add_argument('--min-frame-delta-ms', type=float, default=MIN_FRAME_DELTA_MS,
+                        help="Diferencia mínima de tiempo de frame (ms) para contar como regresión")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.rounds, args.warmup, args.tracemalloc)
+        return 0
+
+    command = [sys.executable, os.path.abspath(__file__), '--child',
+               '--rounds', str(args.rounds), '--warmup', str(args.warmup)]
+    if args.tracemalloc:
+        command.append('--tracemalloc')
+    env = dict(os.environ, SDL_VIDEODRIVER=os.environ.get('SDL_VIDEODRIVER', 'offscreen'))
+    proc = subprocess.run(command, capture_output=True, text=True, timeout=600, env=env)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+    if not lines:
+        print(f"La app no completó el recorrido.\n{proc.stderr[-2000:]}", file=sys.stderr)
+        return 2
+    raw = json.loads(lines[-1][len(RESULT_PREFIX):])
+
+    report = {
+        'python': sys.version.split()[0],
+        'rounds': args.rounds,
+        'warmup': args.warmup,
+        'startup_ms': raw['startup_ms'],
+        'summary': summarize(raw['transitions']),
+        'transitions': raw['transitions'],
+    }
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare(report['summary'], json.load(f)['summary'], args.tolerance,
+                                            args.min_frame_delta_ms)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    # Resumen legible en stderr, para no mezclarlo con el JSON
+    for name, metrics in report['summary'].items():
+        print(f"{name:<18} frame p50 {metrics.get('frame_ms_p50', 0):7.2f} ms  p95 {metrics.get('frame_ms_p95', 0):7.2f} ms  "
+              f"frames {metrics['frames']:5.0f}  layouts {metrics['layout_passes']:5.0f}  "
+              f"widgets {metrics['widgets']:4.0f}  instrucciones {metrics['instructions']:5.0f}  "
+              f"bloques {metrics['allocated_blocks_delta']:+8.0f}", file=sys.stderr)
+    for regression in report.get('regressions', []):
+        print(f"REGRESIÓN {regression['transition']}: {regression['metric']} "
+              f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
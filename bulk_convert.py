@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+Conversión masiva de montos USD <-> VES desde archivos CSV o JSONL.
+
+Uso: python main.py convert ENTRADA SALIDA [opciones]
+     (o directamente: python bulk_convert.py ENTRADA SALIDA [opciones])
+
+El archivo se procesa como un flujo de bloques de filas (generadores), por lo que la memoria
+usada no depende del tamaño del archivo. Con --workers N los bloques se convierten en N procesos.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from functools import partial
+
+from conversion import USD_TO_VES, VES_TO_USD, convert_cents_batch
+from money import DEFAULT_ROUNDING, ROUNDING_MODES, format_cents
+from parsing import try_parse_decimal
+from rate_cache import RateCache, default_cache_path, DEFAULT_CACHE_TTL, DEFAULT_MAX_STALE_AGE
+from rate_history import RateHistory, default_history_path
+from rate_matrix import CURRENCIES, USD, VES, RateMatrix
+
+IO_BUFFER_SIZE = 1 << 20 # 1 MiB de buffer de lectura/escritura
+DEFAULT_CHUNK_ROWS = 10_000
+
+# Historial de tasas de cada proceso de trabajo: se recibe una sola vez al crear el proceso
+# (ver _init_worker) en lugar de serializarlo con cada bloque
+_worker_history = None
+
+
+def detect_format(path, explicit=None):
+    """Devuelve 'csv' o 'jsonl' según la opción explícita o la extensión del archivo."""
+    if explicit:
+        return explicit
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def chunked(iterable, size):
+    """Agrupa un iterable en listas de hasta `size` elementos, sin leerlo completo."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _convert_amounts(values, rate, direction, dates=None, history=None, rounding=DEFAULT_ROUNDING):
+    """
+    Convierte una lista de montos exactos (Decimal, None para los inválidos) de forma vectorizada;
+    cada resultado se redondea una sola vez a céntimos.
+    Si se pasan `dates` y `history`, cada monto usa la tasa vigente en su fecha.
+    Devuelve (lista paralela con el resultado formateado, cantidad de montos sin convertir,
+    suma exacta en céntimos de los montos convertidos); el resultado es '' si el monto o su tasa
+    no eran válidos.
+    """
+    if history is not None:
+        rates = history.rates_on(dates)
+        values = [v if r > 0 else None for v, r in zip(values, rates)] # r es NaN o 0 sin tasa
+        rate = [r for v, r in zip(values, rates) if v is not None]
+    valid = [v for v in values if v is not None]
+    cents = []
+    if valid:
+        cents, _ = convert_cents_batch(valid, rate, direction, rounding)
+        cents = cents.tolist() if hasattr(cents, 'tolist') else cents # Enteros de Python: suma sin desbordes
+    converted = iter(cents)
+    return ['' if v is None else format_cents(next(converted)) for v in values], values.count(None), sum(cents)
+
+
+def convert_csv_chunk(rows, column_index, rate, direction, date_index=None, history=None, rounding=DEFAULT_ROUNDING):
+    """
+    Convierte un bloque de filas CSV (listas de celdas) y devuelve (texto_csv, filas, errores, total en céntimos).
+    A cada fila se le añade una columna con el monto convertido.
+    """
+    values = [try_parse_decimal(row[column_index]) if column_index < len(row) else None for row in rows]
+    dates = None
+    if history is not None:
+        dates = [row[date_index] if date_index < len(row) else '' for row in rows]
+    results, errors, total = _convert_amounts(values, rate, direction, dates, history, rounding)
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    for row, result in zip(rows, results):
+        row.append(result)
+        writer.writerow(row)
+    return out.getvalue(), len(rows), errors, total
+
+
+def convert_jsonl_chunk(lines, key, output_key, rate, direction, date_key=None, history=None,
+                        rounding=DEFAULT_ROUNDING):
+    """
+    Convierte un bloque de líneas JSONL y devuelve (texto_jsonl, filas, errores, total en céntimos).
+    Cada objeto recibe la clave `output_key` con el monto convertido como texto exacto ("365.18";
+    null si era inválido). Los números se leen como Decimal y se escriben con sus dígitos originales.
+    """
+    records = []
+    values = []
+    dates = []
+    for line in lines:
+        try:
+            record = json.loads(line, parse_float=Decimal)
+            value = try_parse_decimal(record.get(key)) if isinstance(record, dict) else None
+        except json.JSONDecodeError:
+            record, value = None, None
+        records.append(record)
+        values.append(value)
+        if history is not None:
+            dates.append(record.get(date_key, '') if isinstance(record, dict) else '')
+    results, errors, total = _convert_amounts(values, rate, direction, dates, history, rounding)
+    out = []
+    for line, record, result in zip(lines, records, results):
+        if isinstance(record, dict):
+            record[output_key] = result or None
+            out.append(_dump_json(record))
+        else:
+            out.append(line.rstrip('\r\n')) # Línea ilegible: se copia sin cambios
+    return '\n'.join(out) + '\n', len(lines), errors, total
+
+
+def _dump_json(value):
+    """Como json.dumps, pero escribe los Decimal (ver convert_jsonl_chunk) como números exactos, sin pasar por float."""
+    if isinstance(value, dict):
+        return '{' + ', '.join(f"{json.dumps(key, ensure_ascii=False)}: {_dump_json(item)}"
+                               for key, item in value.items()) + '}'
+    if isinstance(value, list):
+        return '[' + ', '.join(_dump_json(item) for item in value) + ']'
+    if isinstance(value, Decimal):
+        return str(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _init_worker(history):
+    """Inicializador de los procesos de trabajo: guarda el historial que usarán todos sus bloques."""
+    global _worker_history
+    _worker_history = history
+
+
+def _convert_with_worker_history(func, chunk):
+    return func(chunk, history=_worker_history)
+
+
+def map_chunks(func, chunks, workers, initializer=None, initargs=()):
+    """
+    Aplica func a cada bloque conservando el orden.
+    Con varios procesos se mantiene un número limitado de bloques en vuelo para no acumular memoria;
+    initializer(*initargs) se ejecuta una vez en cada proceso antes de sus bloques.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield func(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def resolve_rate(explicit_rate=None, cache_path=None, ttl=DEFAULT_CACHE_TTL, max_stale_age=DEFAULT_MAX_STALE_AGE,
+                 currency=USD):
+    """
+    Elige la tasa (bolívares por unidad de `currency`) para la conversión: la indicada con --rate,
+    la del caché si está fresca, o la descargada en ese momento (guardándola en el caché).
+    Si la descarga falla se usa la del caché mientras no supere max_stale_age.
+    Devuelve (tasa, descripción de la fuente) o (0, motivo) si no hay ninguna tasa utilizable.
+    """
+    if explicit_rate:
+        return explicit_rate, 'argumento --rate'
+
+    cache = RateCache(cache_path or default_cache_path())
+    cache.load()
+    if cache.is_fresh(ttl):
+        rate = RateMatrix(cache.entry['prices']).rate(currency, VES)
+        if rate > 0:
+            return rate, f"caché ({cache.entry['source']}, {cache.age():.0f}s)"
+
+    from http_client import HttpClient # Solo hace falta la red si el caché no sirve
+    from rate_sources import ProviderPool, default_providers
+    http = HttpClient()
+    try:
+        prices, provider = ProviderPool(default_providers()).fetch_failover(http)
+        if provider is not None:
+            cache.store(prices[USD], source=provider.name, prices=prices)
+            rate = RateMatrix(prices).rate(currency, VES)
+            if rate > 0:
+                return rate, provider.name
+    except Exception as e:
+        print(f"Warning: Could not fetch BCV rate: {e}", file=sys.stderr)
+    finally:
+        http.close()
+
+    rate = RateMatrix(cache.usable_prices(max_stale_age)).rate(currency, VES)
+    if rate > 0:
+        return rate, f"caché vencido ({cache.entry['source']}, {cache.age():.0f}s)"
+    return 0, f"sin tasa {currency} en caché ni en la red"
+
+
+def run(input_path, output_path, rate, direction=USD_TO_VES, fmt=None, column='amount',
+        output_column='converted', chunk_rows=DEFAULT_CHUNK_ROWS, workers=1,
+        date_column=None, history=None, rounding=DEFAULT_ROUNDING):
+    """
+    Convierte el archivo completo y devuelve un diccionario con las estadísticas:
+    filas, errores, suma exacta de los montos convertidos (en céntimos), bytes leídos y segundos transcurridos.
+    Con `date_column` y `history` cada fila se convierte con la tasa vigente en su fecha.
+    """
+    fmt = detect_format(input_path, fmt)
+    start = time.perf_counter()
+    rows = errors = total = 0
+
+    with open(input_path, 'r', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE) as src, \
+            _open_output(output_path) as dst:
+        if fmt == 'csv':
+            reader = csv.reader(src)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("El archivo CSV está vacío.")
+            if column not in header:
+                raise ValueError(f"El CSV no tiene la columna '{column}'. Columnas: {', '.join(header)}")
+            csv.writer(dst, lineterminator='\n').writerow(header + [output_column])
+            date_index = None
+            if history is not None:
+                if date_column not in header:
+                    raise ValueError(f"El CSV no tiene la columna de fecha '{date_column}'.")
+                date_index = header.index(date_column)
+            func = partial(convert_csv_chunk, column_index=header.index(column), rate=rate, direction=direction,
+                           date_index=date_index, rounding=rounding)
+            chunks = chunked(reader, chunk_rows)
+        else:
+            func = partial(convert_jsonl_chunk, key=column, output_key=output_column, rate=rate, direction=direction,
+                           date_key=date_column, rounding=rounding)
+            chunks = chunked((line for line in src if line.strip()), chunk_rows)
+
+        # El historial va con cada bloque solo en este proceso; los de trabajo lo reciben una vez al arrancar
+        initializer, initargs = None, ()
+        if history is not None and workers > 1:
+            func = partial(_convert_with_worker_history, func)
+            initializer, initargs = _init_worker, (history,)
+        elif history is not None:
+            func = partial(func, history=history)
+
+        for text, chunk_rows_done, chunk_errors, chunk_total in map_chunks(func, chunks, workers,
+                                                                           initializer, initargs):
+            dst.write(text)
+            rows += chunk_rows_done
+            errors += chunk_errors
+            total += chunk_total
+
+    return {'rows': rows,
+            'errors': errors,
+            'total_cents': total,
+            'bytes': os.path.getsize(input_path),
+            'seconds': time.perf_counter() - start}
+
+
+def _open_output(path):
+    """Abre la salida con buffer grande; '-' escribe en la salida estándar."""
+    if path == '-':
+        return open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE, closefd=False)
+    return open(path, 'w', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE)
+
+
+def format_report(stats):
+    """Resumen de rendimiento de una ejecución."""
+    seconds = max(stats['seconds'], 1e-9)
+    return (f"Filas: {stats['rows']:,} (inválidas: {stats['errors']:,}) | "
+            f"Total convertido: {format_cents(stats['total_cents'])} | "
+            f"Tiempo: {stats['seconds']:.2f} s | "
+            f"{stats['rows'] / seconds:,.0f} filas/s | "
+            f"{stats['bytes'] / seconds / (1024 * 1024):.1f} MB/s")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='main.py convert',
+                                     description="Convierte montos USD <-> VES de un archivo CSV o JSONL con la tasa BCV.")
+    parser.add_argument('input', help="Archivo de entrada (.csv, .jsonl o .ndjson)")
+    parser.add_argument('output', help="Archivo de salida ('-' para la salida estándar)")
+    parser.add_argument('--direction', choices=(USD_TO_VES, VES_TO_USD), default=USD_TO_VES)
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="Formato de entrada (por defecto, según la extensión)")
+    parser.add_argument('--column', default='amount', help="Columna CSV o clave JSON con el monto (por defecto: amount)")
+    parser.add_argument('--output-column', default='converted', help="Nombre de la columna/clave con el resultado")
+    parser.add_argument('--currency', choices=CURRENCIES, default=USD,
+                        help="Moneda extranjera de los montos (por defecto: USD); la dirección usd_to_ves "
+                             "convierte de esa moneda a VES y ves_to_usd al revés")
+    parser.add_argument('--rate', type=float, help="Tasa VES por unidad de la moneda; si se omite se usa la del caché o la API")
+    parser.add_argument('--date-column', help="Columna/clave con la fecha de cada fila: se usa la tasa "
+                                              "vigente en esa fecha según el historial de tasas")
+    parser.add_argument('--rounding', choices=ROUNDING_MODES, default=DEFAULT_ROUNDING,
+                        help="Redondeo a céntimos: half_up (comercial, por defecto), half_even (bancario), "
+                             "down (truncar) o up")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="Filas por bloque")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Procesos para convertir en paralelo (0 = todos los núcleos)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    history = None
+    if args.date_column and args.currency != USD:
+        print("Error: El historial de tasas solo tiene el dólar; --date-column requiere --currency USD.", file=sys.stderr)
+        return 2
+    if args.date_column:
+        history = RateHistory(default_history_path()).load()
+        if not len(history):
+            print("Error: El historial de tasas está vacío. Importe uno con 'main.py import-history'.", file=sys.stderr)
+            return 2
+        rate, rate_source = 0, f"historial por fecha ({len(history)} fechas)"
+    else:
+        rate, rate_source = resolve_rate(args.rate, currency=args.currency)
+        if rate <= 0:
+            print(f"Error: No hay tasa BCV disponible ({rate_source}). Use --rate.", file=sys.stderr)
+            return 2
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    print(f"Tasa: {rate or '-'} ({rate_source}) | Moneda: {args.currency} | Dirección: {args.direction} | Procesos: {workers}", file=sys.stderr)
+
+    try:
+        stats = run(args.input, args.output, rate, direction=args.direction, fmt=args.format,
+                    column=args.column, output_column=args.output_column,
+                    chunk_rows=max(1, args.chunk_rows), workers=workers,
+                    date_column=args.date_column, history=history, rounding=args.rounding)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(format_report(stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Circuit breaker por endpoint (host) para las descargas, sin dependencias de Kivy.
+# El estado se guarda en disco para no volver a insistir con un endpoint caído en cada arranque.
+import json
+import os
+import threading
+import time
+
+CIRCUIT_STATE_FILENAME = 'circuit_breakers.json'
+
+CLOSED = 'closed' # Funciona: las peticiones pasan
+OPEN = 'open' # Caído: las peticiones se rechazan al instante hasta open_until
+HALF_OPEN = 'half_open' # Periodo de espera cumplido: se deja pasar una sola petición de prueba
+
+DEFAULT_FAILURE_THRESHOLD = 3 # Fallos seguidos que abren el circuito
+DEFAULT_BASE_BACKOFF = 30.0 # Segundos abierto tras la primera apertura; se duplica en cada reapertura
+DEFAULT_MAX_BACKOFF = 3600.0
+
+
+class CircuitOpenError(Exception):
+    """La petición no se hizo porque el circuito del endpoint está abierto."""
+
+    def __init__(self, endpoint, retry_in):
+        super().__init__(f"Circuit open for {endpoint}; next attempt in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreakers:
+    """
+    Un circuito por endpoint con los estados closed / open / half_open:
+    - closed: tras failure_threshold fallos seguidos pasa a open.
+    - open: rechaza las peticiones sin tocar la red durante base_backoff * 2^(aperturas - 1)
+      segundos (con tope max_backoff).
+    - half_open: cumplida la espera deja pasar una petición; si funciona vuelve a closed,
+      si falla vuelve a open con el doble de espera.
+    Se usa desde los hilos del pool de descargas, por eso usa un lock.
+    """
+
+    def __init__(self, path=None, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 base_backoff=DEFAULT_BASE_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF):
+        self.path = path # None: solo en memoria
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._circuits = {} # endpoint -> {'state', 'failures', 'trips', 'open_until'}
+        self._trial_in_flight = set() # endpoints half_open con la petición de prueba en curso
+
+    def load(self):
+        """Lee el estado guardado. Un archivo ausente o dañado equivale a todos los circuitos cerrados."""
+        if self.path is None:
+            return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            circuits = {}
+            for endpoint, circuit in data.items():
+                state = circuit['state'] if circuit['state'] in (CLOSED, OPEN, HALF_OPEN) else CLOSED
+                circuits[str(endpoint)] = {'state': state,
+                                           'failures': int(circuit['failures']),
+                                           'trips': int(circuit['trips']),
+                                           'open_until': float(circuit['open_until'])}
+            with self._lock:
+                self._circuits = circuits
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Warning: Ignoring unreadable circuit breaker state '{self.path}': {e}")
+        return self
+
+    def _save(self):
+        """Escritura atómica del estado (se llama con el lock tomado y solo cuando cambia algo)."""
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._circuits, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write circuit breaker state '{self.path}': {e}")
+
+    def _circuit(self, endpoint):
+        return self._circuits.setdefault(endpoint, {'state': CLOSED, 'failures': 0, 'trips': 0, 'open_until': 0.0})
+
+    def before_request(self, endpoint, now=None):
+        """
+        Se llama antes de cada petición. Lanza CircuitOpenError si el circuito está abierto
+        (o si ya hay una petición de prueba en curso en half_open).
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit['state'] == OPEN:
+                if now < circuit['open_until']:
+                    raise CircuitOpenError(endpoint, circuit['open_until'] - now)
+                circuit['state'] = HALF_OPEN
+            if circuit['state'] == HALF_OPEN:
+                if endpoint in self._trial_in_flight:
+                    raise CircuitOpenError(endpoint, 0)
+                self._trial_in_flight.add(endpoint)
+
+    def record_success(self, endpoint):
+        with self._lock:
+            self._trial_in_flight.discard(endpoint)
+            circuit = self._circuit(endpoint)
+            changed = circuit['state'] != CLOSED or circuit['trips'] > 0 or circuit['failures'] > 0
+            circuit.update(state=CLOSED, failures=0, trips=0, open_until=0.0)
+            if changed:
+                self._save()
+
+    def record_failure(self, endpoint, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._trial_in_flight.discard(endpoint)
+            circuit = self._circuit(endpoint)
+            circuit['failures'] += 1
+            if circuit['state'] == HALF_OPEN or circuit['failures'] >= self.failure_threshold:
+                circuit['trips'] += 1
+                backoff = min(self.max_backoff, self.base_backoff * (2 ** (circuit['trips'] - 1)))
+                circuit.update(state=OPEN, failures=0, open_until=now + backoff)
+                print(f"DEBUG: Circuit for {endpoint} opened for {backoff:.0f}s (trip {circuit['trips']})")
+            self._save() # También los fallos sueltos: cuentan aunque la app se reinicie entre uno y otro
+
+    def release(self, endpoint):
+        """Libera la petición de prueba de half_open sin contar resultado (p. ej. si se canceló)."""
+        with self._lock:
+            self._trial_in_flight.discard(endpoint)
+
+    def stats(self, now=None):
+        """Estado de cada circuito; para los abiertos, segundos que faltan para reintentar."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return {endpoint: {'state': circuit['state'], 'failures': circuit['failures'], 'trips': circuit['trips'],
+                               'retry_in': round(max(0.0, circuit['open_until'] - now))}
+                    for endpoint, circuit in self._circuits.items()}
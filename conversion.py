@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Motor de conversión USD <-> VES sin dependencias de Kivy.
+# Las pantallas lo usan para un solo monto y los procesos masivos para lotes completos.
+# Los cálculos son exactos en céntimos enteros (ver money.py): un monto convertido es siempre
+# el redondeo del producto exacto, no el de un producto en coma flotante.
+from decimal import Decimal
+
+from money import (CENTS, DEFAULT_ROUNDING, Money, Rate, exact_batch, load_numpy, multiply_batch, rates_batch,
+                   scale_batch, scaled_cents)
+
+USD_TO_VES = 'usd_to_ves'
+VES_TO_USD = 'ves_to_usd'
+DIRECTIONS = (USD_TO_VES, VES_TO_USD)
+
+
+def _check_rate(rate):
+    """Valida que la tasa sea utilizable para convertir y la devuelve como fracción exacta."""
+    try:
+        return Rate.of(rate)
+    except (TypeError, ValueError):
+        raise ValueError(f"Tasa de conversión inválida: {rate}") from None
+
+
+def _factors(rate, direction):
+    """(multiplicador, divisor) enteros que aplican la tasa exacta en la dirección indicada."""
+    if direction == USD_TO_VES:
+        return rate.num, rate.den
+    if direction == VES_TO_USD:
+        return rate.den, rate.num
+    raise ValueError(f"Dirección de conversión desconocida: {direction}")
+
+
+def convert_money(amount, rate, direction=USD_TO_VES, rounding=DEFAULT_ROUNDING):
+    """
+    Convierte un monto en la dirección indicada y devuelve un Money exacto.
+    `amount` es un Money o cualquier valor que acepte Money.of (texto, int, float, Decimal);
+    `rate` son los bolívares por unidad de la moneda extranjera.
+    Se multiplica el valor exacto del monto (1.005 no se lleva antes a 1.01) y el resultado
+    se redondea una sola vez a céntimos con `rounding`.
+    """
+    multiplier, divisor = _factors(_check_rate(rate), direction)
+    return Money(scaled_cents(amount, multiplier, divisor, rounding))
+
+
+def usd_to_ves(amount, rate):
+    """Convierte un monto en USD a VES con la tasa dada (VES por 1 USD)."""
+    return float(convert_money(amount, rate, USD_TO_VES))
+
+
+def ves_to_usd(amount, rate):
+    """Convierte un monto en VES a USD con la tasa dada (VES por 1 USD)."""
+    return float(convert_money(amount, rate, VES_TO_USD))
+
+
+def convert(amount, rate, direction=USD_TO_VES):
+    """Convierte un solo monto en la dirección indicada (como float; ver convert_money)."""
+    return float(convert_money(amount, rate, direction))
+
+
+def convert_cents_batch(amounts, rate, direction=USD_TO_VES, rounding=DEFAULT_ROUNDING):
+    """
+    Convierte muchos montos de una vez y devuelve (céntimos, válidos).
+    `amounts` puede ser un arreglo de NumPy, una lista o cualquier iterable de números, Decimals o textos.
+    Como en convert_money, se parte del valor exacto de cada monto y se redondea una sola vez.
+    `rate` es una tasa única (número o Rate) o una secuencia con la tasa de cada monto (por ejemplo,
+    la vigente en la fecha de cada factura).
+    Con NumPy, `céntimos` es un ndarray de int64 (de enteros de Python si alguno no cabe) y `válidos` una máscara booleana (None con tasa única)
+    que marca los montos cuya tasa era válida; sin NumPy son listas.
+    Las sumas de los céntimos son exactas, a diferencia de sumar los floats de convert_batch.
+    """
+    per_amount = not isinstance(rate, (int, float, Decimal, Rate))
+    if not per_amount:
+        rate = _check_rate(rate)
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Dirección de conversión desconocida: {direction}")
+
+    np = load_numpy()
+    if np is None:
+        if not per_amount:
+            multiplier, divisor = _factors(rate, direction)
+            return [scaled_cents(a, multiplier, divisor, rounding) for a in amounts], None
+        cents, valid = [], []
+        for a, r in zip(amounts, rate):
+            ok = bool(r) and r > 0
+            cents.append(scaled_cents(a, *_factors(Rate.of(r), direction), rounding) if ok else 0)
+            valid.append(ok)
+        return cents, valid
+
+    units, scale = exact_batch(amounts) # monto = units / 10**scale
+    valid = None
+    if per_amount:
+        num, den, valid = rates_batch(rate)
+    else:
+        num, den = rate.num, rate.den
+    if direction == VES_TO_USD:
+        num, den = den, num
+    return scale_batch(units, multiply_batch(num, CENTS), multiply_batch(den, 10 ** scale), rounding), valid
+
+
+def convert_batch(amounts, rate, direction=USD_TO_VES):
+    """
+    Como convert_cents_batch, pero devuelve los montos convertidos como números: con NumPy un
+    ndarray de float64 (cada valor es el float más cercano al monto exacto, así que f"{x:.2f}" es
+    exacto) y sin NumPy una lista. Los montos cuya tasa no es válida quedan como NaN.
+    """
+    cents, valid = convert_cents_batch(amounts, rate, direction)
+    np = load_numpy()
+    if np is None:
+        if valid is None:
+            return [c / CENTS for c in cents]
+        return [c / CENTS if ok else float('nan') for c, ok in zip(cents, valid)]
+    result = (cents / CENTS).astype(np.float64, copy=False)
+    if valid is not None:
+        result[~valid] = np.nan
+    return result
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Bucle de eventos único para toda la E/S de red de la app.
+# No depende de Kivy: quien lo crea indica cómo entregar los resultados al hilo de la interfaz.
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FetchLoop:
+    """
+    Ejecuta corrutinas en un único event loop de asyncio que vive en un hilo en segundo plano.
+    Las llamadas bloqueantes (requests, archivos) se hacen con run_blocking en un pool de
+    hilos de tamaño fijo, así no se crea un hilo nuevo por cada descarga.
+    """
+
+    def __init__(self, deliver, max_workers=4):
+        """
+        deliver(callback, result, error): función que lleva cada resultado al hilo principal.
+        Es el único punto por el que los resultados salen del bucle.
+        """
+        self._deliver = deliver
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(self._executor)
+        self._thread = threading.Thread(target=self._run, name='fetch-loop', daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def start(self):
+        """Arranca el hilo del bucle; se llama una sola vez al iniciar la app."""
+        self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread.is_alive() and not self._loop.is_closed()
+
+    def submit(self, coro, callback=None):
+        """
+        Programa una corrutina desde cualquier hilo.
+        Al terminar, callback(result, error) se entrega a través de `deliver`
+        (error es None si terminó bien; si la tarea se canceló no se llama).
+        Devuelve un concurrent.futures.Future.
+        """
+        if not self.running:
+            coro.close()
+            raise RuntimeError("El bucle de descargas no está en ejecución.")
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        if callback is not None:
+            future.add_done_callback(lambda f: self._on_done(f, callback))
+        return future
+
+    def _on_done(self, future, callback):
+        if future.cancelled():
+            return
+        error = future.exception()
+        self._deliver(callback, None if error else future.result(), error)
+
+    async def run_blocking(self, func, *args):
+        """Ejecuta una función bloqueante en el pool de hilos sin bloquear el bucle."""
+        return await self._loop.run_in_executor(self._executor, func, *args)
+
+    def stop(self, timeout=2.0):
+        """
+        Cancela las tareas pendientes y detiene el bucle.
+        Las llamadas bloqueantes ya iniciadas terminan por su propio timeout de red,
+        pero sus resultados se descartan.
+        """
+        if not self.running:
+            return
+
+        async def _cancel_all():
+            current = asyncio.current_task()
+            tasks = [t for t in asyncio.all_tasks() if t is not current]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_all(), self._loop).result(timeout)
+        except Exception as e:
+            print(f"Warning: Could not cancel pending fetches cleanly: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+
+class SingleFlight:
+    """
+    Agrupa peticiones concurrentes por clave (normalmente el endpoint):
+    mientras una petición está en curso, las demás con la misma clave esperan su resultado
+    en lugar de repetirla. Un resultado correcto se reutiliza durante `ttl` segundos.
+    Se usa solo desde corrutinas del bucle de descargas, por lo que no necesita locks.
+    """
+
+    def __init__(self):
+        self._inflight = {} # clave -> tarea en curso
+        self._memo = {} # clave -> (vence_en, resultado)
+        self.counters = {'calls': 0, 'executed': 0, 'shared': 0, 'memo_hits': 0}
+
+    async def run(self, key, coro_factory, ttl=0):
+        """
+        Devuelve el resultado de coro_factory() para la clave, ejecutándola solo si no hay
+        una en curso ni un resultado reciente. Los errores se propagan a todos los que esperan
+        y no se memorizan.
+        """
+        self.counters['calls'] += 1
+        memo = self._memo.get(key)
+        if memo is not None and memo[0] > time.monotonic():
+            self.counters['memo_hits'] += 1
+            return memo[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters['shared'] += 1
+        else:
+            self.counters['executed'] += 1
+            task = asyncio.ensure_future(coro_factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t, ttl))
+        # shield: si se cancela a quien espera, la petición compartida sigue para los demás
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task, ttl):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if ttl > 0 and not task.cancelled() and task.exception() is None:
+            self._memo[key] = (time.monotonic() + ttl, task.result())
+
+    def invalidate(self, key):
+        """Descarta el resultado memorizado de una clave (p. ej. para forzar un refresco)."""
+        self._memo.pop(key, None)
+
+    def stats(self):
+        """Contadores de uso; `saved` son las peticiones de red evitadas."""
+        stats = dict(self.counters)
+        stats['saved'] = stats['shared'] + stats['memo_hits']
+        return stats
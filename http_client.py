@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# Cliente HTTP compartido por todas las descargas de la app (tasas, frases, etc.).
+# No depende de Kivy; la app crea una sola instancia y la cierra al salir.
+# requests (con urllib3, charset_normalizer, etc.) se importa con la primera petición,
+# que ya corre en un hilo del bucle de descargas, para no retrasar el arranque de la interfaz.
+import hashlib
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Códigos HTTP que indican un fallo temporal del servidor y justifican reintentar
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Resultado de get_json_if_changed cuando el recurso no cambió desde la última descarga
+NOT_MODIFIED = object()
+
+
+def is_request_error(error):
+    """
+    True si el error es una excepción de requests (red, timeout, HTTP o JSON inválido).
+    Permite clasificar errores sin importar requests al inicio de la app.
+    """
+    from requests.exceptions import RequestException
+    return isinstance(error, RequestException)
+
+
+class HttpClient:
+    """
+    Envoltura de requests.Session con:
+    - conexiones reutilizables (keep-alive) en un pool por host,
+    - timeouts de conexión y de lectura en cada petición,
+    - reintentos con backoff exponencial y jitter,
+    - contadores de latencia y resultado por host,
+    - opcionalmente, un circuit breaker por host (circuit_breaker.CircuitBreakers) que rechaza
+      al instante las peticiones a un host caído en lugar de esperar cada vez a que falle la red.
+    """
+
+    def __init__(self, connect_timeout=5.0, read_timeout=10.0, retries=2,
+                 backoff_base=0.5, backoff_max=8.0, pool_size=4, breakers=None):
+        self.breakers = breakers
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries # Reintentos adicionales tras el primer intento
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+
+        self._session = None # Se crea en la primera petición (ver session)
+        self._session_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._validators = {} # (url, params) -> {'etag', 'last_modified', 'digest'}
+
+    @property
+    def session(self):
+        """requests.Session compartida; se crea (e importa requests) la primera vez que se usa."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    # max_retries=0: los reintentos se hacen aquí para poder aplicar jitter y contarlos
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def get(self, url, **kwargs):
+        """
+        Realiza un GET con timeouts y reintentos.
+        Devuelve la respuesta (ya validada con raise_for_status) o lanza la última excepción de requests.
+        Con circuit breaker, lanza CircuitOpenError sin usar la red si el circuito del host está abierto;
+        los errores de red y las respuestas 429/5xx (tras los reintentos) cuentan como fallos del host.
+        """
+        host = urlsplit(url).netloc
+        if self.breakers is None:
+            return self._get_with_retries(url, host, kwargs)
+
+        from requests.exceptions import ConnectionError, HTTPError, Timeout
+        self.breakers.before_request(host)
+        try:
+            response = self._get_with_retries(url, host, kwargs)
+        except (ConnectionError, Timeout):
+            self.breakers.record_failure(host)
+            raise
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code in RETRY_STATUS_CODES:
+                self.breakers.record_failure(host)
+            else:
+                self.breakers.record_success(host) # El host responde; el error es de la petición
+            raise
+        except BaseException:
+            self.breakers.release(host)
+            raise
+        self.breakers.record_success(host)
+        return response
+
+    def _get_with_retries(self, url, host, kwargs):
+        session = self.session
+        from requests.exceptions import ConnectionError, HTTPError, Timeout
+        kwargs.setdefault('timeout', (self.connect_timeout, self.read_timeout))
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = session.get(url, **kwargs)
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.retries:
+                    self._record(host, 'retried', time.perf_counter() - start)
+                    self._sleep_backoff(attempt, response.headers.get('Retry-After'))
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+            except (ConnectionError, Timeout):
+                elapsed = time.perf_counter() - start
+                if attempt < self.retries:
+                    self._record(host, 'retried', elapsed)
+                    self._sleep_backoff(attempt)
+                    attempt += 1
+                    continue
+                self._record(host, 'network_error', elapsed)
+                raise
+            except HTTPError:
+                self._record(host, 'http_error', time.perf_counter() - start)
+                raise
+            outcome = 'not_modified' if response.status_code == 304 else 'ok'
+            self._record(host, outcome, time.perf_counter() - start)
+            return response
+
+    def get_json(self, url, **kwargs):
+        """GET que devuelve directamente el cuerpo JSON decodificado."""
+        return self.get(url, **kwargs).json()
+
+    def get_json_if_changed(self, url, params=None, **kwargs):
+        """
+        GET condicional: envía If-None-Match / If-Modified-Since con los validadores de la
+        respuesta anterior. Devuelve NOT_MODIFIED si el servidor responde 304, o si responde 200
+        con exactamente el mismo cuerpo (servidores sin ETag); así no se vuelve a decodificar.
+        En otro caso devuelve el JSON decodificado y guarda los nuevos validadores.
+        """
+        key = self._validator_key(url, params)
+        with self._lock:
+            known = self._validators.get(key, {})
+        headers = dict(kwargs.pop('headers', None) or {})
+        if known.get('etag'):
+            headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            headers['If-Modified-Since'] = known['last_modified']
+
+        response = self.get(url, params=params, headers=headers, **kwargs)
+        if response.status_code == 304:
+            return NOT_MODIFIED
+        digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        with self._lock:
+            self._validators[key] = {'etag': response.headers.get('ETag'),
+                                     'last_modified': response.headers.get('Last-Modified'),
+                                     'digest': digest}
+        if digest == known.get('digest'):
+            return NOT_MODIFIED
+        return response.json()
+
+    @staticmethod
+    def _validator_key(url, params):
+        return url, tuple(sorted((params or {}).items()))
+
+    def get_validators(self, url, params=None):
+        """Validadores de la última respuesta de url/params (para guardarlos en disco), o None."""
+        with self._lock:
+            validators = self._validators.get(self._validator_key(url, params))
+            return dict(validators) if validators else None
+
+    def set_validators(self, url, params, validators):
+        """Restaura validadores guardados, p. ej. al arrancar, para que la primera petición ya sea condicional."""
+        with self._lock:
+            self._validators[self._validator_key(url, params)] = dict(validators)
+
+    def _sleep_backoff(self, attempt, retry_after=None):
+        """
+        Espera antes de reintentar: backoff exponencial con "full jitter"
+        (un valor aleatorio entre 0 y base * 2^intento, con tope backoff_max).
+        Si el servidor envía Retry-After en segundos se respeta, sin superar el tope.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+            except ValueError:
+                pass # Retry-After en formato de fecha: se usa el backoff normal
+        time.sleep(delay)
+
+    def _record(self, host, outcome, elapsed):
+        """Acumula contadores por host: resultados y latencia de cada intento."""
+        with self._lock:
+            stats = self._stats.setdefault(host, {
+                'requests': 0, 'ok': 0, 'not_modified': 0, 'retried': 0, 'http_error': 0, 'network_error': 0,
+                'latency_total': 0.0, 'latency_max': 0.0,
+            })
+            stats['requests'] += 1
+            stats[outcome] += 1
+            stats['latency_total'] += elapsed
+            stats['latency_max'] = max(stats['latency_max'], elapsed)
+
+    def stats(self):
+        """
+        Devuelve una copia de los contadores por host, con la latencia media en segundos.
+        Cada intento (incluidos los reintentos) cuenta como una petición.
+        """
+        with self._lock:
+            result = {}
+            for host, stats in self._stats.items():
+                entry = dict(stats)
+                entry['latency_avg'] = stats['latency_total'] / stats['requests']
+                result[host] = entry
+            return result
+
+    def close(self):
+        """Cierra las conexiones abiertas del pool (si llegó a crearse)."""
+        if self._session is not None:
+            self._session.close()
@@ -1,26 +1,92 @@
 # -*- coding: utf-8 -*-
+import time
+_PROCESS_START = time.perf_counter() # Referencia para medir los tiempos de arranque
+
+import sys
+
+# "--profile-startup": mide cada import y las fases del arranque, imprime el informe al llegar
+# a la pantalla principal y cierra la app. Se instala antes de cualquier otro import.
+PROFILE_STARTUP = '--profile-startup' in sys.argv
+_import_profiler = None
+if PROFILE_STARTUP:
+    sys.argv.remove('--profile-startup') # Kivy rechaza las opciones que no conoce
+    from startup_profile import ImportProfiler
+    _import_profiler = ImportProfiler().install()
+
+# Fases medidas antes de que exista la app; ConverterApp las copia a startup_times
+_STARTUP_PHASES = {}
+
+
+def _mark_startup(phase):
+    _STARTUP_PHASES[phase] = (time.perf_counter() - _PROCESS_START) * 1000
+
+
+import multiprocessing
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support() # Necesario para el pool de procesos dentro del .exe de PyInstaller
+
+    # Comandos de línea de comandos, p. ej. "python main.py convert ENTRADA SALIDA [opciones]".
+    # Se atienden antes de importar Kivy para no abrir ninguna ventana; run_module hace que los
+    # procesos hijos del pool importen el módulo del comando en vez de volver a ejecutar este archivo.
+    CLI_COMMANDS = {
+        'convert': 'bulk_convert', # Conversión masiva de archivos CSV/JSONL
+        'import-history': 'rate_history', # Importación de tasas históricas desde CSV
+        '--serve': 'rate_server', # Servicio HTTP/JSON local de tasas y conversiones, sin interfaz
+    }
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        import runpy
+        command_module = CLI_COMMANDS[sys.argv.pop(1)]
+        runpy.run_module(command_module, run_name='__main__', alter_sys=True)
+        sys.exit(0)
+
 # Importaciones necesarias para la aplicación Kivy
 import kivy
 from kivy.app import App
+from kivy.properties import NumericProperty, StringProperty, BooleanProperty, ListProperty, ObjectProperty, VariableListProperty
+from kivy.clock import Clock
+from kivy.metrics import dp
+_mark_startup('kivy_imported')
+from kivy.core.window import Window # Al importarse crea la ventana
+_mark_startup('window_created')
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.layout import Layout
 from kivy.uix.screenmanager import ScreenManager, Screen # Importar ScreenManager y Screen para la navegación
 from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
-from kivy.properties import NumericProperty, StringProperty, BooleanProperty, ListProperty
-from kivy.clock import Clock
-from kivy.metrics import dp
-from kivy.core.window import Window
+from kivy.uix.spinner import Spinner
 from kivy.graphics import Color, RoundedRectangle, Rectangle # Importar Rectangle para la sombra de la imagen
+from kivy.graphics import Fbo, ClearColor, ClearBuffers
+from kivy.graphics.texture import Texture
+from kivy.core.image import Image as CoreImage
+from kivy.core.text import LabelBase, Label as CoreLabel
 
-import requests
-import threading
 import json
+import datetime
+import threading
+from decimal import Decimal # Monto escrito exacto (app.usd_amount)
 import os # Para verificar si la fuente existe
-import sys # Para PyInstaller
 from kivy.resources import resource_add_path, resource_find # Para gestión de recursos en Kivy
 
+from rate_cache import RateCache, RATE_CACHE_FILENAME, DEFAULT_CACHE_TTL, DEFAULT_MAX_STALE_AGE # Caché en disco de la última tasa BCV
+from http_client import HttpClient, is_request_error # Cliente HTTP compartido (pool, timeouts y reintentos)
+from circuit_breaker import CircuitBreakers, CircuitOpenError, CIRCUIT_STATE_FILENAME # Endpoints caídos
+from fetch_loop import FetchLoop, SingleFlight # Bucle asyncio único y agrupación de peticiones repetidas
+from conversion import USD_TO_VES, VES_TO_USD, convert_money # Motor de conversión independiente de la UI
+from money import Money # Montos exactos en céntimos enteros (sin errores de coma flotante)
+from parsing import parse_decimal, try_parse_decimal # Montos escritos, leídos sin redondear
+from rate_history import RateHistory, RATE_HISTORY_FILENAME, parse_date # Historial de tasas por fecha
+from rate_sources import BCV_API_URL, BCV_MONITOR, ProviderPool, default_providers # Fuentes de la tasa BCV
+from rate_matrix import RateMatrix, USD, VES # Tasas cruzadas entre las monedas publicadas por el BCV
+from quote_pool import QuotePool, QUOTE_POOL_FILENAME # Reserva local de frases motivacionales
+from rate_board import RateBoard, RATE_BOARD_FILENAME, DEFAULT_POLL_INTERVAL # Tasa compartida entre instancias
+from app_state import AppState, APP_STATE_FILENAME, RESTORABLE_SCREENS # Instantánea del estado para arrancar donde se dejó
+# requests y NumPy no se importan aquí: http_client y conversion los cargan con la primera
+# petición de red y el primer lote, fuera del camino hasta el primer frame.
+_mark_startup('imports')
+
 # Determina si la aplicación se está ejecutando como un ejecutable empaquetado por PyInstaller.
 # Si es así, añade la ruta temporal donde PyInstaller extrae los recursos.
 if hasattr(sys, '_MEIPASS'):
@@ -35,19 +101,115 @@ Window.size = (400, 600) # Altura de la ventana ajustada para más contenido
 Window.clearcolor = (0, 0, 0, 1) # Fondo negro (RGBA)
 
 
-# Cargar fuentes Poppins
-# Asegúrate de que estos archivos .ttf estén en el mismo directorio que tu script
-# O especifica la ruta completa
-FONT_BOLD = 'Poppins-SemiBold.ttf' # O el nombre del archivo de la fuente semibold
-FONT_REGULAR = 'Poppins-Regular.ttf' # O el nombre del archivo del archivo de la fuente regular
+class AssetCache:
+    """
+    Recursos compartidos por todas las pantallas: cada archivo se busca una sola vez,
+    las fuentes se registran en LabelBase por nombre (así los widgets no resuelven la ruta
+    en cada render) y el icono se decodifica una vez y se guarda reducido al tamaño en que
+    se muestra, en lugar de mantener la imagen completa por cada pantalla.
+    """
 
-# Verificar si las fuentes existen, si no, usar la fuente por defecto de Kivy
-if not os.path.exists(resource_find(FONT_BOLD) if resource_find(FONT_BOLD) else FONT_BOLD):
-    FONT_BOLD = None
-    print(f"Advertencia: No se encontró la fuente '{FONT_BOLD}'. Se usará la fuente por defecto de Kivy.")
-if not os.path.exists(resource_find(FONT_REGULAR) if resource_find(FONT_REGULAR) else FONT_REGULAR):
-    FONT_REGULAR = None
-    print(f"Advertencia: No se encontró la fuente '{FONT_REGULAR}'. Se usará la fuente por defecto de Kivy.")
+    def __init__(self):
+        self._paths = {} # nombre de archivo -> ruta encontrada (o None)
+        self._fonts = {} # nombre registrado -> ruta del .ttf
+        self._textures = {} # nombre de archivo -> (textura reducida, bytes RGBA para recargarla)
+        self._report = {} # nombre -> datos de memoria para memory_report()
+        self._warmed = False
+
+    def find(self, filename):
+        """Ruta del recurso (resource_find), buscada solo la primera vez."""
+        if filename not in self._paths:
+            self._paths[filename] = resource_find(filename)
+        return self._paths[filename]
+
+    def register_font(self, name, filename):
+        """
+        Registra la fuente con un nombre para usarlo como font_name.
+        Devuelve el nombre, o None si el archivo no existe (se usará la fuente por defecto de Kivy).
+        """
+        path = self.find(filename)
+        if not path or not os.path.exists(path):
+            print(f"Advertencia: No se encontró la fuente '{filename}'. Se usará la fuente por defecto de Kivy.")
+            return None
+        LabelBase.register(name=name, fn_regular=path)
+        self._fonts[name] = path
+        self._report[name] = {'kind': 'font', 'file_bytes': os.path.getsize(path), 'resident_bytes': os.path.getsize(path)}
+        return name
+
+    def warm_fonts(self, sizes, text='0123456789.,$ BsUSDVEAaeiou'):
+        """
+        Renderiza una vez cada fuente registrada en los tamaños usados por la interfaz,
+        para que la primera conversión no pague la carga de la fuente ni de sus glifos.
+        """
+        if self._warmed:
+            return
+        self._warmed = True
+        start = time.perf_counter()
+        for name in self._fonts:
+            for size in sizes:
+                CoreLabel(text=text, font_name=name, font_size=size).refresh()
+        print(f"DEBUG: Fonts warmed in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def texture(self, filename, max_size):
+        """
+        Textura del archivo reducida para caber en max_size (px) manteniendo la proporción.
+        Se decodifica una sola vez; la imagen original se libera tras la reducción.
+        Devuelve None si el archivo no existe o no se puede decodificar.
+        """
+        if filename in self._textures:
+            return self._textures[filename][0]
+        path = self.find(filename)
+        if not path:
+            return None
+        try:
+            source = CoreImage(path, mipmap=True, nocache=True).texture
+        except Exception as e:
+            print(f"ERROR: No se pudo cargar la imagen '{filename}'. Error: {e}")
+            return None
+
+        scale = min(1.0, max_size / max(source.size))
+        size = (max(1, int(round(source.width * scale))), max(1, int(round(source.height * scale))))
+        # Se dibuja la imagen en un Fbo del tamaño final (el mipmap suaviza la reducción)
+        # y se copian sus píxeles a una textura propia; así no queda referencia a la original.
+        fbo = Fbo(size=size, with_stencilbuffer=False)
+        with fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+            Rectangle(size=size, texture=source)
+        fbo.draw()
+        pixels = fbo.pixels
+        texture = Texture.create(size=size, colorfmt='rgba')
+        texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+        # Si se pierde el contexto OpenGL (Android, cambio de ventana) se vuelve a subir la copia
+        texture.add_reload_observer(lambda tex: tex.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte'))
+        self._textures[filename] = (texture, pixels)
+        self._report[filename] = {'kind': 'texture', 'file_bytes': os.path.getsize(path),
+                                  'decoded_bytes': source.width * source.height * 4,
+                                  'resident_bytes': size[0] * size[1] * 4, 'size': size}
+        print(f"DEBUG: Texture '{filename}' {source.size} -> {size}")
+        return texture
+
+    def memory_report(self):
+        """Memoria por recurso: tamaño del archivo y bytes que quedan en uso (y decodificados, en texturas)."""
+        return {name: dict(info) for name, info in self._report.items()}
+
+
+assets = AssetCache()
+
+# Fuentes Poppins, registradas por nombre. Deben estar junto al script (o en el .exe de PyInstaller).
+# Si falta alguna, el nombre queda en None y se usa la fuente por defecto de Kivy.
+FONT_BOLD = assets.register_font('Poppins-SemiBold', 'Poppins-SemiBold.ttf')
+FONT_REGULAR = assets.register_font('Poppins-Regular', 'Poppins-Regular.ttf')
+# Tamaños de texto usados en la interfaz; se precalientan en un frame libre tras el arranque
+UI_FONT_SIZES = (dp(13), dp(14), dp(18), dp(20))
+
+COIN_IMAGE = 'icono_moneda.png'
+COIN_PLACEHOLDER_URL = 'https://placehold.co/100x100/gold/white?text=$'
+
+
+# API de frases motivacionales y frase que se muestra si no se puede obtener una
+QUOTE_API_URL = "https://frasedeldia.azurewebsites.net/api/phrase"
+FALLBACK_QUOTE = "Si hoy no fue un buen día, eso está bien porque entonces mañana tal vez lo será."
 
 
 class RoundedShadowButton(Button):
@@ -66,9 +228,37 @@ class RoundedShadowButton(Button):
         super().__init__(**kwargs)
         self.background_normal = ''
         self.background_down = ''
+        # Las instrucciones de dibujo se crean una sola vez; luego solo se actualizan sus propiedades
+        self._create_canvas_instructions()
         self.bind(pos=self.update_canvas_instructions,
                   size=self.update_canvas_instructions,
-                  state=self.update_canvas_instructions) # ¡Vincular también a 'state' para el efecto!
+                  state=self.update_canvas_instructions, # ¡Vincular también a 'state' para el efecto!
+                  background_color=self.update_canvas_instructions,
+                  button_radius=self.update_canvas_instructions,
+                  shadow_color=self.update_canvas_instructions,
+                  shadow_offset_x=self.update_canvas_instructions,
+                  shadow_offset_y=self.update_canvas_instructions,
+                  shadow_spread=self.update_canvas_instructions,
+                  shadow_radius=self._on_shadow_radius)
+        self.update_canvas_instructions()
+
+    def _create_canvas_instructions(self):
+        """
+        Crea las instrucciones de la sombra y del fondo en canvas.before.
+        La sombra es un Rectangle si todos sus radios son 0 y un RoundedRectangle si no.
+        """
+        self._shadow_is_square = all(r == 0 for r in self.shadow_radius)
+        with self.canvas.before:
+            self._shadow_color_instruction = Color(*self.shadow_color)
+            self._shadow_instruction = Rectangle() if self._shadow_is_square else RoundedRectangle()
+            self._background_color_instruction = Color(*self.background_color)
+            self._background_instruction = RoundedRectangle()
+
+    def _on_shadow_radius(self, *args):
+        """Si la sombra pasa de cuadrada a redondeada (o al revés) hay que cambiar su instrucción."""
+        if self._shadow_is_square != all(r == 0 for r in self.shadow_radius):
+            self.canvas.before.clear()
+            self._create_canvas_instructions()
         self.update_canvas_instructions()
 
     def update_canvas_instructions(self, *args):
@@ -76,43 +266,305 @@ class RoundedShadowButton(Button):
         Actualiza las instrucciones de dibujo en el canvas del botón,
         aplicando un efecto cuando el botón está presionado.
         """
-        self.canvas.before.clear()
-        with self.canvas.before:
-            current_shadow_offset_y = self.shadow_offset_y
-            current_shadow_color = list(self.shadow_color) # Copia para modificar opacidad
+        # Efecto al presionar: la sombra se mueve hacia arriba (o el botón hacia abajo)
+        if self.state == 'down':
+            current_shadow_offset_y = dp(1) # Sombra más cerca del botón
+            shadow_alpha = 0.5 # Sombra un poco menos opaca
+        else:
+            current_shadow_offset_y = self.shadow_offset_y # Vuelve al offset normal
+            shadow_alpha = 1.0 # Vuelve a la opacidad normal
+
+        # Sombra
+        r, g, b = self.shadow_color[:3]
+        self._shadow_color_instruction.rgba = (r, g, b, shadow_alpha)
+        self._shadow_instruction.pos = (self.x - self.shadow_spread + self.shadow_offset_x,
+                                        self.y - self.shadow_spread - current_shadow_offset_y)
+        self._shadow_instruction.size = (self.width + 2 * self.shadow_spread,
+                                         self.height + 2 * self.shadow_spread)
+        if not self._shadow_is_square:
+            self._shadow_instruction.radius = self.button_radius
+
+        # Fondo principal del botón
+        self._background_color_instruction.rgba = self.background_color
+        self._background_instruction.pos = self.pos
+        self._background_instruction.size = self.size
+        self._background_instruction.radius = self.button_radius
+
+
+class VStack(Layout):
+    """
+    Columna vertical para el contenido de las pantallas, sin widgets espaciadores.
+    Cada hijo tiene altura fija (size_hint_y=None) y declara al añadirlo el espacio que lo separa
+    del anterior: add_widget(widget, gap=dp(15)). Los hijos se apilan desde el borde inferior del
+    padding hacia arriba, como en un BoxLayout vertical con espaciadores, en una sola pasada que
+    también mide la altura del contenido (minimum_height). El ancho sigue size_hint_x y la posición
+    horizontal pos_hint ('x', 'center_x' o 'right') dentro del padding.
+    """
+    padding = VariableListProperty([0, 0, 0, 0]) # [izquierda, arriba, derecha, abajo]
+    minimum_height = NumericProperty(0) # Altura del contenido con el padding y los espacios
 
-            # Efecto al presionar: la sombra se mueve hacia arriba (o el botón hacia abajo)
-            if self.state == 'down':
-                current_shadow_offset_y = dp(1) # Sombra más cerca del botón
-                current_shadow_color[3] = 0.5 # Sombra un poco menos opaca
-            else:
-                current_shadow_offset_y = self.shadow_offset_y # Vuelve al offset normal
-                current_shadow_color[3] = 1.0 # Vuelve a la opacidad normal
-
-            # Dibujar la sombra
-            Color(*current_shadow_color)
-            if all(r == 0 for r in self.shadow_radius):
-                Rectangle(
-                    pos=(self.x - self.shadow_spread + self.shadow_offset_x,
-                         self.y - self.shadow_spread - current_shadow_offset_y),
-                    size=(self.width + 2 * self.shadow_spread,
-                          self.height + 2 * self.shadow_spread)
-                )
+    def __init__(self, **kwargs):
+        self._gaps = {} # hijo -> espacio sobre él
+        super().__init__(**kwargs)
+        update = self._trigger_layout
+        for name in ('padding', 'children', 'size', 'pos'):
+            self.fbind(name, update)
+
+    def add_widget(self, widget, *args, gap=0, **kwargs):
+        self._gaps[widget] = gap
+        # La posición de cada hijo depende de la altura de los de abajo: si un hijo cambia de tamaño
+        # (p. ej. una etiqueta que crece con su texto) hay que volver a apilar
+        widget.fbind('size', self._trigger_layout)
+        widget.fbind('pos_hint', self._trigger_layout)
+        super().add_widget(widget, *args, **kwargs)
+
+    def remove_widget(self, widget, *args, **kwargs):
+        self._gaps.pop(widget, None)
+        widget.funbind('size', self._trigger_layout)
+        widget.funbind('pos_hint', self._trigger_layout)
+        super().remove_widget(widget, *args, **kwargs)
+
+    def do_layout(self, *args):
+        left, top, right, bottom = self.padding
+        x = self.x + left
+        width = self.width - left - right
+        y = self.y + bottom
+        for child in self.children: # El último añadido primero: es el de abajo
+            if child.size_hint_x is not None:
+                child.width = child.size_hint_x * width
+            hint = child.pos_hint
+            if 'center_x' in hint:
+                child.pos = (x + hint['center_x'] * width - child.width / 2, y)
+            elif 'right' in hint:
+                child.pos = (x + hint['right'] * width - child.width, y)
             else:
-                RoundedRectangle(
-                    pos=(self.x - self.shadow_spread + self.shadow_offset_x,
-                         self.y - self.shadow_spread - current_shadow_offset_y),
-                    size=(self.width + 2 * self.shadow_spread,
-                          self.height + 2 * self.shadow_spread),
-                    radius=self.button_radius
-                )
-            # Dibujar el fondo principal del botón
-            Color(*self.background_color)
-            RoundedRectangle(
-                pos=self.pos,
-                size=self.size,
-                radius=self.button_radius
-            )
+                child.pos = (x + hint.get('x', 0) * width, y)
+            y += child.height + self._gaps[child]
+        self.minimum_height = y - self.y + top
+
+
+def make_date_input():
+    """
+    Crea el campo opcional de fecha (DD/MM/AAAA) que acompaña a los campos de monto.
+    Si se deja vacío se usa la tasa BCV actual.
+    """
+    return TextInput(hint_text='DD/MM/AAAA', font_size=dp(13),
+                     foreground_color=(1, 1, 1, 1),
+                     hint_text_color=(0.7, 0.7, 0.7, 1),
+                     background_color=(0.1, 0.1, 0.1, 1),
+                     padding=[dp(8), dp(15), dp(8), dp(15)],
+                     size_hint_x=0.38,
+                     multiline=False,
+                     cursor_color=(1,1,1,1),
+                     font_name=FONT_REGULAR if FONT_REGULAR else 'Roboto')
+
+
+def make_currency_picker(app):
+    """
+    Crea el selector de la moneda extranjera a convertir. Ofrece las monedas con tasa disponible
+    (app.rate_matrix) y se mantiene sincronizado con app.currency, compartida por todas las pantallas.
+    """
+    picker = Spinner(text=app.currency, values=app.rate_matrix.foreign_currencies() or (USD,),
+                     font_size=dp(13),
+                     color=(1, 1, 1, 1),
+                     background_normal='',
+                     background_color=(0.1, 0.1, 0.1, 1),
+                     size_hint_x=0.22,
+                     font_name=FONT_BOLD if FONT_BOLD else 'Roboto')
+    picker.bind(text=lambda instance, value: setattr(app, 'currency', value))
+    app.bind(currency=picker.setter('text'),
+             rate_matrix=lambda instance, matrix: setattr(picker, 'values', matrix.foreign_currencies() or (USD,)))
+    return picker
+
+
+def currency_prefix(currency):
+    """Prefijo con el que se muestran los montos en la moneda extranjera ("$" para el dólar)."""
+    return "$" if currency == USD else f"{currency} "
+
+
+class UiUpdateQueue:
+    """
+    Cola única de cambios hacia el hilo principal de Kivy, segura entre hilos.
+    Los resultados del bucle de descargas y los cambios de estado se publican aquí en vez de
+    programar un evento del Clock (y una lambda) por resultado; la cola se vacía una vez por frame:
+    - call(callback, *args): ejecuta un callback, en el orden de llegada;
+    - post(objeto, propiedad, valor): asigna una propiedad; varias asignaciones a la misma propiedad
+      antes de vaciar la cola se reducen a la última, y si el valor no cambia no se asigna
+      (no se disparan bindings ni se rehacen etiquetas);
+    - request(callback): rehace una vista una sola vez, después de aplicar los cambios, aunque
+      la hayan pedido varias propiedades.
+    """
+
+    _MAX_ROUNDS = 4 # Pasadas por frame si los callbacks publican más cambios mientras se vacía la cola
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = []
+        self._assignments = {} # (objeto, propiedad) -> valor, en el orden de la primera asignación
+        self._renders = {} # callback -> None (conjunto ordenado)
+        self._trigger = Clock.create_trigger(self._drain, 0) # Programar y cancelar en el Clock es seguro entre hilos
+        self.counters = {'calls': 0, 'posted': 0, 'coalesced': 0, 'applied': 0, 'unchanged': 0,
+                         'renders': 0, 'render_requests': 0, 'drains': 0}
+
+    def call(self, callback, *args):
+        with self._lock:
+            self._calls.append((callback, args))
+        self._trigger()
+
+    def post(self, target, name, value):
+        with self._lock:
+            self.counters['posted'] += 1
+            if (target, name) in self._assignments:
+                self.counters['coalesced'] += 1
+            self._assignments[(target, name)] = value
+        self._trigger()
+
+    def request(self, callback):
+        with self._lock:
+            self.counters['render_requests'] += 1
+            self._renders[callback] = None
+        self._trigger()
+
+    def flush(self):
+        """Vacía la cola en este momento (solo desde el hilo principal, p. ej. antes del primer frame)."""
+        self._trigger.cancel()
+        self._drain(0)
+
+    def _drain(self, dt):
+        self.counters['drains'] += 1
+        for _ in range(self._MAX_ROUNDS):
+            with self._lock:
+                calls, self._calls = self._calls, []
+            for callback, args in calls:
+                self.counters['calls'] += 1
+                callback(*args)
+            with self._lock:
+                assignments, self._assignments = self._assignments, {}
+            for (target, name), value in assignments.items():
+                if getattr(target, name) == value:
+                    self.counters['unchanged'] += 1
+                    continue
+                self.counters['applied'] += 1
+                setattr(target, name, value)
+            if not calls and not assignments:
+                break
+        with self._lock:
+            renders, self._renders = self._renders, {}
+        for callback in renders:
+            self.counters['renders'] += 1
+            callback()
+
+
+class LiveConversion:
+    """
+    Conversión mientras se escribe (modo opcional, live_conversion en la sección [ui]).
+    Cada cambio en los campos observados reprograma un único evento del Clock (debounce), así una
+    ráfaga de teclas produce un solo cálculo. Las etiquetas solo se tocan cuando el resultado
+    formateado cambia, para no rehacer su layout (ni la textura del texto) sin motivo.
+    """
+
+    def __init__(self, compute, outputs, debounce):
+        """
+        compute(): devuelve una tupla con el texto de cada etiqueta de `outputs`.
+        debounce: segundos sin cambios que se esperan antes de recalcular.
+        """
+        self.compute = compute
+        self.outputs = outputs
+        self._last_texts = None
+        self._trigger = Clock.create_trigger(self._update, debounce)
+        self.counters = {'scheduled': 0, 'computed': 0, 'unchanged': 0}
+
+    def watch(self, widget, *properties):
+        """Recalcula cuando cambia alguna de las propiedades del widget (o de la app)."""
+        for name in properties:
+            widget.fbind(name, self.schedule)
+        return self
+
+    def schedule(self, *args):
+        self.counters['scheduled'] += 1
+        self._trigger.cancel() # Reiniciar la espera: solo se calcula tras la última tecla
+        self._trigger()
+
+    def _update(self, dt):
+        self.counters['computed'] += 1
+        texts = self.compute()
+        if texts == self._last_texts:
+            self.counters['unchanged'] += 1
+            return
+        self._last_texts = texts
+        for label, text in zip(self.outputs, texts):
+            if label.text != text:
+                label.text = text
+
+    def reset(self):
+        """Olvida el último resultado (p. ej. si otro código cambió las etiquetas)."""
+        self._last_texts = None
+
+
+def make_live_conversion(app, compute, outputs):
+    """Crea la conversión en vivo si está activada en la configuración; si no, devuelve None."""
+    if not app.config.getboolean('ui', 'live_conversion'):
+        return None
+    return LiveConversion(compute, outputs, app.config.getfloat('ui', 'live_debounce'))
+
+
+def make_coin_image():
+    """
+    Crea la imagen de la moneda usando la textura compartida de AssetCache.
+    Si el archivo no está disponible se usa un placeholder remoto.
+    """
+    texture = assets.texture(COIN_IMAGE, dp(100))
+    if texture is None:
+        print(f"ERROR: La imagen '{COIN_IMAGE}' no se encontró. Se usará un placeholder.")
+        return Image(source=COIN_PLACEHOLDER_URL,
+                     size_hint=(None, None), size=(dp(100), dp(100)),
+                     pos_hint={'center_x': 0.5})
+    return Image(texture=texture,
+                 size_hint=(None, None), size=(dp(100), dp(100)),
+                 pos_hint={'center_x': 0.5})
+
+
+class LazyScreenManager(ScreenManager):
+    """
+    ScreenManager que construye cada pantalla la primera vez que se necesita.
+    Las pantallas se registran con register(nombre, fábrica) y se crean al navegar a ellas
+    (self.manager.current = nombre) o al pedirlas con get_screen.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._factories = {} # nombre -> clase o función que crea la pantalla
+
+    def register(self, name, factory):
+        """Registra la fábrica de una pantalla sin construirla."""
+        self._factories[name] = factory
+
+    def _build(self, name):
+        factory = self._factories.pop(name)
+        start = time.perf_counter()
+        screen = factory(name=name)
+        self.add_widget(screen)
+        print(f"DEBUG: Built screen '{name}' in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return screen
+
+    def get_screen(self, name):
+        if name in self._factories:
+            return self._build(name)
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+
+    def is_built(self, name):
+        """Indica si la pantalla ya se construyó (sin construirla)."""
+        return name not in self._factories and super().has_screen(name)
+
+    def build_next_pending(self):
+        """Construye una pantalla registrada aún no creada. Devuelve False si no quedaba ninguna."""
+        if not self._factories:
+            return False
+        self._build(next(iter(self._factories)))
+        return True
 
 
 class LoadingScreen(Screen):
@@ -136,7 +588,7 @@ class LoadingScreen(Screen):
 class MainScreen(Screen):
     """
     Pantalla principal de la aplicación.
-    Permite al usuario ingresar una cantidad en USD y muestra una frase motivacional.
+    Permite al usuario ingresar una cantidad en USD (u otra moneda con tasa BCV) y muestra una frase motivacional.
     """
     motivational_quote_text = StringProperty("Cargando frase motivacional...")
 
@@ -145,6 +597,15 @@ class MainScreen(Screen):
         self.name = 'main'
         self.app = App.get_running_app()
         self.setup_ui()
+        # Cuando la propiedad motivational_quote_text de la App cambie,
+        # actualiza la propiedad motivational_quote_text de la MainScreen.
+        self.motivational_quote_text = self.app.motivational_quote_text
+        self.app.bind(motivational_quote_text=self.setter('motivational_quote_text'))
+        # Los textos del campo de monto y del botón dicen la moneda elegida en el selector
+        self.on_app_currency(self.app, self.app.currency)
+        self.app.bind(currency=self.on_app_currency)
+        # Monto y fecha que había escritos al cerrar la app (ver ConverterApp.restore_state)
+        self.restore_inputs(self.app.take_restored_inputs(self.name))
         # ELIMINADO: Las llamadas a Clock.schedule_once para fetching se moverán a ConverterApp.start_app_init_tasks
         # Iniciar la carga de la frase motivacional al inicio
         # Clock.schedule_once(self.app.fetch_motivational_quote, 0)
@@ -153,30 +614,13 @@ class MainScreen(Screen):
 
     def setup_ui(self):
         """Configura la interfaz de usuario de la pantalla principal."""
-        # BoxLayout principal que contendrá todos los elementos
-        main_content_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(0), # Espaciado entre elementos del layout
-                                        size_hint=(0.9, None)) # Ancho 90%, altura automática (se ajusta al contenido)
+        # Columna principal que contendrá todos los elementos (los espacios se declaran en cada add_widget)
+        main_content_layout = VStack(padding=dp(20), size_hint=(0.9, None)) # Ancho 90%
         # CAMBIO: Ajustar pos_hint para bajar todos los elementos de la pantalla principal
         main_content_layout.pos_hint = {'center_x': 0.5, 'center_y': 0.19}
 
-        # Imagen de la moneda
-        image_source = 'icono_moneda.png'
-        try:
-            if not resource_find(image_source):
-                print(f"ERROR: La imagen '{image_source}' no se encontró. Se usará un placeholder.")
-                image_source = 'https://placehold.co/100x100/gold/white?text=$'
-            else:
-                print(f"DEBUG: Intentando cargar imagen desde: {resource_find(image_source)}")
-
-            coin_image = Image(source=image_source,
-                               size_hint=(None, None), size=(dp(100), dp(100)),
-                               pos_hint={'center_x': 0.5})
-
-        except Exception as e:
-            print(f"ERROR: No se pudo cargar la imagen '{image_source}'. Error: {e}")
-            coin_image = Image(source='https://placehold.co/100x100/gold/white?text=$',
-                               size_hint=(None, None), size=(dp(100), dp(100)),
-                               pos_hint={'center_x': 0.5})
+        # Imagen de la moneda (textura compartida entre pantallas)
+        coin_image = make_coin_image()
 
         main_content_layout.add_widget(coin_image)
 
@@ -192,8 +636,9 @@ class MainScreen(Screen):
                                               font_name=font_name_label)
         main_content_layout.add_widget(self.motivational_quote_label)
 
-        # Espaciador entre la frase y el input (espacio de 15dp)
-        main_content_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(15)))
+        # Contenedor para el monto, su moneda y la fecha opcional de la factura
+        input_container = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint=(None, None), size=(dp(280), dp(50)),
+                                    pos_hint={'center_x': 0.5})
 
         # Input para la cantidad en USD
         self.usd_input = TextInput(hint_text='Valor USD a convertir', font_size=dp(18),
@@ -201,18 +646,37 @@ class MainScreen(Screen):
                                    hint_text_color=(0.7, 0.7, 0.7, 1),
                                    background_color=(0.1, 0.1, 0.1, 1),
                                    padding=[dp(20), dp(12), dp(20), dp(12)],
-                                   size_hint=(None, None), size=(dp(280), dp(50)),
-                                   pos_hint={'center_x': 0.5},
+                                   size_hint_x=0.45,
                                    multiline=False, input_type='number',
                                    cursor_color=(1,1,1,1),
                                    font_name=FONT_BOLD if FONT_BOLD else 'Roboto')
-        main_content_layout.add_widget(self.usd_input)
-
-        # Espaciador entre el input y el botón (espacio de 10dp)
-        main_content_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(10)))
-
-        # Botón Convertir (usando la clase RoundedShadowButton) - USD a VES
-        convert_usd_button = RoundedShadowButton(text='Convertir USD a VES', font_size=dp(20),
+        input_container.add_widget(self.usd_input)
+
+        # Selector de la moneda del monto
+        self.currency_picker = make_currency_picker(self.app)
+        input_container.add_widget(self.currency_picker)
+
+        # Input para la fecha (opcional): convierte con la tasa vigente en esa fecha
+        self.date_input = make_date_input()
+        self.date_input.size_hint_x = 0.33
+        input_container.add_widget(self.date_input)
+        main_content_layout.add_widget(input_container, gap=dp(15)) # 15dp entre la frase y el input
+
+        # Conversión en vivo (opcional): el resultado aparece bajo el campo mientras se escribe,
+        # sin pasar por la pantalla de resultados
+        self.live_result_label = None
+        self.live_conversion = make_live_conversion(self.app, self.compute_live_result, [])
+        if self.live_conversion is not None:
+            self.live_result_label = Label(text="", font_size=dp(18), color=(1, 1, 1, 1),
+                                           halign='center', size_hint_y=None, height=dp(30),
+                                           font_name=FONT_BOLD if FONT_BOLD else 'Roboto')
+            main_content_layout.add_widget(self.live_result_label)
+            self.live_conversion.outputs.append(self.live_result_label)
+            self.live_conversion.watch(self.usd_input, 'text').watch(self.date_input, 'text')
+            self.live_conversion.watch(self.app, 'currency', 'bcv_rate', 'rate_matrix')
+
+        # Botón Convertir (usando la clase RoundedShadowButton) - moneda elegida a VES
+        self.convert_usd_button = convert_usd_button = RoundedShadowButton(text='Convertir USD a VES', font_size=dp(20),
                                 background_color=(0.1, 0.1, 0.1, 1),
                                 color=(1, 1, 1, 1),
                                 size_hint=(None, None), size=(dp(280), dp(50)),
@@ -226,10 +690,7 @@ class MainScreen(Screen):
                                 shadow_color=[1, 1, 1, 1],
                                 shadow_spread=dp(2)
                                 )
-        main_content_layout.add_widget(convert_usd_button)
-
-        # Espaciador entre los botones
-        main_content_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(20)))
+        main_content_layout.add_widget(convert_usd_button, gap=dp(10)) # 10dp entre el input y el botón
 
         # Botón para ir a la pantalla de conversión VES a USD
         go_to_ves_usd_button = RoundedShadowButton(text='Convertir VES a USD', font_size=dp(20),
@@ -246,10 +707,7 @@ class MainScreen(Screen):
                                 shadow_color=[1, 1, 1, 1],
                                 shadow_spread=dp(2)
                                 )
-        main_content_layout.add_widget(go_to_ves_usd_button)
-
-        # Espaciador entre los botones (nuevo)
-        main_content_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(20)))
+        main_content_layout.add_widget(go_to_ves_usd_button, gap=dp(20)) # 20dp entre los botones
 
         # CAMBIO: Botón "Ver tasa BCV de hoy" movido a la última posición
         view_bcv_rate_button = RoundedShadowButton(text='Ver tasa BCV de hoy', font_size=dp(20),
@@ -266,7 +724,7 @@ class MainScreen(Screen):
                                 shadow_color=[1, 1, 1, 1],
                                 shadow_spread=dp(2)
                                 )
-        main_content_layout.add_widget(view_bcv_rate_button)
+        main_content_layout.add_widget(view_bcv_rate_button, gap=dp(20))
 
 
         self.add_widget(main_content_layout) # Añadir el layout de contenido a la pantalla
@@ -281,22 +739,24 @@ class MainScreen(Screen):
         print(f"DEBUG (MainScreen.on_motivational_quote_text): Label text updated to: '{value}'")
 
 
+    def on_enter(self, *args):
+        """Se llama cuando termina la transición: la pantalla principal ya es usable."""
+        self.app.mark_startup('main_entered')
+
     def on_pre_enter(self, *args):
         """
         Se llama justo antes de que la pantalla se haga activa.
-        Asegura que la frase motivacional se muestre actualizada o se vuelva a cargar.
+        Asegura que la frase motivacional mostrada sea la actual de la App.
         """
-        print(f"DEBUG (MainScreen.on_pre_enter): Current phrase in MainScreen (before possible update): '{self.motivational_quote_text}'")
-        # El mensaje de "Cargando frase motivacional..." o el de fallback se maneja ahora desde la App
-        # No es necesario recargar aquí a menos que sea el mensaje inicial "Cargando..."
-        if self.app.motivational_quote_text == "Cargando frase motivacional...":
-            print("DEBUG (MainScreen.on_pre_enter): Phrase in App is initial placeholder, attempting to reload.")
-            Clock.schedule_once(self.app.fetch_motivational_quote, 0)
-        # Si el mensaje es el de fallback, no se intenta recargar aquí para evitar loops
-        # Se asume que el fallback ya es la frase deseada por el usuario.
-
         self.motivational_quote_text = self.app.motivational_quote_text
-        print(f"DEBUG (MainScreen.on_pre_enter): Phrase in MainScreen (after possible update): '{self.motivational_quote_text}'")
+        print(f"DEBUG (MainScreen.on_pre_enter): Current phrase in MainScreen: '{self.motivational_quote_text}'")
+
+    def on_leave(self, *args):
+        """
+        Al salir de la pantalla (ya no es visible) se pasa a la siguiente frase de la reserva,
+        así al volver se ve una frase distinta sin esperar a la red.
+        """
+        self.app.next_motivational_quote()
 
 
     def convert_currency(self, instance):
@@ -305,20 +765,57 @@ class MainScreen(Screen):
         Pasa a la pantalla de resultados y muestra la conversión.
         """
         try:
-            usd_amount = float(self.usd_input.text)
-            self.app.usd_amount = usd_amount # Guarda el monto USD en la app
-            self.manager.current = 'result'
+            usd_amount = parse_decimal(self.usd_input.text) # Exacto: se redondea solo el resultado
         except ValueError:
             print("Por favor, ingrese un número válido.")
             self.usd_input.text = ""
             self.usd_input.hint_text = "¡Error! Ingrese un número."
+            return
+        date_text = self.date_input.text.strip()
+        if date_text and parse_date(date_text) is None:
+            self.date_input.text = ""
+            self.date_input.hint_text = "¡Fecha inválida!"
+            return
+        self.app.usd_amount = usd_amount # Guarda el monto USD en la app
+        self.app.conversion_date = date_text # Vacío = tasa actual
+        self.manager.current = 'result'
+
+    def compute_live_result(self):
+        """Texto del resultado en vivo para el monto y la fecha escritos (sin validar con mensajes de error)."""
+        text = self.usd_input.text.strip()
+        if not text:
+            return ("",)
+        amount = try_parse_decimal(text)
+        if amount is None:
+            return ("Monto inválido",)
+        date_text = self.date_input.text.strip()
+        if date_text and parse_date(date_text) is None:
+            return ("Fecha inválida",) if len(date_text) >= 8 else ("",) # Aún se está escribiendo
+        rate = self.app.rate_for_date(date_text, self.app.currency)
+        if rate <= 0:
+            return ("Tasa no disponible",)
+        return (f"Bs {convert_money(amount, rate, USD_TO_VES):,.2f}",)
+
+    def snapshot_inputs(self):
+        """Textos escritos que se guardan en la instantánea del estado."""
+        return {'amount': self.usd_input.text, 'date': self.date_input.text}
+
+    def restore_inputs(self, inputs):
+        self.usd_input.text = inputs.get('amount', '')
+        self.date_input.text = inputs.get('date', '')
+
+    def on_app_currency(self, instance, currency):
+        """Actualiza los textos que nombran la moneda elegida."""
+        self.usd_input.hint_text = f"Valor {currency} a convertir"
+        self.convert_usd_button.text = f"Convertir {currency} a VES"
 
     def view_bcv_rate_today(self, instance):
         """
-        Maneja la lógica para ver la tasa BCV de hoy (1 USD a VES).
+        Maneja la lógica para ver la tasa BCV de hoy (1 unidad de la moneda elegida a VES).
         Establece usd_amount a 1 y navega a la pantalla de resultados.
         """
-        self.app.usd_amount = 1.0 # Establece el monto a 1 USD
+        self.app.usd_amount = Decimal(1) # Establece el monto a 1 USD
+        self.app.conversion_date = "" # Siempre la tasa de hoy
         self.manager.current = 'result'
 
     def go_to_ves_usd_screen(self, instance):
@@ -331,7 +828,8 @@ class MainScreen(Screen):
 class ResultScreen(Screen):
     """
     Pantalla de resultados.
-    Muestra el monto en USD y su equivalente en Bolívar (Bs) usando la tasa BCV.
+    Muestra el monto en la moneda elegida y su equivalente en Bolívar (Bs) usando la tasa BCV.
+    Si se cambia la moneda en el selector, la conversión se rehace con la tasa cruzada.
     """
     bcv_rate_text = StringProperty("Tasa BCV hoy: No disponible") # Cambiado el texto inicial
 
@@ -340,39 +838,35 @@ class ResultScreen(Screen):
         self.name = 'result'
         self.app = App.get_running_app()
         self.setup_ui()
+        # Vincular la propiedad bcv_rate de la app al texto de la tasa BCV de esta pantalla
+        self.on_app_bcv_rate(self.app, self.app.bcv_rate)
+        self.app.bind(bcv_rate=self.on_app_bcv_rate)
+        # Cambiar de moneda, o recibir tasas nuevas de otras monedas, rehace la conversión mostrada
+        self.app.bind(currency=self.on_app_rates_changed, rate_matrix=self.on_app_rates_changed)
+
+    def on_app_bcv_rate(self, instance, value):
+        """Actualiza bcv_rate_text cuando cambia la tasa BCV de la app."""
+        self.bcv_rate_text = f"Tasa BCV hoy: {value:.2f} Bs" if value > 0 else "Tasa BCV hoy: No disponible"
+
+    def on_app_rates_changed(self, instance, value):
+        """Cambió la moneda o llegaron tasas nuevas: la conversión se rehace una sola vez en este frame."""
+        self.app.ui_updates.request(self.refresh_if_current)
+
+    def refresh_if_current(self):
+        if self.manager is not None and self.manager.current == self.name:
+            self.on_enter()
 
     def setup_ui(self):
         """Configura la interfaz de usuario de la pantalla de resultados."""
-        # BoxLayout principal que contendrá todos los elementos
-        # Se cambia spacing a 0 para controlar los espacios manualmente
-        result_content_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(0),
-                                          size_hint=(0.9, None))
+        # Columna principal que contendrá todos los elementos (los espacios se declaran en cada add_widget)
+        result_content_layout = VStack(padding=dp(20), size_hint=(0.9, None))
         # CAMBIO REALIZADO: Ajustar center_y para subir el contenido y dejar espacio para la imagen y la tasa.
         result_content_layout.pos_hint = {'center_x': 0.5, 'center_y': 0.35}
 
-        # Imagen de la moneda
-        image_source = 'icono_moneda.png'
-        try:
-            if not resource_find(image_source):
-                print(f"ERROR: La imagen '{image_source}' no se encontró. Se usará un placeholder.")
-                image_source = 'https://placehold.co/100x100/gold/white?text=$'
-            else:
-                print(f"DEBUG: Intentando cargar imagen desde: {resource_find(image_source)}")
-
-            coin_image = Image(source=image_source,
-                               size_hint=(None, None), size=(dp(100), dp(100)),
-                               pos_hint={'center_x': 0.5})
-
-        except Exception as e:
-            print(f"ERROR: No se pudo cargar la imagen '{image_source}'. Error: {e}")
-            coin_image = Image(source='https://placehold.co/100x100/gold/white?text=$',
-                               size_hint=(None, None), size=(dp(100), dp(100)),
-                               pos_hint={'center_x': 0.5})
+        # Imagen de la moneda (textura compartida entre pantallas)
+        coin_image = make_coin_image()
         result_content_layout.add_widget(coin_image)
 
-        # Espaciador explícito entre la imagen y la tasa BCV (antes era implícito por spacing=10)
-        result_content_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(10)))
-
         # Contenedor para la tasa BCV (siempre visible)
         font_name_label = FONT_REGULAR if FONT_REGULAR else 'Roboto'
         rate_font_size = dp(18)
@@ -381,22 +875,22 @@ class ResultScreen(Screen):
                                      halign='center', valign='middle', size_hint_x=1,
                                      size_hint_y=None, height=dp(30),
                                      font_name=font_name_label)
-        result_content_layout.add_widget(self.bcv_rate_label)
+        result_content_layout.add_widget(self.bcv_rate_label, gap=dp(10)) # 10dp entre la imagen y la tasa BCV
 
-        # Espaciador explícito entre la tasa BCV y los inputs de USD/Bs (antes era 15dp explícito + 10dp implícito = 25dp)
-        result_content_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(25)))
-
-        # Contenedor para USD y Bs displays
+        # Contenedor para el selector de moneda y los displays del monto y de Bs
         display_container = BoxLayout(orientation='horizontal', spacing=dp(20), size_hint=(None, None), size=(dp(300), dp(50)),
                                       pos_hint={'center_x': 0.5})
 
-        # TextInput para el valor en USD con formato "$___"
+        self.currency_picker = make_currency_picker(self.app)
+        display_container.add_widget(self.currency_picker)
+
+        # TextInput para el valor en la moneda elegida con formato "$___" (o "EUR ___", ...)
         self.usd_display = TextInput(text='', font_size=dp(18),
                                      foreground_color=(1, 1, 1, 1),
                                      background_color=(0.1, 0.1, 0.1, 1),
                                      padding=[dp(20), dp(12), dp(20), dp(12)],
                                      readonly=True, multiline=False,
-                                     size_hint_x=0.4, # Ancho ajustado para USD
+                                     size_hint_x=0.3, # Ancho ajustado para el monto
                                      halign='center',
                                      cursor_color=(1,1,1,1),
                                      font_name=FONT_BOLD if FONT_BOLD else 'Roboto')
@@ -408,15 +902,12 @@ class ResultScreen(Screen):
                                     background_color=(0.1, 0.1, 0.1, 1),
                                     padding=[dp(20), dp(12), dp(20), dp(12)],
                                     readonly=True, multiline=False,
-                                    size_hint_x=0.6, # Ancho ajustado para Bs
+                                    size_hint_x=0.48, # Ancho ajustado para Bs
                                     halign='center',
                                     cursor_color=(1,1,1,1),
                                     font_name=FONT_BOLD if FONT_BOLD else 'Roboto')
         display_container.add_widget(self.bs_display)
-        result_content_layout.add_widget(display_container)
-
-        # Espaciador entre los outputs y el botón "Volver" (dp(10) para el espacio visible)
-        result_content_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(10)))
+        result_content_layout.add_widget(display_container, gap=dp(25)) # 25dp entre la tasa BCV y los displays
 
         # Botón Volver (usando la clase RoundedShadowButton)
         back_button = RoundedShadowButton(text='Volver', font_size=dp(20),
@@ -434,7 +925,7 @@ class ResultScreen(Screen):
                              shadow_spread=dp(2)
                              )
 
-        result_content_layout.add_widget(back_button)
+        result_content_layout.add_widget(back_button, gap=dp(10)) # 10dp entre los displays y el botón
 
         self.add_widget(result_content_layout) # Añadir el layout de contenido a la pantalla
 
@@ -443,27 +934,36 @@ class ResultScreen(Screen):
         Se llama cuando la pantalla de resultados se hace activa.
         Establece la conversión inicial a BCV y actualiza los displays.
         """
-        self.usd_display.text = f"${self.app.usd_amount:.2f}"
+        self.usd_display.text = f"{currency_prefix(self.app.currency)}{Money.of(self.app.usd_amount):.2f}"
 
-        # Por defecto, usar la tasa BCV si está disponible
-        if self.app.bcv_rate > 0:
-            self.app.set_conversion_rate(self.app.bcv_rate)
+        # Por defecto, usar la tasa BCV actual; con fecha, la vigente en esa fecha según el historial
+        rate = self.app.rate_for_date(self.app.conversion_date, self.app.currency)
+        if rate > 0:
+            self.app.set_conversion_rate(rate)
         else:
             self.bs_display.text = "Error de tasa"
             self.app.current_conversion_rate = 0
 
-        # Actualizar la visualización de la tasa BCV
-        self.update_bcv_display()
+        # Actualizar la visualización de la tasa BCV (una sola vez por frame aunque también cambie la tasa)
+        self.app.ui_updates.request(self.update_bcv_display)
 
     def update_bcv_display(self):
         """
         Actualiza el texto de la tasa BCV y el display de la conversión principal.
         """
-        self.bcv_rate_label.text = f"Tasa BCV hoy: {self.app.bcv_rate:.2f} Bs" if self.app.bcv_rate > 0 else "Tasa BCV hoy: No disponible"
+        currency = self.app.currency
+        if self.app.conversion_date:
+            rate = self.app.current_conversion_rate
+            self.bcv_rate_label.text = f"Tasa BCV {currency} al {self.app.conversion_date}: {rate:.2f} Bs" if rate > 0 else f"Tasa BCV {currency} al {self.app.conversion_date}: No disponible"
+        elif currency == USD:
+            self.bcv_rate_label.text = f"Tasa BCV hoy: {self.app.bcv_rate:.2f} Bs" if self.app.bcv_rate > 0 else "Tasa BCV hoy: No disponible"
+        else:
+            rate = self.app.current_conversion_rate
+            self.bcv_rate_label.text = f"Tasa BCV {currency} hoy: {rate:.2f} Bs" if rate > 0 else f"Tasa BCV {currency} hoy: No disponible"
 
         # Actualizar el display de Bolívares con la tasa de conversión actual
         if self.app.current_conversion_rate > 0:
-            converted_bs = self.app.usd_amount * self.app.current_conversion_rate
+            converted_bs = convert_money(self.app.usd_amount, self.app.current_conversion_rate, USD_TO_VES)
             self.bs_display.text = f"Bs {converted_bs:.2f}"
         else:
             self.bs_display.text = "Error de tasa"
@@ -493,62 +993,77 @@ class VesToUsdScreen(Screen):
         Asegura que la tasa BCV se intente cargar o actualizar, aunque no se muestre directamente.
         """
         print(f"DEBUG (VesToUsdScreen.on_enter): Entering VesToUsdScreen. Current app.bcv_rate: {self.app.bcv_rate}")
-        # Limpiar cualquier mensaje anterior
+        # Limpiar cualquier mensaje anterior; la primera vez se recupera lo escrito al cerrar la app
         self.message_label.text = ""
         self.usd_result_label.text = "Total en USD: 0.00"
-        self.ves_input.text = ""
+        inputs = self.app.take_restored_inputs(self.name)
+        self.ves_input.text = inputs.get('amount', '')
+        if inputs:
+            self.date_input.text = inputs.get('date', '')
+        if self.live_conversion is not None:
+            self.live_conversion.reset()
+
+    def snapshot_inputs(self):
+        """Textos escritos que se guardan en la instantánea del estado."""
+        return {'amount': self.ves_input.text, 'date': self.date_input.text}
+
+    def compute_live_result(self):
+        """(total en USD, mensaje) para el monto y la fecha escritos."""
+        text = self.ves_input.text.strip()
+        if not text:
+            return ("Total en USD: 0.00", "")
+        ves_amount = try_parse_decimal(text)
+        if ves_amount is None:
+            return ("Total en USD: 0.00", "Entrada VES inválida. Ingrese un número.")
+        if ves_amount < 0:
+            return ("Total en USD: 0.00", "Por favor, ingrese un valor positivo para VES.")
+        date_text = self.date_input.text.strip()
+        if date_text and parse_date(date_text) is None:
+            return ("Total en USD: 0.00", "Fecha inválida. Use DD/MM/AAAA." if len(date_text) >= 8 else "")
+        rate = self.app.rate_for_date(date_text)
+        if rate <= 0:
+            message = ("No hay tasa BCV registrada para esa fecha." if date_text
+                       else "Tasa BCV no disponible. Intente de nuevo más tarde.")
+            return ("Total en USD: 0.00", message)
+        return (f"Total en USD: {convert_money(ves_amount, rate, VES_TO_USD):,.2f}", "")
 
 
     def setup_ui(self):
         """Configura la interfaz de usuario de la pantalla de VES a USD."""
-        # CAMBIO REALIZADO: Ajustar pos_hint y spacing para que se vea mejor el layout
-        ves_usd_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(0), # CAMBIADO: spacing a 0
-                                   size_hint=(0.9, None))
+        # Columna principal (los espacios se declaran en cada add_widget)
+        ves_usd_layout = VStack(padding=dp(20), size_hint=(0.9, None))
         ves_usd_layout.pos_hint = {'center_x': 0.5, 'center_y': 0.2} # Ajustado a 0.2 para subir el contenido
 
 
-        # Imagen de la moneda
-        image_source = 'icono_moneda.png'
-        try:
-            if not resource_find(image_source):
-                print(f"ERROR: La imagen '{image_source}' no se encontró. Se usará un placeholder.")
-                image_source = 'https://placehold.co/100x100/gold/white?text=$'
-            else:
-                print(f"DEBUG: Intentando cargar imagen desde: {resource_find(image_source)}")
-
-            coin_image = Image(source=image_source,
-                               size_hint=(None, None), size=(dp(100), dp(100)),
-                               pos_hint={'center_x': 0.5})
-
-        except Exception as e:
-            print(f"ERROR: No se pudo cargar la imagen '{image_source}'. Error: {e}")
-            coin_image = Image(source='https://placehold.co/100x100/gold/white?text=$',
-                               size_hint=(None, None), size=(dp(100), dp(100)),
-                               pos_hint={'center_x': 0.5})
+        # Imagen de la moneda (textura compartida entre pantallas)
+        coin_image = make_coin_image()
         ves_usd_layout.add_widget(coin_image)
 
         # ELIMINADO: La etiqueta de la tasa BCV se elimina de esta pantalla
 
-        # Espaciador entre la imagen y el input VES (ajustado para compensar la eliminación de la etiqueta BCV)
-        ves_usd_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(40))) # Aumentado el espaciado
-
         font_name_label = FONT_REGULAR if FONT_REGULAR else 'Roboto' # Se mantiene para otros Labels
 
 
+        # Contenedor para el monto VES y la fecha opcional de la factura
+        input_container = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(50))
+
         # Input para la cantidad en VES
         self.ves_input = TextInput(hint_text='Valor VES a convertir', font_size=dp(18),
                                    foreground_color=(1, 1, 1, 1),
                                    hint_text_color=(0.7, 0.7, 0.7, 1),
                                    background_color=(0.1, 0.1, 0.1, 1),
                                    padding=[dp(20), dp(12), dp(20), dp(12)],
-                                   size_hint_y=None, height=dp(50),
+                                   size_hint_x=0.62,
                                    multiline=False, input_type='number',
                                    cursor_color=(1,1,1,1),
                                    font_name=FONT_BOLD if FONT_BOLD else 'Roboto')
-        ves_usd_layout.add_widget(self.ves_input)
+        input_container.add_widget(self.ves_input)
 
-        # Espaciador entre input y botón
-        ves_usd_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(10)))
+        # Input para la fecha (opcional): convierte con la tasa vigente en esa fecha
+        self.date_input = make_date_input()
+        input_container.add_widget(self.date_input)
+        # 40dp entre la imagen y el input VES (compensa la eliminación de la etiqueta BCV)
+        ves_usd_layout.add_widget(input_container, gap=dp(40))
 
         # Botón Convertir VES a USD
         convert_ves_button = RoundedShadowButton(text='Convertir a USD', font_size=dp(20),
@@ -564,18 +1079,12 @@ class VesToUsdScreen(Screen):
                                 shadow_color=[1, 1, 1, 1],
                                 shadow_spread=dp(2)
                                 )
-        ves_usd_layout.add_widget(convert_ves_button)
-
-        # Nuevo espaciador antes de "Total en USD"
-        ves_usd_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(10)))
+        ves_usd_layout.add_widget(convert_ves_button, gap=dp(10)) # 10dp entre el input y el botón
 
         self.usd_result_label = Label(text="Total en USD: 0.00", font_size=dp(18), color=(1,1,1,1),
                                               halign='center', size_hint_y=None, height=dp(30),
                                               font_name=font_name_label)
-        ves_usd_layout.add_widget(self.usd_result_label)
-
-        # CAMBIO REALIZADO: Espaciador entre el resultado y el mensaje de error
-        ves_usd_layout.add_widget(BoxLayout(size_hint_y=None, height=dp(10)))
+        ves_usd_layout.add_widget(self.usd_result_label, gap=dp(10))
 
         # Etiqueta para mostrar mensajes de error/información
         self.message_label = Label(
@@ -584,7 +1093,14 @@ class VesToUsdScreen(Screen):
             color=(1, 0.2, 0.2, 1), # Rojo para errores
             size_hint_y=None, height=dp(30)
         )
-        ves_usd_layout.add_widget(self.message_label)
+        ves_usd_layout.add_widget(self.message_label, gap=dp(10)) # 10dp entre el resultado y el mensaje de error
+
+        # Conversión en vivo (opcional): el total y los mensajes se actualizan mientras se escribe
+        self.live_conversion = make_live_conversion(self.app, self.compute_live_result,
+                                                    [self.usd_result_label, self.message_label])
+        if self.live_conversion is not None:
+            self.live_conversion.watch(self.ves_input, 'text').watch(self.date_input, 'text')
+            self.live_conversion.watch(self.app, 'bcv_rate')
 
         # Botón Volver
         back_button = RoundedShadowButton(text='Volver', font_size=dp(20),
@@ -608,16 +1124,27 @@ class VesToUsdScreen(Screen):
         """Convierte VES a USD."""
         self.message_label.text = ""
         try:
-            ves_amount = float(self.ves_input.text)
+            ves_amount = parse_decimal(self.ves_input.text)
             if ves_amount < 0:
                 self.message_label.text = "Por favor, ingrese un valor positivo para VES."
                 return
-            if self.app.bcv_rate <= 0:
-                self.message_label.text = "Tasa BCV no disponible. Intente de nuevo más tarde."
+            date_text = self.date_input.text.strip()
+            if date_text and parse_date(date_text) is None:
+                self.message_label.text = "Fecha inválida. Use DD/MM/AAAA."
+                return
+            rate = self.app.rate_for_date(date_text)
+            if rate <= 0:
+                if date_text:
+                    self.message_label.text = "No hay tasa BCV registrada para esa fecha."
+                else:
+                    self.message_label.text = "Tasa BCV no disponible. Intente de nuevo más tarde."
                 return
-            usd_total = ves_amount / self.app.bcv_rate
+            usd_total = convert_money(ves_amount, rate, VES_TO_USD)
             self.usd_result_label.text = f"Total en USD: {usd_total:,.2f}"
-            self.ves_input.text = ""
+            if self.live_conversion is None:
+                self.ves_input.text = ""
+            else:
+                self.live_conversion.reset() # En vivo se conserva el monto para seguir editándolo
         except ValueError:
             self.message_label.text = "Entrada VES inválida. Ingrese un número."
         except Exception as e:
@@ -634,9 +1161,74 @@ class ConverterApp(App):
     Gestiona las pantallas y la tasa de cambio global.
     """
     bcv_rate = NumericProperty(0)
-    usd_amount = NumericProperty(0) # Necesario para la ResultScreen original
+    usd_amount = ObjectProperty(Decimal(0)) # Monto exacto (Decimal, tal como se escribió) que muestra la ResultScreen
     current_conversion_rate = NumericProperty(0) # Necesario para la ResultScreen original
-    motivational_quote_text = StringProperty("Cargando frase motivacional...")
+    conversion_date = StringProperty("") # Fecha de la factura a convertir (vacío = tasa actual)
+    currency = StringProperty(USD) # Moneda extranjera elegida en los selectores (usd_amount está en esta moneda)
+    rate_matrix = ObjectProperty(None) # RateMatrix con las tasas de hoy de todas las monedas publicadas
+    motivational_quote_text = StringProperty("Cargando frase motivacional...") # Frase que muestra la MainScreen
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.startup_times = dict(_STARTUP_PHASES) # Fases del arranque en ms desde el inicio del proceso
+        self._refresh_event = None # Próximo refresco periódico de la tasa (ver schedule_rate_refresh)
+        self._last_rate_refresh = float('-inf') # time.monotonic() de la última descarga de la tasa
+        self._minimized = False
+        self._board_version = 0 # Versión de la tasa compartida aplicada por última vez (ver poll_rate_board)
+        self.rates_fetched_at = 0.0 # time.time() de la descarga de las tasas mostradas
+        self._restored_inputs = {} # Textos de la instantánea para las pantallas aún no construidas
+        self.ui_updates = UiUpdateQueue() # Resultados y cambios de estado hacia el hilo principal, una vez por frame
+        self.rate_matrix = RateMatrix()
+
+    def build_config(self, config):
+        """
+        Valores por defecto de la configuración (converter.ini en la carpeta de datos del usuario).
+        cache_ttl: segundos durante los cuales la tasa guardada se considera fresca y no se vuelve a pedir.
+        max_stale_age: segundos durante los cuales se sigue mostrando la última tasa si falla la red.
+        refresh_interval: segundos entre refrescos de la tasa mientras la app está abierta (0 = sin refresco).
+        minimized_backoff: factor por el que se multiplica ese intervalo con la ventana minimizada.
+        board_poll_interval: segundos entre comprobaciones de la tasa publicada por otra instancia abierta
+        (0 = no se comparte: cada instancia descarga su tasa).
+        """
+        config.setdefaults('rates', {
+            'cache_ttl': DEFAULT_CACHE_TTL,
+            'max_stale_age': DEFAULT_MAX_STALE_AGE,
+            'refresh_interval': 900,
+            'minimized_backoff': 4,
+            'board_poll_interval': DEFAULT_POLL_INTERVAL,
+        })
+        # Timeouts en segundos y número de reintentos de cada petición de red
+        config.setdefaults('network', {
+            'connect_timeout': 5,
+            'read_timeout': 10,
+            'retries': 2,
+            # Segundos durante los que se reutiliza la última respuesta de un endpoint
+            'memo_ttl': 30,
+            # Segundos de espera a la fuente de la tasa preferida antes de consultar también la siguiente
+            'hedge_delay': 1.0,
+            # Fallos seguidos que abren el circuito de un endpoint, y segundos que queda abierto
+            # (se duplican en cada reapertura, hasta breaker_max_backoff)
+            'breaker_failures': 3,
+            'breaker_backoff': 30,
+            'breaker_max_backoff': 3600,
+        })
+        # Conversión mientras se escribe (1 = activada) y segundos sin teclas antes de recalcular
+        config.setdefaults('ui', {
+            'live_conversion': 0,
+            'live_debounce': 0.15,
+        })
+        # Reserva local de frases motivacionales: frases pedidas por lote, frases sin mostrar
+        # por debajo de las cuales se pide otro lote, segundos mínimos entre lotes y frases que se conservan
+        config.setdefaults('quotes', {
+            'batch_size': 5,
+            'low_water': 10,
+            'refill_interval': 6 * 60 * 60,
+            'capacity': 200,
+        })
+
+    def get_application_config(self):
+        """Guarda converter.ini junto a los demás datos del usuario (también en el .exe de PyInstaller)."""
+        return super().get_application_config(os.path.join(self.user_data_dir, '%(appname)s.ini'))
 
     def build(self):
         """
@@ -646,39 +1238,93 @@ class ConverterApp(App):
         self.title = "Convertidor de Moneda"
 
         # Configuración del icono de la aplicación
-        self.icon = resource_find('icono_moneda.png')
-
-        self.sm = ScreenManager()
-        # Añadir LoadingScreen primero
-        self.loading_screen = LoadingScreen(name='loading')
-        self.sm.add_widget(self.loading_screen)
-
-        self.main_screen = MainScreen(name='main')
-        self.result_screen = ResultScreen(name='result')
-        self.ves_to_usd_screen = VesToUsdScreen(name='ves_to_usd') # Nueva pantalla
-
-        self.sm.add_widget(self.main_screen)
-        self.sm.add_widget(self.result_screen)
-        self.sm.add_widget(self.ves_to_usd_screen) # Añadir la nueva pantalla
-
-        # Establecer la pantalla de carga como la inicial
-        self.sm.current = 'loading'
-
-        # Vincular la propiedad bcv_rate a la etiqueta de BCV en la pantalla de resultados
-        self.bind(bcv_rate=lambda instance, value: setattr(self.result_screen, 'bcv_rate_text', f"Tasa BCV hoy: {value:.2f} Bs" if value > 0 else "Tasa BCV hoy: No disponible"))
-        # ELIMINADO: Nueva vinculación para la pantalla VES a USD ya no es necesaria aquí.
-
-
+        self.icon = assets.find(COIN_IMAGE)
+
+        # Circuitos por endpoint compartidos por todas las descargas; su estado sobrevive a los reinicios
+        self.breakers = CircuitBreakers(os.path.join(self.user_data_dir, CIRCUIT_STATE_FILENAME),
+                                        failure_threshold=self.config.getint('network', 'breaker_failures'),
+                                        base_backoff=self.config.getfloat('network', 'breaker_backoff'),
+                                        max_backoff=self.config.getfloat('network', 'breaker_max_backoff')).load()
+        # Cliente HTTP único para todas las descargas: reutiliza conexiones entre peticiones
+        self.http = HttpClient(connect_timeout=self.config.getfloat('network', 'connect_timeout'),
+                               read_timeout=self.config.getfloat('network', 'read_timeout'),
+                               retries=self.config.getint('network', 'retries'),
+                               breakers=self.breakers)
+        # Un solo bucle de eventos en segundo plano para todas las descargas (sin un hilo por petición)
+        self.fetch_loop = FetchLoop(deliver=self._deliver_to_main_thread).start()
+        # Las peticiones simultáneas al mismo endpoint comparten una sola descarga
+        self.single_flight = SingleFlight()
+        # Fuentes de la tasa BCV: se prefiere la más rápida y sana, con una segunda en paralelo si tarda
+        self.rate_providers = ProviderPool(default_providers(),
+                                           hedge_delay=self.config.getfloat('network', 'hedge_delay'))
+
+        self.sm = LazyScreenManager()
+        # Las pantallas se registran como fábricas y se construyen al navegar a ellas
+        # (o en frames libres después de mostrar la primera, ver prebuild_screens)
+        self.sm.register('main', MainScreen)
+        self.sm.register('result', ResultScreen)
+        self.sm.register('ves_to_usd', VesToUsdScreen) # Nueva pantalla
+
+        # Cada pantalla se vincula a bcv_rate y motivational_quote_text al construirse.
         # Vincular la tasa de conversión actual para que el display en ResultScreen se actualice.
         self.bind(current_conversion_rate=self.update_result_screen_conversion_display)
 
-        # Nueva vinculación: Cuando la propiedad motivational_quote_text de la App cambie,
-        # actualiza la propiedad motivational_quote_text de la MainScreen.
-        self.bind(motivational_quote_text=self.main_screen.setter('motivational_quote_text'))
+        # Medir el tiempo hasta el primer frame y hasta que la pantalla principal es usable
+        Window.bind(on_flip=self._record_startup_frame)
+
+        # Cargar la última tasa guardada para que las pantallas de conversión la tengan desde el inicio.
+        # Aunque esté vencida se muestra mientras se refresca en segundo plano.
+        self.rate_cache = RateCache(os.path.join(self.user_data_dir, RATE_CACHE_FILENAME))
+        # Historial de tasas por fecha para las conversiones con fecha de factura
+        self.rate_history = RateHistory(os.path.join(self.user_data_dir, RATE_HISTORY_FILENAME)).load()
+        if self.rate_cache.load():
+            self._apply_cached_rates()
+            self.ui_updates.flush() # Las pantallas se construyen ya con las tasas guardadas
+            print(f"DEBUG: Loaded cached BCV rates {self.rate_matrix.prices} (age {self.rate_cache.age():.0f}s)")
+            # La fuente que dio la tasa guardada recuerda sus precios y su ETag/Last-Modified,
+            # así la primera petición ya es condicional
+            provider = self.rate_providers.get(self.rate_cache.entry['source'])
+            if provider is not None:
+                provider.last_prices = dict(self.rate_cache.entry['prices'])
+                if self.rate_cache.entry['validators']:
+                    self.http.set_validators(provider.url, provider.params, self.rate_cache.entry['validators'])
+            self._last_rate_refresh = time.monotonic() - self.rate_cache.age()
+
+        # Tasa compartida con las demás instancias abiertas: solo la que obtiene el lock del archivo
+        # la descarga; las otras leen la que publica (ver poll_rate_board)
+        self.rate_board = RateBoard(os.path.join(self.user_data_dir, RATE_BOARD_FILENAME))
+        if self.config.getfloat('rates', 'board_poll_interval') > 0:
+            self.rate_board.open()
+            self._owns_rate_fetch()
+
+        # Frases motivacionales guardadas: la pantalla principal muestra una desde el primer frame,
+        # aunque no haya conexión; la reserva se rellena en segundo plano (ver prefetch_quotes)
+        self.quote_pool = QuotePool(os.path.join(self.user_data_dir, QUOTE_POOL_FILENAME),
+                                    capacity=self.config.getint('quotes', 'capacity'),
+                                    low_water=self.config.getint('quotes', 'low_water'),
+                                    refill_interval=self.config.getfloat('quotes', 'refill_interval')).load()
+        self.motivational_quote_text = self.quote_pool.next() or FALLBACK_QUOTE
+
+        # Estado del último cierre: si lo hay, la primera pantalla es la que se dejó abierta y se
+        # construye ya con sus datos; si no (primer arranque), se muestra la pantalla de carga vacía
+        # y la principal se construye en el siguiente frame
+        self.app_state = AppState(os.path.join(self.user_data_dir, APP_STATE_FILENAME)).load()
+        screen = self.restore_state()
+        if screen:
+            self.sm.current = screen
+            self.mark_startup('state_restored')
+        else:
+            self.loading_screen = LoadingScreen(name='loading')
+            self.sm.add_widget(self.loading_screen)
+            self.sm.current = 'loading'
+
+        # Refrescar la tasa periódicamente; con la ventana minimizada se refresca con menos frecuencia
+        Window.bind(on_minimize=self._on_window_minimize, on_restore=self._on_window_restore)
 
         # Programar la inicialización de datos y el cambio de pantalla después de que la UI se haya construido
         Clock.schedule_once(self.start_app_init_tasks, 0)
 
+        self.mark_startup('app_built')
         return self.sm
 
     def start_app_init_tasks(self, dt):
@@ -686,14 +1332,147 @@ class ConverterApp(App):
         Inicia las tareas de fetching de datos en segundo plano
         y luego cambia a la pantalla principal.
         """
-        # Iniciar las operaciones de fetching que ya están en hilos separados
-        self.fetch_rates(0) # El '0' es un placeholder, no afecta el comportamiento de threading
-        self.fetch_motivational_quote(0) # Idem
-
-        # Cambiar a la pantalla principal inmediatamente.
+        # Iniciar las descargas; corren en paralelo en el bucle de descargas.
+        # La tasa solo se pide si la guardada en caché es más antigua que el TTL configurado.
+        if not self.rate_cache.is_fresh(self.config.getfloat('rates', 'cache_ttl')):
+            self.fetch_rates(0) # El '0' ocupa el lugar del dt de Clock
+        self.schedule_rate_refresh()
+        if self.rate_board.enabled:
+            self.poll_rate_board(0) # Sin esperar al primer intervalo, por si otra instancia ya tiene una tasa más nueva
+            Clock.schedule_interval(self.poll_rate_board, self.config.getfloat('rates', 'board_poll_interval'))
+        if self.quote_pool.needs_refill():
+            self.prefetch_quotes(0) # Idem
+
+        # Primer arranque: cambiar a la pantalla principal inmediatamente.
         # Los datos se actualizarán asincrónicamente cuando estén listos.
-        self.sm.current = 'main'
+        if self.sm.current == 'loading':
+            self.sm.current = 'main'
+            self.mark_startup('main_screen_built')
 
+    def restore_state(self):
+        """
+        Aplica la instantánea del último cierre (ver AppState) antes del primer frame: las tasas
+        (solo si el caché no tenía unas utilizables), la frase (si la reserva está vacía), la moneda,
+        el monto y la fecha de la conversión y lo escrito en cada pantalla.
+        Devuelve la pantalla que estaba abierta, o '' si no hay instantánea.
+        """
+        snapshot = self.app_state.snapshot
+        if not snapshot:
+            return ''
+        if self.bcv_rate <= 0:
+            prices = self.app_state.usable_prices(self.config.getfloat('rates', 'max_stale_age'))
+            if prices:
+                self._show_rates(prices, snapshot['fetched_at'])
+                print(f"DEBUG: Restored BCV rates from app state: {prices}")
+        if self.motivational_quote_text == FALLBACK_QUOTE and snapshot['quote']:
+            self.motivational_quote_text = snapshot['quote']
+        self.ui_updates.flush() # La moneda guardada solo vale si las tasas la incluyen
+        if snapshot['currency'] in self.rate_matrix:
+            self.currency = snapshot['currency']
+        self.conversion_date = snapshot['conversion_date']
+        self.usd_amount = parse_decimal(snapshot['usd_amount'])
+        self._restored_inputs = dict(snapshot['inputs'])
+        return snapshot['screen'] or 'main'
+
+    def take_restored_inputs(self, screen_name):
+        """Textos guardados de la pantalla ({'amount': ..., 'date': ...}); se entregan una sola vez."""
+        return self._restored_inputs.pop(screen_name, {})
+
+    def save_state(self):
+        """Guarda la instantánea del estado para el próximo arranque (no escribe si nada cambió)."""
+        inputs = dict(self._restored_inputs) # Las pantallas sin construir conservan lo restaurado
+        for name in ('main', 'ves_to_usd'):
+            if self.sm.is_built(name):
+                inputs[name] = self.sm.get_screen(name).snapshot_inputs()
+        if self.app_state.save(prices=self.rate_matrix.prices, fetched_at=self.rates_fetched_at,
+                               quote=self.motivational_quote_text, currency=self.currency,
+                               conversion_date=self.conversion_date, usd_amount=str(self.usd_amount),
+                               inputs=inputs,
+                               screen=self.sm.current if self.sm.current in RESTORABLE_SCREENS else 'main'):
+            print(f"DEBUG: Saved app state ({self.app_state.path})")
+
+    def mark_startup(self, phase):
+        """Registra el instante (ms desde el inicio del proceso) en que termina una fase del arranque."""
+        if phase not in self.startup_times:
+            self.startup_times[phase] = (time.perf_counter() - _PROCESS_START) * 1000
+
+    def _record_startup_frame(self, window):
+        """
+        Se llama tras cada frame dibujado durante el arranque.
+        first_frame: primer frame en pantalla; interactive: primer frame con la pantalla inicial
+        (la principal o la restaurada) activa y su transición terminada; useful_screen: además
+        muestra una tasa (ver _record_useful_screen). Después se construyen las demás pantallas en frames libres.
+        """
+        self.mark_startup('first_frame')
+        if self.sm.current != 'loading' and not self.sm.transition.is_active:
+            self.mark_startup('interactive')
+            Window.unbind(on_flip=self._record_startup_frame)
+            self.bind(bcv_rate=self._record_useful_screen)
+            self._record_useful_screen()
+            print(f"DEBUG: Startup times (ms): {self.startup_times}")
+            if PROFILE_STARTUP:
+                self.print_startup_profile()
+                Clock.schedule_once(lambda dt: self.stop(), 0)
+                return
+            Clock.schedule_once(self.prebuild_screens, 0)
+
+    def _record_useful_screen(self, *args):
+        """
+        Marca useful_screen cuando la pantalla inicial ya es interactiva y tiene una tasa que mostrar:
+        en el mismo frame si vino del caché o de la instantánea, o cuando llega la primera descarga.
+        """
+        if self.bcv_rate <= 0:
+            return
+        self.unbind(bcv_rate=self._record_useful_screen)
+        self.mark_startup('useful_screen')
+        print(f"DEBUG: Time to useful screen: {self.startup_times['useful_screen']:.0f} ms")
+
+    def print_startup_profile(self):
+        """Imprime el informe de --profile-startup: imports más costosos y fases del arranque."""
+        from startup_profile import format_report
+        _import_profiler.uninstall()
+        print(format_report(_import_profiler, self.startup_times))
+
+    def prebuild_screens(self, dt):
+        """
+        Construye una pantalla pendiente por frame, para que la primera navegación no espere.
+        Se reprograma hasta que no quedan pantallas por construir; al final precalienta las fuentes.
+        """
+        if self.sm.build_next_pending():
+            Clock.schedule_once(self.prebuild_screens, 0)
+        else:
+            assets.warm_fonts(UI_FONT_SIZES)
+            print(f"DEBUG: Asset memory: {assets.memory_report()}")
+
+    def on_stop(self):
+        """Cancela las descargas pendientes y cierra las conexiones HTTP al salir de la app."""
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+        self.fetch_loop.stop()
+        print(f"DEBUG: HTTP stats: {self.http.stats()}")
+        print(f"DEBUG: Single-flight stats: {self.single_flight.stats()}")
+        print(f"DEBUG: Rate source stats: {self.rate_providers.stats()}")
+        print(f"DEBUG: Circuit breakers: {self.breakers.stats()}")
+        print(f"DEBUG: Asset memory: {assets.memory_report()}")
+        print(f"DEBUG: Quote pool: {self.quote_pool.stats()}")
+        print(f"DEBUG: UI update queue: {self.ui_updates.counters}")
+        self.save_state() # Para abrir la próxima vez en la misma pantalla, ya con sus datos
+        self.quote_pool.save() # Guarda la posición para no repetir frases en el próximo arranque
+        self.rate_board.close() # Libera el lock: otra instancia pasará a descargar la tasa
+        self.http.close()
+
+
+    def rate_for_date(self, date_text, currency=USD):
+        """
+        Tasa (bolívares por unidad de `currency`) a usar para una conversión: la actual si no hay fecha,
+        o la vigente en esa fecha según el historial (0 si no hay registro).
+        El historial solo guarda el dólar, así que con fecha las demás monedas no tienen tasa.
+        """
+        if not date_text:
+            return self.bcv_rate if currency == USD else self.rate_matrix.rate(currency, VES)
+        if currency != USD:
+            return 0
+        return self.rate_history.rate_on(date_text)
 
     def set_conversion_rate(self, rate):
         """
@@ -707,117 +1486,282 @@ class ConverterApp(App):
         cuando current_conversion_rate cambia.
         """
         if self.sm.current == 'result':
-            self.result_screen.update_bcv_display()
+            self.ui_updates.request(self.sm.get_screen('result').update_bcv_display)
 
-    def fetch_rates(self, dt):
+    def _deliver_to_main_thread(self, callback, result, error):
         """
-        Inicia la operación de fetching de tasas en un hilo separado
-        para evitar que la UI se congele.
+        Único punto por el que los resultados del bucle de descargas vuelven al hilo de Kivy.
+        Se llama desde el hilo del bucle; los resultados se encolan en ui_updates y se procesan
+        juntos en el siguiente frame, sin crear una función ni un evento del Clock por resultado.
         """
-        threading.Thread(target=self._fetch_rates_thread).start()
+        self.ui_updates.call(callback, result, error)
 
-    def _fetch_rates_thread(self):
+    def _shared_fetch(self, endpoint, coro_factory):
         """
-        Función para obtener la tasa de cambio del BCV de la API en un hilo separado.
-        Actualiza la propiedad bcv_rate de la aplicación que luego actualiza la UI.
+        Corrutina que ejecuta coro_factory a través del single-flight del endpoint:
+        si ya hay una descarga en curso (o una respuesta de hace menos de memo_ttl segundos)
+        se reutiliza en lugar de volver a llamar a la API.
         """
-        base_url = 'https://pydolarve.org/api/v2/dollar'
-
-        # Solo necesitamos el monitor 'bcv'
-        monitor_name = 'bcv'
-        rate_property = 'bcv_rate'
-
-        try:
-            print(f"DEBUG: Attempting to fetch rate for {monitor_name} from: {base_url}?monitor={monitor_name}")
-            response = requests.get(f"{base_url}?monitor={monitor_name}")
-            response.raise_for_status()
-            data = response.json()
-
-            print(f"DEBUG: Raw API response for BCV: {data}")
+        return self.single_flight.run(endpoint, coro_factory, ttl=self.config.getfloat('network', 'memo_ttl'))
 
-            if 'price' in data and data['price'] is not None:
-                raw_price_str = str(data['price']) # Convertir a cadena para manipularla
-                print(f"DEBUG: BCV raw price string: '{raw_price_str}'")
-
-                # Intentar limpiar la cadena de precio
-                # Primero, reemplazar comas por puntos (si la API usa comas como decimales)
-                cleaned_price_str = raw_price_str.replace(',', '.')
+    def schedule_rate_refresh(self):
+        """
+        Programa el próximo refresco de la tasa a refresh_interval segundos de la última descarga
+        (multiplicado por minimized_backoff si la ventana está minimizada). Si ya pasó ese tiempo,
+        el refresco se hace en el siguiente frame.
+        """
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+        interval = self.config.getfloat('rates', 'refresh_interval')
+        if interval <= 0:
+            return
+        if self._minimized:
+            interval *= max(1.0, self.config.getfloat('rates', 'minimized_backoff'))
+        elapsed = time.monotonic() - self._last_rate_refresh
+        self._refresh_event = Clock.schedule_once(self._refresh_rates, max(0.0, interval - elapsed))
+
+    def _refresh_rates(self, dt):
+        """Refresco periódico: pide la tasa (GET condicional) y programa el siguiente."""
+        self._refresh_event = None
+        self.fetch_rates(0)
+        self.schedule_rate_refresh()
+
+    def _on_window_minimize(self, window):
+        self._minimized = True
+        self.schedule_rate_refresh()
+
+    def _on_window_restore(self, window):
+        self._minimized = False
+        self.schedule_rate_refresh() # Si el refresco quedó atrasado se hace de inmediato
+
+    def on_pause(self):
+        """Android/iOS: la app pasa a segundo plano; se trata igual que una ventana minimizada."""
+        self._on_window_minimize(Window)
+        self.save_state() # El sistema puede cerrar la app en segundo plano sin llamar a on_stop
+        self.quote_pool.save()
+        return True
+
+    def on_resume(self):
+        self._on_window_restore(Window)
 
-                # Si el formato es como "1.07.62", eliminar el primer punto
-                # Esto es una suposición basada en el debug, si el formato cambia, esto podría fallar.
-                if cleaned_price_str.count('.') > 1:
-                    parts = cleaned_price_str.split('.')
-                    if len(parts) > 1 and parts[-1].isdigit(): # Asegurarse de que el último es el decimal
-                        cleaned_price_str = "".join(parts[:-1]) + "." + parts[-1]
-                    else:
-                        # Si no es el formato esperado, intentar eliminar solo el primer punto
-                        cleaned_price_str = cleaned_price_str.replace('.', '', 1)
+    def fetch_rates(self, dt):
+        """
+        Programa la descarga de la tasa BCV en el bucle de descargas
+        para evitar que la UI se congele.
+        """
+        self._last_rate_refresh = time.monotonic()
+        if not self._owns_rate_fetch():
+            self.poll_rate_board(0) # Otra instancia descarga la tasa: se usa la que publicó
+            return
+        self.fetch_loop.submit(self._shared_fetch(BCV_API_URL, self._fetch_rates_task), self._on_rates_fetched)
 
+    def _owns_rate_fetch(self):
+        """
+        Indica si esta instancia descarga la tasa: siempre sin tasa compartida, y con ella solo si es
+        (o acaba de pasar a ser, porque la anterior se cerró) la instancia que la publica.
+        """
+        if not self.rate_board.enabled:
+            return True
+        if not self.rate_board.is_writer and self.rate_board.acquire_writer():
+            # Comparte de inmediato la tasa guardada si es más nueva que la publicada
+            entry = self.rate_cache.entry
+            record = self.rate_board.read()
+            if entry is not None and (record is None or record.fetched_at < entry['fetched_at']):
+                self.rate_board.publish(entry['prices'], entry['fetched_at'], entry['source'])
+        return self.rate_board.is_writer
+
+    def poll_rate_board(self, dt):
+        """
+        En las instancias que no descargan la tasa: lee el contador de versión de la tasa compartida
+        (una lectura de memoria, sin red ni JSON) y, si otra instancia publicó tasas nuevas, las muestra.
+        """
+        if self.rate_board.is_writer:
+            return
+        version = self.rate_board.version()
+        if version == self._board_version:
+            return
+        record = self.rate_board.read()
+        if record is None:
+            return
+        self._board_version = record.version
+        if time.time() - record.fetched_at > self.config.getfloat('rates', 'max_stale_age'):
+            return
+        print(f"DEBUG: Rates published by instance {record.writer_pid} (version {record.version}): {record.prices}")
+        self._show_rates(record.prices, record.fetched_at)
+
+    async def _fetch_rates_task(self):
+        """
+        Corrutina que obtiene la tasa de cambio del BCV de la fuente más rápida disponible
+        (ver ProviderPool.fetch_hedged). Si la tasa es válida la guarda en el caché y en el historial (fuera del hilo principal).
+        Las peticiones son condicionales; si la tasa no cambió devuelve None y solo se renueva
+        la hora del caché.
+        """
+        prices, provider = await self.rate_providers.fetch_hedged(self.fetch_loop.run_blocking, self.http,
+                                                                  conditional=True)
+        if provider is None:
+            return prices
+        entry = self.rate_cache.entry
+        if entry is not None and entry['prices'] == prices:
+            await self.fetch_loop.run_blocking(self._touch_cached_rate, provider)
+            return None
+        await self.fetch_loop.run_blocking(self._store_fetched_rate, prices, provider)
+        return prices
+
+    def _store_fetched_rate(self, prices, provider):
+        """Persiste las tasas recién descargadas en el caché y la del dólar en el historial por fecha."""
+        self.rate_cache.store(prices[USD], source=provider.name,
+                              validators=self.http.get_validators(provider.url, provider.params),
+                              prices=prices)
+        self.rate_history.append(datetime.date.today(), prices[USD])
+        self._publish_rates(prices, self.rate_cache.entry['fetched_at'], provider.name)
+
+    def _touch_cached_rate(self, provider):
+        """Las tasas no cambiaron: renueva la hora (y la fuente) del caché para que siga contando como fresco."""
+        self.rate_cache.store(self.rate_cache.entry['price'], source=provider.name,
+                              validators=self.http.get_validators(provider.url, provider.params),
+                              prices=self.rate_cache.entry['prices'])
+        self._publish_rates(self.rate_cache.entry['prices'], self.rate_cache.entry['fetched_at'], provider.name)
+
+    def _publish_rates(self, prices, fetched_at, source):
+        """
+        Publica las tasas en la tasa compartida desde el hilo principal. Los métodos anteriores corren
+        en el pool de descargas, y on_stop cierra rate_board en el hilo principal sin esperar a ese pool:
+        lo que quede en ui_updates al cerrar ya no se ejecuta.
+        """
+        self.ui_updates.call(self.rate_board.publish, prices, fetched_at, source)
 
-                price = float(cleaned_price_str) if cleaned_price_str.replace('.', '', 1).isdigit() else 0.0
-                print(f"DEBUG: Cleaned price string: '{cleaned_price_str}', Converted price: {price}")
+    def _apply_cached_rates(self):
+        """
+        Muestra las tasas guardadas mientras no superen la antigüedad máxima configurada;
+        si no hay tasas utilizables se muestra "No disponible".
+        Solo se reasignan las propiedades que cambian, para no rehacer la UI sin motivo.
+        """
+        self._show_rates(self.rate_cache.usable_prices(self.config.getfloat('rates', 'max_stale_age')),
+                         self.rate_cache.entry['fetched_at'] if self.rate_cache.entry else 0.0)
 
+    def _show_rates(self, prices, fetched_at=None):
+        """
+        Asigna rate_matrix y bcv_rate a partir de {moneda: bolívares por unidad}, solo si cambian.
+        fetched_at: time.time() de la descarga de esas tasas (por defecto, ahora).
+        """
+        if prices:
+            self.rates_fetched_at = time.time() if fetched_at is None else fetched_at
+        matrix = RateMatrix(prices)
+        if matrix.prices != self.rate_matrix.prices:
+            self._set_rate_matrix(matrix)
+        self.ui_updates.post(self, 'bcv_rate', prices.get(USD, 0))
+
+    def _set_rate_matrix(self, matrix):
+        """Publica las tasas nuevas; si la moneda elegida dejó de tener tasa se vuelve al dólar."""
+        self.ui_updates.post(self, 'rate_matrix', matrix)
+        if self.currency not in matrix:
+            self.ui_updates.post(self, 'currency', USD)
+
+    def _on_rates_fetched(self, prices, error):
+        """
+        Se ejecuta en el hilo principal con el resultado de _fetch_rates_task.
+        Actualiza las propiedades rate_matrix y bcv_rate de la aplicación que luego actualizan la UI.
+        """
+        monitor_name = BCV_MONITOR
+        if error is None and prices is None:
+            # Sin cambios: no se vuelven a asignar las tasas (ni se redibuja), salvo que las
+            # mostradas no sean las guardadas (p. ej. estaban vencidas al arrancar)
+            if self.rate_cache.entry:
+                self._apply_cached_rates()
+            print("DEBUG: BCV rates unchanged")
+            return
+        if error is None and prices.get(USD, 0) > 0:
+            self._show_rates(prices)
+            print(f"DEBUG: BCV rates successfully set to {prices}")
+            return
+
+        if error is None:
+            print(f"Warning: Invalid or zero BCV rate: {prices}. Keeping cached rate if any.")
+        elif isinstance(error, CircuitOpenError):
+            print(f"Warning: Skipped rate fetch for {monitor_name}: {error}")
+        elif is_request_error(error):
+            print(f"Error: Network or API error when fetching rate for {monitor_name}: {error}")
+        elif isinstance(error, json.JSONDecodeError):
+            print(f"Error: JSON decoding error for {monitor_name}: {error}. Unexpected API response.")
+        else:
+            print(f"Error: An unexpected error occurred for {monitor_name}: {error}")
+        self._apply_rate_fetch_failure(0)
 
-                if price > 0:
-                    Clock.schedule_once(lambda dt, prop=rate_property, p=price: setattr(self, prop, p), 0)
-                    print(f"DEBUG: BCV rate successfully set to {price}")
-                else:
-                    print(f"Warning: Invalid or zero BCV rate after cleaning: {price}. Showing Not Available.")
-                    Clock.schedule_once(lambda dt, prop=rate_property: setattr(self, prop, 0), 0)
-            else:
-                print(f"The response from {monitor_name} does not contain a valid 'price' or is None: {data}")
-                Clock.schedule_once(lambda dt, prop=rate_property: setattr(self, prop, 0), 0)
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error: Network or API error when fetching rate for {monitor_name}: {e}")
-            Clock.schedule_once(lambda dt, prop=rate_property: setattr(self, prop, 0), 0)
-        except json.JSONDecodeError as e:
-            print(f"Error: JSON decoding error for {monitor_name}: {e}. Unexpected API response.")
-            Clock.schedule_once(lambda dt: setattr(self, prop, 0), 0)
-        except Exception as e:
-            print(f"Error: An unexpected error occurred for {monitor_name}: {e}")
-            Clock.schedule_once(lambda dt: setattr(self, prop, 0), 0)
+    def _apply_rate_fetch_failure(self, dt):
+        """
+        Se ejecuta en el hilo principal cuando falla la obtención de la tasa.
+        Mantiene las últimas tasas guardadas mientras no superen la antigüedad máxima configurada
+        (ver _apply_cached_rates).
+        """
+        self._apply_cached_rates()
 
 
-    def fetch_motivational_quote(self, dt):
+    def next_motivational_quote(self):
         """
-        Función para obtener una frase motivacional de la API externa en un hilo separado.
-        Actualiza la propiedad motivational_quote_text de la aplicación.
+        Muestra la siguiente frase de la reserva local (sin red) y, si quedan pocas sin mostrar,
+        pide un lote nuevo en segundo plano.
         """
-        threading.Thread(target=self._fetch_motivational_quote_thread).start()
+        quote = self.quote_pool.next()
+        if quote:
+            self.motivational_quote_text = quote
+        if self.quote_pool.needs_refill():
+            self.prefetch_quotes(0)
 
-    def _fetch_motivational_quote_thread(self):
+    def prefetch_quotes(self, dt):
         """
-        Realiza la llamada a la API de frases motivacionales.
-        Utiliza una API de frases del día en español.
+        Programa la descarga de un lote de frases motivacionales en el bucle de descargas.
+        Las frases van a la reserva local; no cambian la frase que se está mostrando.
         """
-        api_url = "https://frasedeldia.azurewebsites.net/api/phrase"
-        fallback_quote = "Si hoy no fue un buen día, eso está bien porque entonces mañana tal vez lo será."
+        self.fetch_loop.submit(self._shared_fetch(QUOTE_API_URL, self._prefetch_quotes_task),
+                               self._on_quotes_prefetched)
 
-        try:
-            print(f"DEBUG: Attempting to get motivational quote from: {api_url}")
-            response = requests.get(api_url)
-            response.raise_for_status()
-            data = response.json()
+    async def _prefetch_quotes_task(self):
+        """
+        Pide hasta batch_size frases a la API de frases del día en español y las añade a la reserva
+        (sin repetidas), guardándola en disco. La API suele repetir la frase del día, así que el lote
+        se corta tras dos repetidas seguidas. Devuelve cuántas frases nuevas se añadieron.
+        """
+        added = repeated = 0
+        for _ in range(self.config.getint('quotes', 'batch_size')):
+            try:
+                print(f"DEBUG: Attempting to get motivational quote from: {QUOTE_API_URL}")
+                data = await self.fetch_loop.run_blocking(self.http.get_json, QUOTE_API_URL)
+            except Exception as e:
+                if not added:
+                    raise
+                print(f"Warning: Stopping quote prefetch after {added} new quotes: {e}")
+                break
             print(f"DEBUG: Raw API response for quotes: {data}")
-
-            if 'phrase' in data and data['phrase'].strip():
-                quote = data['phrase'].strip()
-                print(f"DEBUG: Quote obtained: '{quote}'")
-                Clock.schedule_once(lambda dt, q=quote: setattr(self, 'motivational_quote_text', q), 0)
-            else:
+            quote = data.get('phrase', '') if isinstance(data, dict) else ''
+            if not isinstance(quote, str) or not quote.strip():
                 print(f"Warning: Motivational quotes API returned empty or unexpected phrase: {data}")
-                Clock.schedule_once(lambda dt: setattr(self, 'motivational_quote_text', fallback_quote), 0)
-
-        except requests.exceptions.RequestException as e:
-            print(f"ERROR: Network or API error when fetching motivational quote: {e}")
-            Clock.schedule_once(lambda dt: setattr(self, 'motivational_quote_text', fallback_quote), 0)
-        except json.JSONDecodeError as e:
-            print(f"ERROR: JSON decoding error for motivational quote: {e}. Unexpected API response.")
-            Clock.schedule_once(lambda dt: setattr(self, 'motivational_quote_text', fallback_quote), 0)
-        except Exception as e:
-            print(f"ERROR: An unexpected error occurred when fetching motivational quote: {e}")
-            Clock.schedule_once(lambda dt: setattr(self, 'motivational_quote_text', fallback_quote), 0)
+                break
+            if self.quote_pool.add([quote]):
+                added, repeated = added + 1, 0
+            else:
+                repeated += 1
+                if repeated >= 2:
+                    break
+        await self.fetch_loop.run_blocking(self.quote_pool.save)
+        return added
+
+    def _on_quotes_prefetched(self, added, error):
+        """Se ejecuta en el hilo principal: si se estaba mostrando la frase de respaldo, pasa a una de la reserva."""
+        if error is None:
+            print(f"DEBUG: Prefetched {added} new quotes; pool: {self.quote_pool.stats()}")
+            if self.motivational_quote_text == FALLBACK_QUOTE and len(self.quote_pool):
+                self.motivational_quote_text = self.quote_pool.next()
+            return
+
+        if isinstance(error, CircuitOpenError):
+            print(f"Warning: Skipped motivational quote fetch: {error}")
+        elif is_request_error(error):
+            print(f"ERROR: Network or API error when fetching motivational quote: {error}")
+        elif isinstance(error, json.JSONDecodeError):
+            print(f"ERROR: JSON decoding error for motivational quote: {error}. Unexpected API response.")
+        else:
+            print(f"ERROR: An unexpected error occurred when fetching motivational quote: {error}")
 
 if __name__ == '__main__':
     ConverterApp().run()
\ No newline at end of file
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+# Aritmética exacta de dinero en céntimos enteros, sin dependencias de Kivy.
+# Los montos se guardan como enteros de céntimos y las tasas como fracciones de enteros, así que
+# convertir, sumar y redondear no arrastra los errores de la coma flotante binaria (0.1 + 0.2).
+# conversion.py lo usa para todas las conversiones: pantallas, conversión masiva y modo servicio.
+import math
+from decimal import Decimal
+from decimal import ROUND_DOWN as _DECIMAL_DOWN
+from decimal import ROUND_HALF_EVEN as _DECIMAL_HALF_EVEN
+from decimal import ROUND_HALF_UP as _DECIMAL_HALF_UP
+from decimal import ROUND_UP as _DECIMAL_UP
+from functools import lru_cache, total_ordering
+
+from parsing import parse_decimal
+
+# NumPy es opcional y acelera las operaciones por lotes. Se importa con el primer lote
+# (ver load_numpy) porque la app, que convierte montos sueltos, no lo necesita al arrancar.
+np = None
+_numpy_checked = False
+
+# Los montos se expresan en céntimos (2 decimales)
+DECIMALS = 2
+CENTS = 10 ** DECIMALS
+
+# Modos de redondeo. Todos trabajan sobre enteros y redondean el cociente exacto:
+ROUND_HALF_UP = 'half_up'     # comercial: la mitad se aleja de cero (1.005 -> 1.01, -1.005 -> -1.01)
+ROUND_HALF_EVEN = 'half_even' # bancario: la mitad va al par más cercano (1.005 -> 1.00, 1.015 -> 1.02)
+ROUND_DOWN = 'down'           # trunca hacia cero
+ROUND_UP = 'up'               # se aleja de cero si hay resto
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_DOWN, ROUND_UP)
+DEFAULT_ROUNDING = ROUND_HALF_UP
+_DECIMAL_ROUNDING = {ROUND_HALF_UP: _DECIMAL_HALF_UP, ROUND_HALF_EVEN: _DECIMAL_HALF_EVEN,
+                     ROUND_DOWN: _DECIMAL_DOWN, ROUND_UP: _DECIMAL_UP}
+
+# Hasta esta cantidad de céntimos, entre dos float64 consecutivos hay menos de un céntimo: si un
+# float está a menos de medio float de un monto con DECIMALS decimales, ese monto es su repr
+_MAX_FLOAT_CENTS = float(2 ** 50)
+_INT64_MAX = 2 ** 63 - 1
+
+
+def load_numpy():
+    """Importa NumPy la primera vez que se llama. Devuelve el módulo, o None si no está instalado."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+        _numpy_checked = True
+    return np
+
+
+def _check_rounding(rounding):
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Modo de redondeo desconocido: {rounding}")
+
+
+def div_round(numerator, denominator, rounding=DEFAULT_ROUNDING):
+    """Cociente entero exacto numerator / denominator redondeado con el modo indicado."""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder:
+        if rounding == ROUND_HALF_UP:
+            quotient += 2 * remainder >= denominator
+        elif rounding == ROUND_HALF_EVEN:
+            twice = 2 * remainder
+            quotient += twice > denominator or (twice == denominator and quotient & 1)
+        elif rounding == ROUND_UP:
+            quotient += 1
+        elif rounding != ROUND_DOWN:
+            raise ValueError(f"Modo de redondeo desconocido: {rounding}")
+    return -quotient if numerator < 0 else quotient
+
+
+@lru_cache(maxsize=1024)
+def _rate_from_value(value):
+    try:
+        num, den = parse_decimal(value).as_integer_ratio()
+    except (TypeError, ValueError, ArithmeticError):
+        raise ValueError(f"Tasa de conversión inválida: {value}") from None
+    return Rate(num, den)
+
+
+class Rate:
+    """
+    Tasa exacta como fracción de enteros positivos: num / den unidades de destino por unidad de origen.
+    Una tasa publicada como 36.5372 es exactamente 365372 / 10000; las tasas cruzadas entre dos
+    monedas (ver cross) siguen siendo fracciones exactas, sin redondear a un número de decimales.
+    """
+
+    __slots__ = ('num', 'den')
+
+    def __init__(self, num, den=1):
+        if num <= 0 or den <= 0:
+            raise ValueError(f"Tasa de conversión inválida: {num}/{den}")
+        divisor = math.gcd(num, den)
+        self.num = num // divisor
+        self.den = den // divisor
+
+    @classmethod
+    def of(cls, value):
+        """Tasa a partir de un Rate, int, float (por su repr), Decimal o texto; ValueError si no es positiva."""
+        if isinstance(value, Rate):
+            return value
+        if isinstance(value, bool):
+            raise ValueError(f"Tasa de conversión inválida: {value}")
+        return _rate_from_value(value)
+
+    def cross(self, other):
+        """Tasa de la moneda de self a la de other, si ambas son precios en una misma moneda (Bs por unidad)."""
+        return Rate(self.num * other.den, self.den * other.num)
+
+    def inverse(self):
+        return Rate(self.den, self.num)
+
+    def __float__(self):
+        return self.num / self.den
+
+    def __eq__(self, other):
+        if not isinstance(other, Rate):
+            return NotImplemented
+        return self.num == other.num and self.den == other.den
+
+    def __hash__(self):
+        return hash((self.num, self.den))
+
+    def __repr__(self):
+        return f"Rate({self.num}, {self.den})"
+
+
+def to_cents(value, rounding=DEFAULT_ROUNDING, decimal=None):
+    """Céntimos enteros de un monto (texto, int, float por su repr o Decimal) redondeado con `rounding`."""
+    _check_rounding(rounding)
+    amount = parse_decimal(value, decimal)
+    return int(amount.scaleb(DECIMALS).to_integral_value(rounding=_DECIMAL_ROUNDING[rounding]))
+
+
+def exact_ratio(value, decimal=None):
+    """(numerador, denominador) enteros del valor exacto de un monto; el de un Money son sus céntimos / CENTS."""
+    if isinstance(value, Money):
+        return value.cents, CENTS
+    return parse_decimal(value, decimal).as_integer_ratio()
+
+
+def scaled_cents(value, multiplier=1, divisor=1, rounding=DEFAULT_ROUNDING, decimal=None):
+    """
+    Céntimos de value * multiplier / divisor. Se parte del valor exacto del monto (sin llevarlo antes
+    a céntimos), así que el resultado se redondea una sola vez con `rounding`.
+    """
+    _check_rounding(rounding)
+    num, den = exact_ratio(value, decimal)
+    return div_round(num * multiplier * CENTS, den * divisor, rounding)
+
+
+@total_ordering
+class Money:
+    """
+    Monto exacto en céntimos enteros. Es inmutable y se formatea como un Decimal
+    (f"{monto:,.2f}" da "1,234.56"), así que sustituye al float en los textos de las pantallas.
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents=0):
+        if isinstance(cents, bool) or not isinstance(cents, int):
+            raise TypeError(f"Money espera céntimos enteros, no {type(cents).__name__}")
+        self.cents = cents
+
+    @classmethod
+    def of(cls, value, rounding=DEFAULT_ROUNDING, decimal=None):
+        """Monto a partir de texto ("1.234,56"), int, float (por su repr), Decimal o Money."""
+        if isinstance(value, Money):
+            return value
+        return cls(to_cents(value, rounding, decimal))
+
+    @classmethod
+    def _from_cents(cls, cents):
+        """Constructor sin validación para enteros ya calculados por el propio módulo."""
+        money = object.__new__(cls)
+        money.cents = cents
+        return money
+
+    def mul(self, rate, rounding=DEFAULT_ROUNDING):
+        """Monto por una tasa (p. ej. USD -> VES), redondeado a céntimos."""
+        if type(rate) is not Rate:
+            rate = Rate.of(rate)
+        return Money._from_cents(div_round(self.cents * rate.num, rate.den, rounding))
+
+    def div(self, rate, rounding=DEFAULT_ROUNDING):
+        """Monto entre una tasa (p. ej. VES -> USD), redondeado a céntimos."""
+        if type(rate) is not Rate:
+            rate = Rate.of(rate)
+        return Money._from_cents(div_round(self.cents * rate.den, rate.num, rounding))
+
+    def to_decimal(self):
+        return Decimal(self.cents).scaleb(-DECIMALS)
+
+    def __float__(self):
+        return self.cents / CENTS # División de enteros: el float más cercano al monto exacto
+
+    def __format__(self, spec):
+        return format(self.to_decimal(), spec or f".{DECIMALS}f")
+
+    def __str__(self):
+        return format(self)
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __eq__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents == other.cents
+
+    def __lt__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents < other.cents
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    def __add__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.cents + other.cents)
+
+    def __radd__(self, other):
+        if other == 0: # Permite sum() sobre una lista de montos
+            return self
+        return NotImplemented
+
+    def __sub__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.cents - other.cents)
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+
+def format_cents(cents):
+    """Texto "-1234.56" de una cantidad de céntimos, sin pasar por float ni Decimal (para lotes grandes)."""
+    units, rest = divmod(abs(cents), CENTS)
+    return f"{'-' if cents < 0 else ''}{units}.{rest:0{DECIMALS}d}"
+
+
+def exact_batch(amounts, decimal=None):
+    """
+    Valores exactos de muchos montos: (unidades, escala), con cada monto = unidades / 10**escala.
+    Requiere NumPy. Los montos se leen como en parse_decimal (texto, int, float por su repr o Decimal),
+    sin redondear a céntimos. `unidades` es un ndarray de int64, o de enteros de Python si alguno no cabe.
+    Lanza ValueError si algún monto no es válido o no es finito.
+    """
+    np = load_numpy()
+    if not isinstance(amounts, (np.ndarray, list, tuple)):
+        amounts = list(amounts) # Generadores e iterables sin longitud
+    values = amounts if isinstance(amounts, np.ndarray) else np.asarray(amounts)
+    if values.dtype.kind == 'i':
+        return values.astype(np.int64, copy=False), 0
+    if values.dtype.kind == 'f':
+        # Camino rápido: floats cuyo repr tiene a lo sumo DECIMALS decimales (casi siempre), sin pasar por texto
+        scaled = np.rint(values * CENTS)
+        if not values.size or (np.abs(scaled).max() < _MAX_FLOAT_CENTS and (scaled / CENTS == values).all()):
+            return scaled.astype(np.int64), DECIMALS
+
+    exact = [parse_decimal(amount, decimal) for amount in
+             (amounts.tolist() if isinstance(amounts, np.ndarray) else amounts)]
+    scale = max([0] + [-amount.as_tuple().exponent for amount in exact])
+    factor = 10 ** scale
+    units = []
+    for amount in exact:
+        num, den = amount.as_integer_ratio() # den divide a 10**scale
+        units.append(num * (factor // den))
+    try:
+        return np.array(units, dtype=np.int64), scale
+    except OverflowError:
+        return np.array(units, dtype=object), scale
+
+
+def multiply_batch(values, factor):
+    """values * factor para un entero o un ndarray de enteros; pasa a enteros de Python si no cabe en int64."""
+    np = load_numpy()
+    if (isinstance(values, np.ndarray) and values.dtype != object and values.size
+            and int(np.abs(values).max()) * factor > _INT64_MAX):
+        values = values.astype(object)
+    return values * factor
+
+
+def cents_batch(amounts, rounding=DEFAULT_ROUNDING):
+    """
+    Céntimos de muchos montos de una vez; cada uno se redondea una sola vez desde su valor exacto
+    (ver exact_batch), con el mismo resultado que Money.of.
+    `amounts` puede ser un arreglo de NumPy, una lista o cualquier iterable de números o textos.
+    Con NumPy devuelve un ndarray de int64 (de enteros de Python si alguno no cabe); sin NumPy
+    devuelve una lista de enteros.
+    Lanza ValueError si algún monto no es válido o no es finito.
+    """
+    _check_rounding(rounding)
+    np = load_numpy()
+    if np is None:
+        return [to_cents(amount, rounding) for amount in amounts]
+    units, scale = exact_batch(amounts)
+    return scale_batch(units, CENTS, 10 ** scale, rounding)
+
+
+def scale_batch(cents, multiplier, divisor, rounding=DEFAULT_ROUNDING):
+    """
+    cents * multiplier / divisor redondeado a entero, elemento a elemento y sin pérdida.
+    `cents` es un ndarray de enteros (ver cents_batch y exact_batch); `multiplier` y `divisor` son
+    enteros positivos o ndarrays de enteros con uno por monto. Usa aritmética de int64 vectorizada
+    mientras los productos caben en 64 bits y, si no, enteros de Python (más lento pero igual de exacto).
+    """
+    _check_rounding(rounding)
+    np = load_numpy()
+    if isinstance(multiplier, int) and isinstance(divisor, int):
+        common = math.gcd(multiplier, divisor) # Margen para el camino de int64 (p. ej. 100 / 1000 -> 1 / 10)
+        multiplier, divisor = multiplier // common, divisor // common
+    if object in (cents.dtype, np.asarray(multiplier).dtype, np.asarray(divisor).dtype):
+        return _scale_exact(np, cents, multiplier, divisor, rounding)
+    largest = int(np.abs(cents).max()) if cents.size else 0
+    if largest * int(np.max(multiplier)) > _INT64_MAX or 2 * int(np.max(divisor)) > _INT64_MAX:
+        return _scale_exact(np, cents, multiplier, divisor, rounding)
+
+    product = cents * multiplier
+    quotient, remainder = np.divmod(np.abs(product), divisor)
+    if rounding == ROUND_HALF_UP:
+        quotient += 2 * remainder >= divisor
+    elif rounding == ROUND_HALF_EVEN:
+        twice = 2 * remainder
+        quotient += (twice > divisor) | ((twice == divisor) & ((quotient & 1) == 1))
+    elif rounding == ROUND_UP:
+        quotient += remainder > 0
+    return np.where(product < 0, -quotient, quotient)
+
+
+def _scale_exact(np, cents, multiplier, divisor, rounding):
+    """Camino de scale_batch para productos que no caben en int64."""
+    count = len(cents)
+    multipliers = np.broadcast_to(multiplier, count).tolist()
+    divisors = np.broadcast_to(divisor, count).tolist()
+    result = [div_round(c * m, d, rounding) for c, m, d in zip(cents.tolist(), multipliers, divisors)]
+    try:
+        return np.array(result, dtype=np.int64)
+    except OverflowError:
+        return np.array(result, dtype=object)
+
+
+def rates_batch(rates):
+    """
+    Numeradores y denominadores (ndarrays de int64) de una tasa por monto, más la máscara de las válidas.
+    Las tasas inválidas (cero, negativas, NaN) quedan como 1/1 y con False en la máscara.
+    Cada tasa distinta se convierte a fracción una sola vez.
+    """
+    np = load_numpy()
+    values = np.asarray(rates, dtype=np.float64)
+    valid = values > 0 # NaN también queda fuera
+    unique, inverse = np.unique(np.where(valid, values, 1.0), return_inverse=True)
+    fractions = [Rate.of(float(value)) for value in unique]
+    try:
+        nums = np.array([f.num for f in fractions], dtype=np.int64)[inverse]
+        dens = np.array([f.den for f in fractions], dtype=np.int64)[inverse]
+    except OverflowError:
+        nums = np.array([f.num for f in fractions], dtype=object)[inverse]
+        dens = np.array([f.den for f in fractions], dtype=object)[inverse]
+    return nums, dens, valid
+
+
+def try_parse_money(text, decimal=None):
+    """Como Money.of para un texto, pero devuelve None en vez de lanzar ValueError."""
+    try:
+        return Money.of(text, decimal=decimal)
+    except (TypeError, ValueError):
+        return None
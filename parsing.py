@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Lectura de precios y montos escritos en formato venezolano o internacional.
+# Sin dependencias de Kivy: lo usan la app, la descarga de tasas y la conversión masiva.
+
+import math
+import re
+from decimal import Decimal, InvalidOperation
+
+# Espacios que pueden aparecer como separador de miles; se eliminan con str.translate
+_SPACES = ' \t\u00a0\u2009\u202f'
+_DROP_SPACES = {ord(c): None for c in _SPACES}
+# Símbolos de moneda aceptados antes o después del número (en minúsculas)
+_CURRENCY_TOKENS = ('bs.s', 'bs.', 'bs', 'ves', 'usd', '$')
+# Forma final tras normalizar los separadores (sin signo): dígitos con punto decimal y exponente opcional
+_NORMALIZED = re.compile(r'(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+# Mayor exponente (en valor absoluto) de un monto exacto. Pasar "1e-999999999" a fracción de enteros
+# no termina nunca; ningún monto real se acerca a este límite
+_MAX_EXPONENT = 400
+
+
+def _has_spaces(text):
+    """Indica si el texto contiene algún espacio usado como separador de miles."""
+    for space in _SPACES:
+        if space in text:
+            return True
+    return False
+
+
+def _strip_currency(text):
+    """Quita un símbolo de moneda al inicio o al final (p. ej. "Bs. 1.234,56" o "12,5 USD")."""
+    if text[:1].isdigit() and text[-1:].isdigit():
+        return text # Caso habitual: no hay símbolo que quitar
+    lowered = text.lower()
+    for token in _CURRENCY_TOKENS:
+        if lowered.startswith(token):
+            return text[len(token):].strip()
+        if lowered.endswith(token):
+            return text[:-len(token)].strip()
+    return text
+
+
+def _fast_path_allowed(text, decimal):
+    """
+    Indica si float()/Decimal() pueden leer el texto directamente con el mismo resultado que _normalize.
+    Se excluyen la coma (decimal o de miles) y "_", que ambos aceptan entre dígitos pero el formato no.
+    """
+    return decimal != ',' and ',' not in text and '_' not in text
+
+
+def parse_amount(text, decimal=None):
+    """
+    Convierte un monto escrito por una persona o una API en float.
+
+    Acepta:
+    - coma o punto decimal: "36,5372", "36.5372";
+    - separadores de miles con punto, coma o espacio: "1.234.567,89", "1,234,567.89", "1 234,5";
+    - signo y negativos contables: "-12,5", "+3", "(1.234,56)";
+    - notación exponencial: "3.65e-1", "1E3";
+    - un símbolo de moneda al inicio o al final: "$ 12", "Bs. 1.234,56", "12 USD".
+
+    Reglas para los separadores, siempre iguales para la misma entrada:
+    - si aparecen punto y coma, el último en aparecer es el decimal;
+    - si un mismo separador aparece varias veces es de miles, salvo que el último grupo
+      no tenga 3 dígitos (formato "1.07.62"), en cuyo caso ese último es el decimal;
+    - si aparece una sola vez es el decimal, salvo que `decimal` indique el otro símbolo.
+
+    Lanza ValueError si el texto no es un número válido o no es finito.
+    """
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        value = float(text)
+    else:
+        text = str(text)
+        # Camino rápido: el formato simple "1234.56" lo resuelve float() en C, en una sola pasada.
+        # float() también acepta "_" entre dígitos ("1_000"), que no es un formato válido de monto
+        value = None
+        if _fast_path_allowed(text, decimal):
+            try:
+                value = float(text)
+            except ValueError:
+                pass
+        if value is None:
+            value = _parse_formatted(text, decimal)
+    if not math.isfinite(value):
+        raise ValueError(f"Monto no finito: {text!r}")
+    return value
+
+
+def _parse_formatted(text, decimal):
+    """Camino general de parse_amount: normaliza separadores, signo y moneda y luego usa float()."""
+    negative, normalized = _normalize(text, decimal)
+    value = float(normalized)
+    return -value if negative else value
+
+
+def _normalize(text, decimal):
+    """
+    Quita moneda, espacios, signo y separadores de miles de un monto escrito a mano.
+    Devuelve (negativo, texto_normalizado) con punto decimal, listo para float() o Decimal().
+    """
+    text = text.strip()
+    negative = False
+    if text.startswith('(') and text.endswith(')'):
+        negative = True # Formato contable: (123,45)
+        text = text[1:-1].strip()
+    text = _strip_currency(text)
+    if _has_spaces(text):
+        text = text.translate(_DROP_SPACES)
+    if text[:1] in ('+', '-'):
+        negative = negative != (text[0] == '-')
+        text = text[1:]
+
+    # El exponente (si lo hay) se separa para no confundir sus dígitos con los grupos de miles
+    number, exponent = text, ''
+    if 'e' in text or 'E' in text:
+        exp_at = max(text.find('e'), text.find('E'))
+        number, exponent = text[:exp_at], text[exp_at:]
+
+    dots = number.count('.')
+    commas = number.count(',')
+    if dots and commas:
+        decimal_sep = '.' if number.rfind('.') > number.rfind(',') else ','
+        thousands_sep = ',' if decimal_sep == '.' else '.'
+        if number.count(decimal_sep) > 1:
+            raise ValueError(f"Separador decimal repetido: {text!r}")
+        number = number.replace(thousands_sep, '').replace(',', '.')
+    elif dots or commas:
+        sep = '.' if dots else ','
+        if dots + commas > 1:
+            head, _, tail = number.rpartition(sep)
+            if len(tail) == 3:
+                number = number.replace(sep, '') # Todos son separadores de miles
+            else:
+                number = head.replace(sep, '') + '.' + tail # Formato "1.07.62": el último es decimal
+        elif decimal is not None and decimal != sep:
+            number = number.replace(sep, '') # El usuario indicó que este símbolo es de miles
+        elif sep == ',':
+            number = number.replace(',', '.')
+
+    normalized = number + exponent
+    if not _NORMALIZED.fullmatch(normalized):
+        raise ValueError(f"Monto inválido: {text!r}")
+    return negative, normalized
+
+
+def try_parse_amount(text, decimal=None):
+    """Como parse_amount, pero devuelve None en vez de lanzar ValueError."""
+    try:
+        return parse_amount(text, decimal)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_decimal(text, decimal=None):
+    """
+    Como parse_amount, pero devuelve un Decimal exacto con los dígitos escritos ("0,1" es 0.1 y no
+    0.1000000000000000055...). Un float se toma por su representación más corta (repr).
+    Lo usa el motor de dinero (money.py) para convertir montos sin errores de redondeo binario.
+    Lanza ValueError si el texto no es un número válido, no es finito o su exponente supera _MAX_EXPONENT.
+    """
+    if isinstance(text, Decimal):
+        value = text
+    elif isinstance(text, (int, float)) and not isinstance(text, bool):
+        value = Decimal(text) if isinstance(text, int) else Decimal(repr(text))
+    else:
+        text = str(text)
+        value = None
+        if _fast_path_allowed(text, decimal):
+            try:
+                value = Decimal(text.strip())
+            except InvalidOperation:
+                pass
+        if value is None:
+            negative, normalized = _normalize(text, decimal)
+            value = -Decimal(normalized) if negative else Decimal(normalized)
+    if not value.is_finite():
+        raise ValueError(f"Monto no finito: {text!r}")
+    if abs(value.as_tuple().exponent) > _MAX_EXPONENT:
+        raise ValueError(f"Monto fuera de rango: {text!r}")
+    return value
+
+
+def try_parse_decimal(text, decimal=None):
+    """Como parse_decimal, pero devuelve None en vez de lanzar ValueError."""
+    try:
+        return parse_decimal(text, decimal)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Reserva local de frases motivacionales, sin dependencias de Kivy.
+# Las frases se descargan por lotes en segundo plano y se guardan en disco, así la pantalla principal
+# muestra una frase nueva desde el primer frame (también sin conexión) y rota sin esperar a la red.
+import json
+import os
+import threading
+import time
+import unicodedata
+
+QUOTE_POOL_FILENAME = 'quote_pool.json'
+DEFAULT_CAPACITY = 200 # Frases que se conservan; al superarlo se descartan las más antiguas ya mostradas
+DEFAULT_LOW_WATER = 10 # Con menos frases sin mostrar que esto se pide un lote nuevo
+DEFAULT_REFILL_INTERVAL = 6 * 60 * 60 # Segundos mínimos entre lotes (la API publica pocas frases nuevas al día)
+
+
+def normalize_quote(text):
+    """Clave para detectar frases repetidas: sin diferencias de mayúsculas, espacios ni composición Unicode."""
+    return ' '.join(unicodedata.normalize('NFC', text).casefold().split())
+
+
+class QuotePool:
+    """
+    Frases sin repetir en orden de llegada y la posición de la siguiente a mostrar.
+    Las frases nuevas se añaden al final; cuando se muestran todas se vuelve a empezar por las
+    más antiguas, de modo que siempre hay una frase aunque no haya red.
+    Se llena desde el pool de hilos del bucle de descargas y se lee desde el hilo principal,
+    por eso usa un lock.
+    """
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, low_water=DEFAULT_LOW_WATER,
+                 refill_interval=DEFAULT_REFILL_INTERVAL):
+        self.path = path
+        self.capacity = capacity
+        self.low_water = low_water
+        self.refill_interval = refill_interval
+        self._lock = threading.Lock()
+        self._quotes = []
+        self._keys = set()
+        self._position = 0 # Índice de la siguiente frase a mostrar
+        self._refilled_at = 0.0 # time.time() del último lote pedido
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._quotes)
+
+    def load(self):
+        """Lee la reserva guardada. Un archivo ausente o dañado equivale a una reserva vacía."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            quotes = [str(quote) for quote in data['quotes'] if str(quote).strip()]
+            position = int(data.get('position', 0))
+            refilled_at = float(data.get('refilled_at', 0.0))
+        except FileNotFoundError:
+            return self
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Warning: Ignoring unreadable quote pool '{self.path}': {e}")
+            return self
+        with self._lock:
+            self._quotes, self._keys = [], set()
+            for quote in quotes:
+                self._append(quote)
+            self._position = min(max(0, position), len(self._quotes))
+            self._refilled_at = refilled_at
+        return self
+
+    def save(self):
+        """Escritura atómica (archivo temporal + reemplazo); no hace nada si no hubo cambios."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'quotes': list(self._quotes), 'position': self._position, 'refilled_at': self._refilled_at}
+            self._dirty = False
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write quote pool '{self.path}': {e}")
+
+    def _append(self, quote):
+        key = normalize_quote(quote)
+        if not key or key in self._keys:
+            return False
+        self._keys.add(key)
+        self._quotes.append(quote.strip())
+        return True
+
+    def add(self, quotes):
+        """Añade las frases que no estén ya en la reserva. Devuelve cuántas se añadieron."""
+        with self._lock:
+            self._refilled_at = time.time()
+            added = sum(1 for quote in quotes if self._append(quote))
+            # Por encima de la capacidad se descartan las más antiguas, pero solo entre las ya mostradas
+            overflow = min(len(self._quotes) - self.capacity, self._position)
+            if overflow > 0:
+                for quote in self._quotes[:overflow]:
+                    self._keys.discard(normalize_quote(quote))
+                del self._quotes[:overflow]
+                self._position -= overflow
+            self._dirty = True
+            return added
+
+    def next(self):
+        """Siguiente frase a mostrar (sin red), o None si la reserva está vacía."""
+        with self._lock:
+            if not self._quotes:
+                return None
+            if self._position >= len(self._quotes):
+                self._position = 0 # Todas mostradas: se repiten desde la más antigua
+            quote = self._quotes[self._position]
+            self._position += 1
+            self._dirty = True
+            return quote
+
+    def unseen(self):
+        """Frases que aún no se han mostrado."""
+        with self._lock:
+            return len(self._quotes) - self._position
+
+    def needs_refill(self, now=None):
+        """
+        Indica si conviene pedir un lote: quedan pocas frases sin mostrar y pasó refill_interval
+        desde el último lote. Una reserva vacía se rellena siempre.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._quotes:
+                return True
+            return (len(self._quotes) - self._position < self.low_water
+                    and now - self._refilled_at >= self.refill_interval)
+
+    def stats(self):
+        with self._lock:
+            return {'quotes': len(self._quotes), 'unseen': len(self._quotes) - self._position}
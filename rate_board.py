@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# Publicación compartida de la tasa entre varias instancias de la app (y el modo servicio),
+# sin dependencias de Kivy. Es un archivo pequeño de formato fijo mapeado en memoria (mmap):
+# una sola instancia, la que tiene el lock del archivo, descarga la tasa y la escribe; las demás
+# la leen sin red ni JSON y vigilan el contador de versión para enterarse de los cambios.
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from rate_matrix import CURRENCIES
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+RATE_BOARD_FILENAME = 'bcv_rate_board.bin'
+DEFAULT_POLL_INTERVAL = 2.0 # Segundos entre lecturas del contador de versión en las instancias lectoras
+
+# Formato (little-endian, tamaño fijo):
+#   cabecera: firma, versión del formato, número de monedas y contador de versión (seqlock)
+#   datos:    hora de descarga y de publicación, pid del escritor, fuente y un precio por moneda de CURRENCIES
+# El contador es impar mientras el escritor modifica los datos y par cuando están completos.
+_MAGIC = b'BCVB'
+_LAYOUT_VERSION = 1
+_HEADER = struct.Struct('<4sHHQ')
+_SEQ = struct.Struct('<Q')
+_SEQ_OFFSET = 8 # Alineado a 8 bytes: el escritor actualiza el contador con una sola escritura
+_SOURCE_BYTES = 64
+_PAYLOAD = struct.Struct(f'<ddI{_SOURCE_BYTES}s{len(CURRENCIES)}d')
+BOARD_SIZE = _HEADER.size + _PAYLOAD.size
+_READ_ATTEMPTS = 100 # Lecturas seguidas que se intentan si el escritor está a mitad de una publicación
+
+# Tasas publicadas: version es el contador (par) con el que se leyeron
+BoardRecord = namedtuple('BoardRecord', 'version prices fetched_at published_at source writer_pid')
+
+
+class RateBoard:
+    """
+    Registro de la tasa compartido por las instancias de un mismo usuario.
+    Un solo escritor: la primera instancia que obtiene el lock exclusivo del archivo (ver acquire_writer);
+    si termina, el lock se libera y otra instancia puede tomar su lugar en el siguiente refresco.
+    Los lectores copian los datos entre dos lecturas del contador y reintentan si cambió (seqlock),
+    así nunca ven una publicación a medias y el escritor nunca espera a los lectores.
+    Si el archivo no se puede abrir o mapear, la publicación queda desactivada y cada instancia
+    descarga su tasa como antes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.is_writer = False
+        self._fd = None
+        self._map = None
+        self._write_lock = threading.Lock() # Un solo escritor también entre los hilos de la instancia
+
+    @property
+    def enabled(self):
+        return self._map is not None
+
+    def open(self):
+        """Abre (o crea) el archivo y lo mapea en memoria."""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < BOARD_SIZE:
+                    os.ftruncate(fd, BOARD_SIZE) # Se rellena con ceros: versión 0 = nada publicado
+                self._map = mmap.mmap(fd, BOARD_SIZE)
+            except (OSError, ValueError):
+                os.close(fd)
+                raise
+            self._fd = fd
+        except (OSError, ValueError) as e:
+            print(f"Warning: Rate board disabled ('{self.path}'): {e}")
+        return self
+
+    def close(self):
+        """Desmapea el archivo y libera el lock de escritor, si lo tenía. Espera a una publicación en curso."""
+        with self._write_lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._fd is not None:
+                os.close(self._fd) # Cerrar el descriptor libera el lock
+                self._fd = None
+            self.is_writer = False
+
+    def acquire_writer(self):
+        """
+        Intenta ser el escritor (lock exclusivo no bloqueante sobre el archivo).
+        Devuelve True si esta instancia publica la tasa; False si ya hay otra que lo hace.
+        """
+        if self.is_writer or self._map is None:
+            return self.is_writer
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt is not None:
+                os.lseek(self._fd, BOARD_SIZE, os.SEEK_SET) # Un byte fuera de la zona mapeada
+                msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        magic, layout, count, _ = _HEADER.unpack_from(self._map, 0)
+        if (magic, layout, count) != (_MAGIC, _LAYOUT_VERSION, len(CURRENCIES)):
+            # Archivo nuevo o de otro formato: se reinicia sin publicación
+            self._map[:] = bytes(BOARD_SIZE)
+            _HEADER.pack_into(self._map, 0, _MAGIC, _LAYOUT_VERSION, len(CURRENCIES), 0)
+        self.is_writer = True
+        print(f"DEBUG: This instance publishes the shared rate board ({self.path})")
+        return True
+
+    def version(self):
+        """Contador de versión actual (0 si nunca se publicó). Es una sola lectura de 8 bytes."""
+        if self._map is None:
+            return 0
+        return _SEQ.unpack_from(self._map, _SEQ_OFFSET)[0]
+
+    def publish(self, prices, fetched_at=None, source=''):
+        """
+        Escribe las tasas ({moneda: bolívares por unidad}). Solo lo hace el escritor; devuelve la versión nueva
+        (None si no es el escritor o si el registro ya se cerró).
+        """
+        if not self.is_writer:
+            return None
+        payload = _PAYLOAD.pack(time.time() if fetched_at is None else float(fetched_at), time.time(), os.getpid(),
+                                source.encode('utf-8')[:_SOURCE_BYTES],
+                                *(float(prices.get(currency, 0.0) or 0.0) for currency in CURRENCIES))
+        with self._write_lock:
+            if self._map is None:
+                return None
+            seq = self.version() | 1 # Impar: publicación en curso (si un escritor anterior murió a medias ya lo era)
+            _SEQ.pack_into(self._map, _SEQ_OFFSET, seq)
+            self._map[_HEADER.size:BOARD_SIZE] = payload
+            _SEQ.pack_into(self._map, _SEQ_OFFSET, seq + 1)
+            return seq + 1
+
+    def read(self):
+        """
+        Últimas tasas publicadas como BoardRecord, o None si no hay ninguna (o el escritor no
+        terminó de publicar tras varios intentos). No hace llamadas al sistema ni lee JSON.
+        """
+        if self._map is None:
+            return None
+        for _ in range(_READ_ATTEMPTS):
+            before = self.version()
+            if before & 1:
+                time.sleep(0) # Cede el procesador al escritor
+                continue
+            header = self._map[:_HEADER.size]
+            payload = self._map[_HEADER.size:BOARD_SIZE]
+            if self.version() != before:
+                continue
+            magic, layout, count, _ = _HEADER.unpack(header)
+            if before == 0 or (magic, layout, count) != (_MAGIC, _LAYOUT_VERSION, len(CURRENCIES)):
+                return None
+            fetched_at, published_at, writer_pid, source, *values = _PAYLOAD.unpack(payload)
+            prices = {currency: value for currency, value in zip(CURRENCIES, values) if value > 0}
+            return BoardRecord(before, prices, fetched_at, published_at,
+                               source.rstrip(b'\0').decode('utf-8', 'replace'), writer_pid)
+        return None
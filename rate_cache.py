@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Caché persistente de la tasa BCV.
+# Este módulo no depende de Kivy para poder usarse también desde scripts o pruebas.
+import json
+import os
+import sys
+import time
+
+APP_NAME = 'converter' # Nombre que Kivy deriva de ConverterApp (carpeta de datos del usuario)
+RATE_CACHE_FILENAME = 'bcv_rate_cache.json'
+DEFAULT_CACHE_TTL = 60 * 60 # Segundos durante los que la tasa guardada se considera fresca
+DEFAULT_MAX_STALE_AGE = 7 * 24 * 60 * 60 # Segundos durante los que se sigue usando si falla la red
+
+
+def default_user_data_dir():
+    """
+    Carpeta de datos del usuario, con la misma ruta que App.user_data_dir de Kivy,
+    para que los scripts sin interfaz compartan el caché con la app.
+    """
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA', os.path.expanduser('~'))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Application Support')
+    else:
+        base = os.environ.get('XDG_CONFIG_HOME', os.path.expanduser('~/.config'))
+    return os.path.join(base, APP_NAME)
+
+
+def default_cache_path():
+    """Ruta del caché de tasa que usa la app."""
+    return os.path.join(default_user_data_dir(), RATE_CACHE_FILENAME)
+
+
+class RateCache:
+    """
+    Guarda en disco la última tasa válida junto con la hora en que se obtuvo y su fuente.
+    Permite mostrar una tasa al instante al iniciar la app y decidir si hace falta refrescarla.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entry = None # Última entrada leída o escrita: {'price', 'fetched_at', 'source', 'validators', 'prices'}
+
+    def load(self):
+        """
+        Lee la entrada guardada en disco.
+        Devuelve el diccionario de la entrada o None si no existe o está dañada.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            price = float(data['price'])
+            fetched_at = float(data['fetched_at'])
+            if price <= 0:
+                return None
+            self.entry = {'price': price,
+                          'fetched_at': fetched_at,
+                          'source': str(data.get('source', '')),
+                          'validators': data.get('validators') if isinstance(data.get('validators'), dict) else None,
+                          'prices': self._read_prices(data.get('prices'), price)}
+        except FileNotFoundError:
+            self.entry = None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Warning: Ignoring unreadable rate cache '{self.path}': {e}")
+            self.entry = None
+        return self.entry
+
+    @staticmethod
+    def _read_prices(raw, price):
+        """Bolívares por unidad de cada moneda; las entradas antiguas solo tienen el dólar."""
+        prices = {}
+        if isinstance(raw, dict):
+            for currency, value in raw.items():
+                try:
+                    if float(value) > 0:
+                        prices[str(currency)] = float(value)
+                except (TypeError, ValueError):
+                    pass
+        prices.setdefault('USD', price)
+        return prices
+
+    def store(self, price, source, fetched_at=None, validators=None, prices=None):
+        """
+        Guarda una tasa válida en disco.
+        price: bolívares por dólar; prices: bolívares por unidad de cada moneda (incluido el dólar).
+        validators: ETag/Last-Modified de la respuesta, para que la próxima petición sea condicional.
+        La escritura es atómica (archivo temporal + reemplazo) para no dejar el caché a medias.
+        """
+        self.entry = {'price': float(price),
+                      'fetched_at': time.time() if fetched_at is None else float(fetched_at),
+                      'source': source,
+                      'validators': validators,
+                      'prices': dict(prices) if prices else {'USD': float(price)}}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entry, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write rate cache '{self.path}': {e}")
+        return self.entry
+
+    def age(self, now=None):
+        """Segundos transcurridos desde que se obtuvo la tasa guardada (None si no hay entrada)."""
+        if self.entry is None:
+            return None
+        now = time.time() if now is None else now
+        return max(0.0, now - self.entry['fetched_at'])
+
+    def is_fresh(self, ttl, now=None):
+        """Indica si la entrada existe y es más reciente que el TTL (en segundos)."""
+        age = self.age(now)
+        return age is not None and age < ttl
+
+    def usable_price(self, max_age, now=None):
+        """
+        Devuelve el precio guardado si no supera max_age segundos de antigüedad.
+        Sirve para seguir mostrando la última tasa conocida cuando falla la red.
+        """
+        age = self.age(now)
+        if age is None or age >= max_age:
+            return 0
+        return self.entry['price']
+
+    def usable_prices(self, max_age, now=None):
+        """Como usable_price, pero con los bolívares por unidad de cada moneda ({} si no sirve)."""
+        if not self.usable_price(max_age, now):
+            return {}
+        return dict(self.entry['prices'])
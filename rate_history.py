@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Historial local de tasas BCV por fecha, sin dependencias de Kivy.
+# Permite convertir con la tasa vigente en la fecha de una factura.
+import csv
+import datetime
+import os
+import struct
+import threading
+from bisect import bisect_left, bisect_right
+
+from money import load_numpy # NumPy opcional, importado solo para las búsquedas por lotes
+from parsing import try_parse_amount
+from rate_cache import default_user_data_dir
+
+RATE_HISTORY_FILENAME = 'bcv_rate_history.bin'
+
+# Cada registro ocupa 12 bytes: fecha (ordinal del calendario, int32) y precio (float64)
+_RECORD = struct.Struct('<id')
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+
+
+def default_history_path():
+    """Ruta del historial de tasas que usa la app."""
+    return os.path.join(default_user_data_dir(), RATE_HISTORY_FILENAME)
+
+
+def parse_date(value):
+    """
+    Convierte una fecha en texto (AAAA-MM-DD, DD/MM/AAAA o DD-MM-AAAA), date o datetime
+    en su ordinal del calendario. Devuelve None si no es una fecha válida.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date().toordinal()
+    if isinstance(value, datetime.date):
+        return value.toordinal()
+    text = str(value).strip()[:10]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, fmt).date().toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+class RateHistory:
+    """
+    Serie temporal de tasas indexada por fecha.
+    En disco es un archivo binario de solo-añadir con registros de tamaño fijo;
+    en memoria son dos listas ordenadas (fechas y precios) para búsquedas O(log n).
+    Si hay varios registros para la misma fecha, gana el último.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.dates = [] # Ordinales de fecha, en orden ascendente
+        self.prices = [] # Precio vigente desde la fecha correspondiente
+        self._lock = threading.Lock() # Las descargas añaden registros desde hilos en segundo plano
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getstate__(self):
+        # El lock no se puede serializar; hace falta para enviar el historial a otros procesos
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Lee el archivo completo; los registros repetidos o desordenados se resuelven aquí."""
+        by_date = {}
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+        usable = len(data) - len(data) % _RECORD.size # Ignora un registro final incompleto
+        for ordinal, price in _RECORD.iter_unpack(data[:usable]):
+            if price > 0:
+                by_date[ordinal] = price
+        with self._lock:
+            self._set_sorted(by_date)
+        return self
+
+    def _set_sorted(self, by_date):
+        self.dates = sorted(by_date)
+        self.prices = [by_date[d] for d in self.dates]
+
+    def append(self, date, price):
+        """
+        Registra la tasa de una fecha (date, datetime, ordinal o texto).
+        Se añade un registro al final del archivo sin reescribirlo.
+        """
+        ordinal = date if isinstance(date, int) else parse_date(date)
+        if ordinal is None or not price or price <= 0:
+            raise ValueError(f"Registro de tasa inválido: {date!r}, {price!r}")
+        with self._lock:
+            index = bisect_left(self.dates, ordinal)
+            if index < len(self.dates) and self.dates[index] == ordinal:
+                if self.prices[index] == price:
+                    return # Misma tasa ya registrada ese día: no hace falta escribir
+                self.prices[index] = price
+            else:
+                self.dates.insert(index, ordinal)
+                self.prices.insert(index, price)
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, 'ab') as f:
+                    f.write(_RECORD.pack(ordinal, price))
+            except OSError as e:
+                print(f"Warning: Could not append to rate history '{self.path}': {e}")
+
+    def rate_on(self, date):
+        """
+        Tasa vigente en la fecha indicada: la última publicada en esa fecha o antes.
+        Devuelve 0 si la fecha es anterior a todo el historial o no es válida.
+        """
+        ordinal = date if isinstance(date, int) else parse_date(date)
+        if ordinal is None:
+            return 0
+        with self._lock: # append() inserta en dates y prices desde los hilos de descarga
+            index = bisect_right(self.dates, ordinal) - 1
+            return self.prices[index] if index >= 0 else 0
+
+    def rates_on(self, dates):
+        """
+        Versión por lotes de rate_on para una secuencia de fechas (ordinales o texto).
+        Con NumPy devuelve un ndarray (NaN donde no hay tasa); sin NumPy, una lista (0 donde no hay tasa).
+        """
+        ordinals = [d if isinstance(d, int) else parse_date(d) for d in dates]
+        np = load_numpy()
+        if np is None:
+            return [self.rate_on(o) if o is not None else 0 for o in ordinals]
+
+        with self._lock:
+            known_dates = np.asarray(self.dates, dtype=np.int64)
+            known_prices = np.asarray(self.prices, dtype=np.float64)
+        query = np.asarray([o if o is not None else -1 for o in ordinals], dtype=np.int64)
+        index = np.searchsorted(known_dates, query, side='right') - 1
+        rates = np.full(len(query), np.nan)
+        found = (index >= 0) & (query >= 0)
+        rates[found] = known_prices[index[found]]
+        return rates
+
+    def import_csv(self, csv_path, date_column='date', price_column='price'):
+        """
+        Importa un historial desde CSV (columnas de fecha y precio) y compacta el archivo.
+        Las fechas importadas reemplazan a las existentes. Devuelve (importadas, ignoradas).
+        """
+        imported = skipped = 0
+        with self._lock:
+            by_date = dict(zip(self.dates, self.prices))
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                ordinal = parse_date(row.get(date_column, ''))
+                price = try_parse_amount(row.get(price_column, ''))
+                if ordinal is None or price is None or price <= 0:
+                    skipped += 1
+                    continue
+                by_date[ordinal] = price
+                imported += 1
+        with self._lock:
+            self._set_sorted(by_date)
+            self._rewrite()
+        return imported, skipped
+
+    def compact(self):
+        """Reescribe el archivo con un solo registro por fecha, en orden."""
+        with self._lock:
+            self._rewrite()
+
+    def _rewrite(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(b''.join(_RECORD.pack(d, p) for d, p in zip(self.dates, self.prices)))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not rewrite rate history '{self.path}': {e}")
+
+
+def main(argv=None):
+    """Línea de comandos: importa un historial de tasas desde CSV al historial de la app."""
+    import argparse
+    parser = argparse.ArgumentParser(prog='main.py import-history',
+                                     description="Importa tasas BCV históricas desde un CSV (fecha, precio).")
+    parser.add_argument('csv_path', help="Archivo CSV con el historial")
+    parser.add_argument('--date-column', default='date', help="Columna con la fecha (por defecto: date)")
+    parser.add_argument('--price-column', default='price', help="Columna con la tasa (por defecto: price)")
+    parser.add_argument('--history', default=None, help="Archivo de historial (por defecto, el de la app)")
+    args = parser.parse_args(argv)
+
+    history = RateHistory(args.history or default_history_path()).load()
+    try:
+        imported, skipped = history.import_csv(args.csv_path, args.date_column, args.price_column)
+    except OSError as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Importadas: {imported} | Ignoradas: {skipped} | Fechas en el historial: {len(history)}")
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
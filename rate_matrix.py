@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Tasas entre varias monedas a partir de los precios oficiales en bolívares, sin dependencias de Kivy.
+# Las tasas cruzadas se precalculan una vez por descarga; convertir entre dos monedas es una búsqueda.
+from conversion import USD_TO_VES, convert_cents_batch, convert_money
+from money import Rate
+
+VES = 'VES'
+USD = 'USD'
+# Monedas extranjeras que se reconocen en las respuestas de las fuentes, en el orden del selector
+CURRENCIES = ('USD', 'EUR', 'CNY', 'TRY', 'RUB', 'COP')
+
+
+class RateMatrix:
+    """
+    Tabla densa de tasas cruzadas entre VES y cada moneda con precio publicado.
+    Se construye con los bolívares por unidad de cada moneda ({'USD': 36.5, 'EUR': 39.8, ...});
+    table[i][j] son las unidades de la moneda j que vale una unidad de la moneda i.
+    Es inmutable: cada descarga crea una matriz nueva, así que se puede leer desde cualquier hilo.
+    """
+
+    def __init__(self, ves_prices=None):
+        prices = {VES: 1.0}
+        for currency in CURRENCIES:
+            price = (ves_prices or {}).get(currency)
+            if price is not None and price > 0:
+                prices[currency] = float(price)
+        self.prices = prices # Bolívares por unidad de cada moneda (VES = 1)
+        self.currencies = tuple(prices)
+        self.index = {currency: i for i, currency in enumerate(self.currencies)}
+        values = [prices[currency] for currency in self.currencies]
+        self.table = [[source / target for target in values] for source in values]
+        self._exact = {currency: Rate.of(price) for currency, price in prices.items()} # Para convertir sin redondeos
+
+    def __contains__(self, currency):
+        return currency in self.index
+
+    def foreign_currencies(self):
+        """Monedas distintas de VES con tasa disponible, en el orden de CURRENCIES."""
+        return self.currencies[1:]
+
+    def rate(self, source, target):
+        """Unidades de `target` por unidad de `source`; 0 si alguna de las dos no tiene tasa."""
+        i = self.index.get(source)
+        j = self.index.get(target)
+        if i is None or j is None:
+            return 0
+        return self.table[i][j]
+
+    def convert_money(self, amount, source, target):
+        """Convierte un monto entre dos monedas cualesquiera y devuelve un Money exacto (ver conversion.convert_money)."""
+        return convert_money(amount, self._checked_rate(source, target), USD_TO_VES)
+
+    def convert_cents_batch(self, amounts, source, target):
+        """Versión por lotes de convert_money: céntimos enteros de cada monto (ver conversion.convert_cents_batch)."""
+        cents, _ = convert_cents_batch(amounts, self._checked_rate(source, target), USD_TO_VES)
+        return cents
+
+    def _checked_rate(self, source, target):
+        """Tasa cruzada exacta (fracción de los dos precios en bolívares), sin pasar por el float de la tabla."""
+        if source not in self._exact or target not in self._exact:
+            raise ValueError(f"No hay tasa disponible para {source} -> {target}")
+        return self._exact[source].cross(self._exact[target])
@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+# Modo servicio sin interfaz ("python main.py --serve"): expone la tasa y la conversión por HTTP/JSON
+# para que otras herramientas locales no consulten cada una la API del BCV. Sin dependencias de Kivy.
+#
+#   GET  /rate?currency=EUR                   tasa de una moneda (bolívares por unidad), fuente y antigüedad
+#   GET  /rates                               todas las tasas publicadas
+#   GET  /convert?amount=10&from=USD&to=VES   un monto (opcional &date=DD/MM/AAAA, solo USD <-> VES)
+#   POST /convert/batch                       {"amounts": [...], "from": "USD", "to": "VES"}
+#   (los montos convertidos se devuelven como texto decimal exacto, p. ej. "36.68")
+#   GET  /health, GET /stats
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from urllib.parse import parse_qsl, urlsplit
+
+from circuit_breaker import CircuitBreakers, CIRCUIT_STATE_FILENAME
+from conversion import USD_TO_VES, VES_TO_USD, convert_money
+from fetch_loop import FetchLoop
+from http_client import HttpClient
+from money import format_cents
+from parsing import try_parse_decimal
+from rate_board import RateBoard, RATE_BOARD_FILENAME, DEFAULT_POLL_INTERVAL
+from rate_cache import RateCache, default_cache_path, DEFAULT_CACHE_TTL, DEFAULT_MAX_STALE_AGE
+from rate_history import RateHistory, default_history_path, parse_date
+from rate_matrix import RateMatrix, USD, VES
+from rate_sources import ProviderPool, default_providers
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_REFRESH_INTERVAL = 900 # Segundos entre refrescos de la tasa (0 = solo al arrancar si el caché no sirve)
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1 << 20 # 1 MiB por petición de conversión por lotes
+MAX_BATCH_AMOUNTS = 100_000
+KEEP_ALIVE_TIMEOUT = 30.0 # Segundos que se mantiene abierta una conexión sin peticiones
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 431: 'Request Header Fields Too Large', 503: 'Service Unavailable'}
+
+
+class HttpError(Exception):
+    """Error de la petición que se devuelve al cliente como {"error": ...} con ese código."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RateSnapshot:
+    """
+    Tasas vigentes del servicio: matriz de tasas cruzadas, fuente y hora de descarga.
+    Es inmutable y se reemplaza entera en cada refresco, así los manejadores la leen sin locks.
+    """
+
+    def __init__(self, matrix, fetched_at=None, source=''):
+        self.matrix = matrix
+        self.fetched_at = fetched_at
+        self.source = source
+
+    def describe(self, now=None):
+        """Campos comunes de las respuestas: fuente, hora y antigüedad en segundos."""
+        now = time.time() if now is None else now
+        age = None if self.fetched_at is None else round(max(0.0, now - self.fetched_at), 1)
+        return {'source': self.source, 'fetched_at': self.fetched_at, 'age': age}
+
+
+class RateService:
+    """
+    Tasas y conversiones compartidas por todos los clientes del servidor.
+    Un único refresco periódico en el bucle de descargas mantiene el caché en disco al día
+    (el mismo que usa la app); las peticiones de los clientes nunca salen a la red.
+    Con `board` (ver rate_board.py) el servicio comparte la tasa con las instancias de la app:
+    si es el escritor la publica tras cada refresco, y si otra instancia ya la descarga, no sale
+    a la red y sirve la que esa instancia publica.
+    """
+
+    def __init__(self, fetch_loop, http, providers, cache, history,
+                 refresh_interval=DEFAULT_REFRESH_INTERVAL, cache_ttl=DEFAULT_CACHE_TTL,
+                 max_stale_age=DEFAULT_MAX_STALE_AGE, board=None):
+        self.fetch_loop = fetch_loop
+        self.http = http
+        self.providers = providers
+        self.cache = cache
+        self.history = history
+        self.refresh_interval = refresh_interval
+        self.cache_ttl = cache_ttl
+        self.max_stale_age = max_stale_age
+        self.board = board
+        self.snapshot = RateSnapshot(RateMatrix())
+        self.counters = {'refreshes': 0, 'refresh_errors': 0, 'unchanged': 0, 'board_reads': 0}
+        self._board_version = 0
+
+    def load(self):
+        """Publica las tasas del caché y prepara la primera petición condicional de su fuente."""
+        if self.cache.load():
+            self._publish_cached()
+            provider = self.providers.get(self.cache.entry['source'])
+            if provider is not None:
+                provider.last_prices = dict(self.cache.entry['prices'])
+                if self.cache.entry['validators']:
+                    self.http.set_validators(provider.url, provider.params, self.cache.entry['validators'])
+        if self.board is not None and self.board.acquire_writer():
+            # Comparte de inmediato la tasa guardada si es más nueva que la publicada
+            entry, record = self.cache.entry, self.board.read()
+            if entry is not None and (record is None or record.fetched_at < entry['fetched_at']):
+                self.board.publish(entry['prices'], entry['fetched_at'], entry['source'])
+        self.poll_board()
+        return self
+
+    def _publish_cached(self):
+        prices = self.cache.usable_prices(self.max_stale_age)
+        entry = self.cache.entry
+        self.snapshot = RateSnapshot(RateMatrix(prices), entry['fetched_at'] if prices else None,
+                                     entry['source'] if prices else '')
+
+    async def refresh(self):
+        """Descarga las tasas (GET condicional, con hedging entre fuentes) y las publica."""
+        if self.board is not None and self.board.enabled and not self.board.acquire_writer():
+            self.poll_board() # Otra instancia descarga la tasa
+            return
+        prices, provider = await self.providers.fetch_hedged(self.fetch_loop.run_blocking, self.http,
+                                                             conditional=True)
+        if provider is None:
+            print("Warning: No rate source returned a valid USD price")
+            return
+        entry = self.cache.entry
+        if entry is not None and entry['prices'] == prices:
+            self.counters['unchanged'] += 1
+            await self.fetch_loop.run_blocking(self._store, entry['prices'], provider, False)
+        else:
+            await self.fetch_loop.run_blocking(self._store, prices, provider, True)
+        self._publish_cached()
+
+    def _store(self, prices, provider, changed):
+        """Guarda las tasas en el caché (y la del dólar en el historial si cambió); corre en el pool de hilos."""
+        self.cache.store(prices[USD], source=provider.name,
+                         validators=self.http.get_validators(provider.url, provider.params), prices=prices)
+        if changed:
+            self.history.append(datetime.date.today(), prices[USD])
+        if self.board is not None:
+            self.board.publish(prices, self.cache.entry['fetched_at'], provider.name)
+
+    def poll_board(self):
+        """Si otra instancia publicó tasas nuevas en la tasa compartida, las sirve (sin red ni JSON)."""
+        if self.board is None or self.board.is_writer or self.board.version() == self._board_version:
+            return
+        record = self.board.read()
+        if record is None:
+            return
+        self._board_version = record.version
+        if time.time() - record.fetched_at <= self.max_stale_age:
+            self.counters['board_reads'] += 1
+            self.snapshot = RateSnapshot(RateMatrix(record.prices), record.fetched_at, record.source)
+
+    async def watch_board(self, interval=DEFAULT_POLL_INTERVAL):
+        """Comprueba cada `interval` segundos el contador de versión de la tasa compartida."""
+        while self.board is not None and self.board.enabled:
+            self.poll_board()
+            await asyncio.sleep(interval)
+
+    async def refresh_forever(self):
+        """
+        Refresca al arrancar si el caché no está fresco y luego cada refresh_interval segundos.
+        Los errores se registran y se sigue sirviendo la última tasa utilizable.
+        """
+        delay = 0 if not self.cache.is_fresh(self.cache_ttl) else self._until_next_refresh()
+        while True:
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
+            self.counters['refreshes'] += 1
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters['refresh_errors'] += 1
+                print(f"Error: Could not refresh BCV rates: {e}")
+                self._publish_cached() # La tasa guardada puede haber superado max_stale_age
+            delay = self.refresh_interval if self.refresh_interval > 0 else None
+
+    def _until_next_refresh(self):
+        if self.refresh_interval <= 0:
+            return None
+        return max(0.0, self.refresh_interval - (self.cache.age() or 0.0))
+
+    # Respuestas de la API
+
+    def rate(self, query):
+        snapshot = self.snapshot
+        currency = query.get('currency', USD).upper()
+        rate = snapshot.matrix.rate(currency, VES)
+        if rate <= 0:
+            raise HttpError(503, f"No hay tasa disponible para {currency}")
+        return dict(currency=currency, rate=rate, **snapshot.describe())
+
+    def rates(self, query):
+        snapshot = self.snapshot
+        prices = {currency: price for currency, price in snapshot.matrix.prices.items() if currency != VES}
+        if not prices:
+            raise HttpError(503, "No hay tasas disponibles")
+        return dict(rates=prices, **snapshot.describe())
+
+    @staticmethod
+    def _pair_rate(snapshot, source, target):
+        """Unidades de `target` por unidad de `source` con las tasas de hoy."""
+        rate = snapshot.matrix.rate(source, target)
+        if rate <= 0:
+            raise HttpError(503, f"No hay tasa disponible para {source} -> {target}")
+        return rate
+
+    def _price_on(self, date_text, source, target):
+        """Bolívares por dólar vigentes en una fecha; el historial solo guarda el dólar."""
+        if {source, target} != {USD, VES}:
+            raise HttpError(400, "Las conversiones con fecha solo están disponibles entre USD y VES")
+        if parse_date(date_text) is None:
+            raise HttpError(400, f"Fecha inválida: {date_text}")
+        price = self.history.rate_on(date_text)
+        if price <= 0:
+            raise HttpError(503, f"No hay tasa registrada para {date_text}")
+        return price
+
+    def convert(self, query):
+        snapshot = self.snapshot
+        source, target = query.get('from', USD).upper(), query.get('to', VES).upper()
+        amount = try_parse_decimal(query.get('amount', ''))
+        if amount is None:
+            raise HttpError(400, "Monto inválido")
+        date_text = query.get('date')
+        if date_text:
+            price = self._price_on(date_text, source, target)
+            rate = price if source == USD else 1 / price
+            result = convert_money(amount, price, USD_TO_VES if source == USD else VES_TO_USD)
+        else:
+            rate = self._pair_rate(snapshot, source, target)
+            result = snapshot.matrix.convert_money(amount, source, target) # Con la tasa cruzada exacta
+        # Monto y resultado van como texto decimal exacto ("36.68"), no como float
+        return dict({'amount': str(amount), 'from': source, 'to': target, 'rate': rate, 'result': str(result),
+                     'date': date_text or None}, **snapshot.describe())
+
+    def convert_batch(self, body):
+        snapshot = self.snapshot
+        if not isinstance(body, dict) or not isinstance(body.get('amounts'), list):
+            raise HttpError(400, 'Se esperaba {"amounts": [...], "from": "USD", "to": "VES"}')
+        if len(body['amounts']) > MAX_BATCH_AMOUNTS:
+            raise HttpError(413, f"Como máximo {MAX_BATCH_AMOUNTS} montos por petición")
+        source, target = str(body.get('from', USD)).upper(), str(body.get('to', VES)).upper()
+        rate = self._pair_rate(snapshot, source, target)
+        # Los montos inválidos se devuelven como null sin invalidar el resto del lote
+        amounts = [try_parse_decimal(amount) for amount in body['amounts']]
+        valid = [amount for amount in amounts if amount is not None]
+        converted = iter(snapshot.matrix.convert_cents_batch(valid, source, target) if valid else ())
+        results = [None if amount is None else format_cents(int(next(converted))) for amount in amounts]
+        return dict({'from': source, 'to': target, 'rate': rate, 'results': results,
+                     'invalid': len(amounts) - len(valid)}, **snapshot.describe())
+
+    def stats(self):
+        board = None
+        if self.board is not None and self.board.enabled:
+            board = {'writer': self.board.is_writer, 'version': self.board.version()}
+        return {'service': dict(self.counters), 'http': self.http.stats(), 'sources': self.providers.stats(),
+                'board': board}
+
+
+class RateServer:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio: conexiones persistentes (keep-alive) y pipelining,
+    sin un hilo por cliente. Corre en el mismo bucle que los refrescos de la tasa.
+    """
+
+    def __init__(self, service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.errors = 0
+        self._server = None
+        self._routes = {
+            ('GET', '/rate'): service.rate,
+            ('GET', '/rates'): service.rates,
+            ('GET', '/convert'): service.convert,
+            ('POST', '/convert/batch'): service.convert_batch,
+            ('GET', '/health'): self.health,
+            ('GET', '/stats'): self.stats,
+        }
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1] # Con port=0 el sistema elige uno libre
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def health(self, query):
+        snapshot = self.service.snapshot
+        return dict(ok=USD in snapshot.matrix, currencies=list(snapshot.matrix.foreign_currencies()),
+                    **snapshot.describe())
+
+    def stats(self, query):
+        return dict(self.service.stats(), server={'requests': self.requests, 'errors': self.errors})
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    writer.write(self._response(431, {'error': _REASONS[431]}, keep_alive=False))
+                    return
+                keep_alive = await self._handle_request(head, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, head, reader, writer):
+        """Atiende una petición ya leída hasta el fin de las cabeceras. Devuelve si la conexión sigue abierta."""
+        self.requests += 1
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            self.errors += 1
+            writer.write(self._response(400, {'error': "Línea de petición inválida"}, keep_alive=False))
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.errors += 1
+            writer.write(self._response(413 if length > 0 else 400, {'error': "Content-Length inválido"},
+                                        keep_alive=False))
+            return False
+        body = await reader.readexactly(length) if length else b''
+
+        status, payload = self._dispatch(method, target, body)
+        if status != 200:
+            self.errors += 1
+        writer.write(self._response(status, payload, keep_alive))
+        return keep_alive
+
+    def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self._routes):
+                return 405, {'error': _REASONS[405]}
+            return 404, {'error': _REASONS[404]}
+        try:
+            if method == 'POST':
+                try:
+                    argument = json.loads(body or b'null', parse_float=Decimal) # Montos exactos, sin pasar por float
+                except ValueError:
+                    raise HttpError(400, "JSON inválido")
+            else:
+                argument = dict(parse_qsl(url.query))
+            return 200, handler(argument)
+        except HttpError as e:
+            return e.status, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+    @staticmethod
+    def _response(status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode('latin-1') + body
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='main.py --serve',
+                                     description="Sirve la tasa BCV y las conversiones por HTTP/JSON a las herramientas locales.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Dirección en la que escuchar (por defecto: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Puerto (por defecto: {DEFAULT_PORT}; 0 = uno libre)")
+    parser.add_argument('--refresh-interval', type=float, default=DEFAULT_REFRESH_INTERVAL,
+                        help="Segundos entre refrescos de la tasa (0 = solo al arrancar si el caché no está fresco)")
+    parser.add_argument('--cache', help="Archivo del caché de tasas (por defecto, el de la app)")
+    parser.add_argument('--no-board', action='store_true',
+                        help="No compartir la tasa con las instancias de la app (el servicio la descarga siempre)")
+    parser.add_argument('--max-stale-age', type=float, default=DEFAULT_MAX_STALE_AGE,
+                        help="Segundos durante los que se sigue sirviendo la última tasa si falla la red")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    cache_path = args.cache or default_cache_path()
+    breakers = CircuitBreakers(os.path.join(os.path.dirname(os.path.abspath(cache_path)), CIRCUIT_STATE_FILENAME)).load()
+    http = HttpClient(breakers=breakers)
+    board = None
+    if not args.no_board:
+        board = RateBoard(os.path.join(os.path.dirname(os.path.abspath(cache_path)), RATE_BOARD_FILENAME)).open()
+    fetch_loop = FetchLoop(deliver=lambda callback, result, error: callback(result, error)).start()
+    service = RateService(fetch_loop, http, ProviderPool(default_providers()), RateCache(cache_path),
+                          RateHistory(default_history_path()).load(),
+                          refresh_interval=args.refresh_interval, max_stale_age=args.max_stale_age,
+                          board=board).load()
+    server = RateServer(service, args.host, args.port)
+
+    async def run():
+        await server.start()
+        print(f"Sirviendo en http://{server.host}:{server.port} (tasas: {service.snapshot.matrix.prices})",
+              file=sys.stderr, flush=True)
+        await asyncio.gather(service.refresh_forever(), service.watch_board())
+        await asyncio.Event().wait() # Sin refrescos periódicos el servidor sigue atendiendo
+
+    try:
+        fetch_loop.submit(run()).result()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        fetch_loop.stop()
+        http.close()
+        if board is not None:
+            board.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
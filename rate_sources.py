@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+# Obtención de la tasa BCV desde varias APIs, sin dependencias de Kivy.
+# La usan tanto la app como la conversión masiva por línea de comandos.
+import threading
+import time
+from collections import deque
+
+from http_client import NOT_MODIFIED
+from parsing import try_parse_amount
+from rate_matrix import CURRENCIES, USD
+
+# Página del BCV en pydolarve: una sola respuesta con todas las monedas que publica el BCV
+# {"monitors": {"usd": {"price": ...}, "eur": {...}, ...}}
+BCV_API_URL = 'https://pydolarve.org/api/v2/dollar'
+BCV_MONITOR = 'bcv'
+BCV_SOURCE = f"pydolarve.org/{BCV_MONITOR}"
+BCV_PARAMS = {'page': BCV_MONITOR}
+
+# Fuente alternativa de las tasas oficiales (BCV):
+# [{"fuente": "oficial", "moneda": "USD", "promedio": 36.5, ...}, {"moneda": "EUR", ...}, ...]
+DOLARAPI_URL = 'https://ve.dolarapi.com/v1/cotizaciones'
+DOLARAPI_SOURCE = 've.dolarapi.com/oficial'
+
+# Segundos que se espera a la fuente preferida antes de lanzar en paralelo la siguiente
+DEFAULT_HEDGE_DELAY = 1.0
+# Cantidad de intentos recientes por fuente con los que se calculan latencias y tasa de errores
+STATS_WINDOW = 50
+# Una fuente con más de esta proporción de errores recientes pasa al final de la lista
+MAX_HEALTHY_ERROR_RATE = 0.5
+
+
+def clean_price(raw_price):
+    """
+    Convierte el precio devuelto por la API (número o texto en formato venezolano
+    o internacional) en float. Devuelve 0.0 si el formato no es reconocible.
+    """
+    price = try_parse_amount(raw_price)
+    print(f"DEBUG: BCV raw price: {raw_price!r}, Converted price: {price}")
+    return price if price is not None else 0.0
+
+
+def parse_pydolarve(data):
+    """
+    Precios en bolívares por moneda de una respuesta de pydolarve: la página completa
+    ({"monitors": {"usd": {"price": ...}, ...}}) o un solo monitor ({"price": ...}, el dólar).
+    """
+    if not isinstance(data, dict):
+        return {}
+    monitors = data.get('monitors')
+    if isinstance(monitors, dict):
+        prices = {}
+        for currency in CURRENCIES:
+            monitor = monitors.get(currency.lower())
+            if isinstance(monitor, dict) and monitor.get('price') is not None:
+                prices[currency] = clean_price(monitor['price'])
+        return prices
+    if data.get('price') is not None:
+        return {USD: clean_price(data['price'])}
+    return {}
+
+
+def parse_dolarapi(data):
+    """
+    Precios en bolívares por moneda de una respuesta de dolarapi: la lista de cotizaciones
+    (solo las de fuente "oficial") o una sola cotización del dólar.
+    """
+    if isinstance(data, dict):
+        data = [dict(data, moneda=data.get('moneda', USD))]
+    if not isinstance(data, list):
+        return {}
+    prices = {}
+    for quote in data:
+        if not isinstance(quote, dict) or quote.get('fuente', 'oficial') != 'oficial':
+            continue
+        currency = str(quote.get('moneda', '')).upper()
+        if currency in CURRENCIES and quote.get('promedio') is not None:
+            prices[currency] = clean_price(quote['promedio'])
+    return prices
+
+
+def is_valid(prices):
+    """Una respuesta sirve si trae al menos la tasa del dólar."""
+    return prices.get(USD, 0) > 0
+
+
+class RateProvider:
+    """
+    Una API que publica las tasas BCV: URL, parámetros y función que extrae de su JSON
+    los bolívares por unidad de cada moneda. Todas las monedas llegan en una sola petición.
+    Recuerda los últimos precios leídos para poder responder cuando el servidor indica
+    que el recurso no cambió (304).
+    """
+
+    def __init__(self, name, url, params=None, parse=parse_pydolarve):
+        self.name = name
+        self.url = url
+        self.params = params
+        self.parse = parse
+        self.last_prices = None
+
+    def fetch(self, http, conditional=False):
+        """
+        Pide las tasas usando el cliente HTTP compartido.
+        Devuelve {moneda: bolívares por unidad} con las monedas válidas de la respuesta (vacío si no hay ninguna).
+        Con conditional=True hace un GET condicional; si las tasas no cambiaron devuelve los últimos
+        precios conocidos sin volver a leer la respuesta.
+        Los errores de red o de JSON se propagan como excepciones de requests.
+        """
+        print(f"DEBUG: Attempting to fetch rates from {self.name}: {self.url}")
+        if conditional and self.last_prices:
+            data = http.get_json_if_changed(self.url, params=self.params)
+            if data is NOT_MODIFIED:
+                print(f"DEBUG: Rates from {self.name} not modified since last fetch")
+                return dict(self.last_prices)
+        else:
+            data = http.get_json(self.url, params=self.params)
+        print(f"DEBUG: Raw API response from {self.name}: {data}")
+
+        prices = {currency: price for currency, price in self.parse(data).items() if price > 0}
+        if is_valid(prices):
+            self.last_prices = prices
+        else:
+            print(f"The response from {self.name} does not contain a valid USD price: {data}")
+        return prices
+
+
+def default_providers():
+    """Fuentes de las tasas BCV en orden de preferencia inicial."""
+    return [
+        RateProvider(BCV_SOURCE, BCV_API_URL, BCV_PARAMS, parse_pydolarve),
+        RateProvider(DOLARAPI_SOURCE, DOLARAPI_URL, None, parse_dolarapi),
+    ]
+
+
+class ProviderPool:
+    """
+    Varias fuentes de la tasa con estadísticas por fuente (latencia p50/p95 y tasa de errores
+    de los últimos intentos). La fuente preferida es la más rápida entre las sanas, así que el
+    orden cambia solo si una fuente se vuelve lenta o empieza a fallar.
+    Los intentos se registran desde los hilos del pool de descargas, por eso usa un lock.
+    """
+
+    def __init__(self, providers, hedge_delay=DEFAULT_HEDGE_DELAY):
+        self.providers = list(providers)
+        self.hedge_delay = hedge_delay
+        self._lock = threading.Lock()
+        # nombre -> intentos recientes: (segundos, correcto)
+        self._attempts = {p.name: deque(maxlen=STATS_WINDOW) for p in self.providers}
+
+    def get(self, name):
+        """Fuente con ese nombre, o None."""
+        return next((p for p in self.providers if p.name == name), None)
+
+    def _record(self, provider, elapsed, ok):
+        with self._lock:
+            self._attempts[provider.name].append((elapsed, ok))
+
+    def _summary(self, name):
+        """(tasa de errores, p50, p95) de los intentos recientes; latencias solo de los correctos."""
+        attempts = list(self._attempts[name])
+        if not attempts:
+            return 0.0, None, None
+        errors = sum(1 for _, ok in attempts if not ok)
+        latencies = sorted(elapsed for elapsed, ok in attempts if ok)
+        if not latencies:
+            return errors / len(attempts), None, None
+        p50 = latencies[(len(latencies) - 1) // 2]
+        p95 = latencies[max(0, int(round(len(latencies) * 0.95)) - 1)]
+        return errors / len(attempts), p50, p95
+
+    def ranked(self):
+        """
+        Fuentes en orden de preferencia: primero las sanas, de menor a mayor latencia p50.
+        Las que aún no tienen mediciones conservan su orden inicial tras las ya medidas.
+        """
+        with self._lock:
+            summaries = {p.name: self._summary(p.name) for p in self.providers}
+
+        def key(item):
+            index, provider = item
+            error_rate, p50, _ = summaries[provider.name]
+            return (error_rate > MAX_HEALTHY_ERROR_RATE, p50 is None, p50 or 0.0, index)
+        return [provider for _, provider in sorted(enumerate(self.providers), key=key)]
+
+    def attempt(self, provider, http, conditional=False):
+        """
+        Pide las tasas a una fuente y registra la latencia y si respondió un precio válido.
+        Es bloqueante: la app la ejecuta en el pool de hilos del bucle de descargas.
+        """
+        start = time.perf_counter()
+        try:
+            prices = provider.fetch(http, conditional)
+        except Exception:
+            self._record(provider, time.perf_counter() - start, False)
+            raise
+        self._record(provider, time.perf_counter() - start, is_valid(prices))
+        return prices
+
+    async def fetch_hedged(self, run_blocking, http, conditional=False):
+        """
+        Pide la tasa a la fuente preferida; si no responde en hedge_delay segundos lanza en paralelo
+        la siguiente (y así sucesivamente), y si una falla pasa de inmediato a la siguiente.
+        Devuelve (precios, fuente) de la primera respuesta válida (ver is_valid) y cancela las demás.
+        Si ninguna es válida devuelve ({}, None), o propaga el último error si todas fallaron.
+        run_blocking: corrutina que ejecuta una función bloqueante en un hilo (FetchLoop.run_blocking).
+        """
+        import asyncio
+
+        queue = self.ranked()
+        running = {} # tarea -> fuente
+        last_error = None
+        any_answered = False
+
+        def launch_next():
+            provider = queue.pop(0)
+            task = asyncio.ensure_future(run_blocking(self.attempt, provider, http, conditional))
+            running[task] = provider
+
+        launch_next()
+        try:
+            while running:
+                done, _ = await asyncio.wait(list(running), timeout=self.hedge_delay if queue else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    print(f"DEBUG: No rate after {self.hedge_delay}s, also asking {queue[0].name}")
+                    launch_next()
+                    continue
+                for task in done:
+                    provider = running.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        print(f"Warning: Rate source {provider.name} failed: {last_error}")
+                    elif is_valid(task.result()):
+                        return task.result(), provider
+                    else:
+                        any_answered = True
+                    if queue:
+                        launch_next()
+        finally:
+            for task in running:
+                task.cancel() # El hilo termina por su timeout; su resultado solo se usa para las estadísticas
+        if last_error is not None and not any_answered:
+            raise last_error
+        return {}, None
+
+    def fetch_failover(self, http):
+        """
+        Versión secuencial para la línea de comandos: prueba las fuentes en orden de preferencia
+        hasta obtener una respuesta válida. Devuelve (precios, fuente) o propaga el último error.
+        """
+        last_error = None
+        for provider in self.ranked():
+            try:
+                prices = self.attempt(provider, http)
+            except Exception as e:
+                print(f"Warning: Rate source {provider.name} failed: {e}")
+                last_error = e
+                continue
+            if is_valid(prices):
+                return prices, provider
+        if last_error is not None:
+            raise last_error
+        return {}, None
+
+    def stats(self):
+        """Por fuente: intentos recientes, tasa de errores y latencias p50/p95 en milisegundos."""
+        with self._lock:
+            result = {}
+            for provider in self.providers:
+                error_rate, p50, p95 = self._summary(provider.name)
+                result[provider.name] = {
+                    'attempts': len(self._attempts[provider.name]),
+                    'error_rate': round(error_rate, 3),
+                    'p50_ms': None if p50 is None else round(p50 * 1000, 1),
+                    'p95_ms': None if p95 is None else round(p95 * 1000, 1),
+                }
+            return result
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Perfil de arranque para "python main.py --profile-startup", sin dependencias de Kivy.
+# Mide cuánto tarda cada import (al estilo de "python -X importtime") y resume las fases del arranque.
+import builtins
+import sys
+import threading
+import time
+
+
+def _resolve_name(name, globals_, level):
+    """Nombre absoluto de un import relativo ("from . import x" dentro de un paquete)."""
+    package = (globals_ or {}).get('__package__') or (globals_ or {}).get('__name__', '').rpartition('.')[0]
+    base = package.rsplit('.', level - 1)[0]
+    return f"{base}.{name}" if name else base
+
+
+class ImportProfiler:
+    """
+    Envuelve builtins.__import__ y registra, para cada módulo que se carga por primera vez,
+    el tiempo propio y el acumulado (incluidos los módulos que importa) en microsegundos.
+    Los submódulos cargados por "from paquete import submódulo" cuentan en el tiempo del paquete,
+    así que los valores son aproximados; basta para ver qué importaciones dominan el arranque.
+    Los imports hechos en otros hilos (p. ej. requests en el bucle de descargas) se marcan con el
+    nombre del hilo: no retrasan la interfaz, pero compiten con ella por el GIL.
+    """
+
+    def __init__(self):
+        self.records = [] # (nombre, propio_us, acumulado_us, profundidad) en orden de finalización
+        self._local = threading.local() # por hilo: tiempo de los hijos de cada import en curso
+        self._original_import = None
+
+    def install(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        full_name = name if level == 0 else _resolve_name(name, globals, level)
+        if full_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        depth = len(stack)
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = (time.perf_counter() - start) * 1e6
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            thread = threading.current_thread()
+            if thread is not threading.main_thread():
+                full_name = f"{full_name} [{thread.name}]"
+            self.records.append((full_name, cumulative - children, cumulative, depth))
+
+    def tree(self, min_us=1000):
+        """
+        Registros en el orden de "-X importtime" (los hijos antes que el padre), omitiendo los
+        que tardaron menos de min_us en total.
+        """
+        return [record for record in self.records if record[2] >= min_us]
+
+    def top(self, count=15):
+        """Los módulos con más tiempo propio."""
+        return sorted(self.records, key=lambda record: record[1], reverse=True)[:count]
+
+
+def format_phases(phases):
+    """Fases del arranque ordenadas, con el instante (ms desde el inicio del proceso) y la duración de cada una."""
+    lines = ["Fases del arranque (ms desde el inicio del proceso):"]
+    previous = 0.0
+    for phase, at in sorted(phases.items(), key=lambda item: item[1]):
+        lines.append(f"  {phase:<20} {at:8.1f}   (+{at - previous:7.1f})")
+        previous = at
+    return "\n".join(lines)
+
+
+def format_imports(profiler, min_us=1000, top=15):
+    """Árbol de imports al estilo de -X importtime y los módulos con más tiempo propio."""
+    lines = [f"Imports (>= {min_us / 1000:.0f} ms acumulados, {len(profiler.records)} módulos cargados):",
+             "  propio [us] | acumulado [us] | módulo"]
+    for name, self_us, cumulative_us, depth in profiler.tree(min_us):
+        lines.append(f"  {self_us:11.0f} | {cumulative_us:14.0f} | {'  ' * depth}{name}")
+    lines.append(f"Los {top} módulos con más tiempo propio:")
+    for name, self_us, cumulative_us, depth in profiler.top(top):
+        lines.append(f"  {self_us / 1000:8.1f} ms  {name}")
+    return "\n".join(lines)
+
+
+def format_report(profiler, phases, min_us=1000, top=15):
+    return format_imports(profiler, min_us, top) + "\n\n" + format_phases(phases)
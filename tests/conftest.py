@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+# Los módulos de la app están en la raíz del repositorio (no es un paquete instalable),
+# igual que en los benchmarks se añade esa carpeta al path.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Conversión masiva de archivos: resultados exactos, totales y el envío del historial a los procesos de trabajo.
+import csv
+import json
+import multiprocessing
+from decimal import Decimal
+
+import pytest
+
+import bulk_convert
+from rate_history import RateHistory
+
+
+class CountingHistory(RateHistory):
+    """RateHistory que cuenta cuántas veces se serializa (se envía a otro proceso)."""
+    pickles = multiprocessing.Value('i', 0)
+
+    def __getstate__(self):
+        with CountingHistory.pickles.get_lock():
+            CountingHistory.pickles.value += 1
+        return super().__getstate__()
+
+
+def _write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['amount', 'fecha'])
+        writer.writerows(rows)
+
+
+def _read_column(path, column):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return [row[column] for row in csv.DictReader(f)]
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = CountingHistory(str(tmp_path / 'history.bin'))
+    for day in range(1, 29):
+        history.append(f"{day:02d}/01/2024", 30.0 + day)
+    return history
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_history_is_sent_once_per_worker(tmp_path, history, workers):
+    source, target = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    _write_csv(source, [[f"{i}.50", f"{i % 28 + 1:02d}/01/2024"] for i in range(200)])
+    CountingHistory.pickles.value = 0
+    stats = bulk_convert.run(str(source), str(target), 0, chunk_rows=10, workers=workers,
+                             date_column='fecha', history=history)
+    assert stats['rows'] == 200 and stats['errors'] == 0
+    # Con un solo proceso no se serializa; con varios, como mucho una vez por proceso de trabajo
+    assert CountingHistory.pickles.value <= (workers if workers > 1 else 0)
+    converted = _read_column(target, 'converted')
+    assert converted[0] == '15.50' # 0.50 USD a la tasa del 01/01/2024 (31)
+    assert converted[27] == '1595.00' # 27.50 USD a la tasa del 28/01/2024 (58)
+
+
+def test_single_and_multi_process_outputs_match(tmp_path, history):
+    source = tmp_path / 'in.csv'
+    _write_csv(source, [[f"{i * 7}.13", f"{i % 28 + 1:02d}/01/2024"] for i in range(120)])
+    outputs = []
+    for workers in (1, 3):
+        target = tmp_path / f"out{workers}.csv"
+        stats = bulk_convert.run(str(source), str(target), 0, chunk_rows=7, workers=workers,
+                                 date_column='fecha', history=history)
+        outputs.append((_read_column(target, 'converted'), stats['total_cents']))
+    assert outputs[0] == outputs[1]
+
+
+def test_amounts_are_rounded_once(tmp_path):
+    source, target = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    _write_csv(source, [['10.005', ''], ['1,005', ''], ['abc', '']])
+    stats = bulk_convert.run(str(source), str(target), 36.5)
+    # 10.005 * 36.5 = 365.1825 y 1.005 * 36.5 = 36.6825 (redondear antes a 10.01 / 1.01 daría 365.37 / 36.87)
+    assert _read_column(target, 'converted') == ['365.18', '36.68', '']
+    assert stats['errors'] == 1 and stats['total_cents'] == 36518 + 3668
+
+    source, target = tmp_path / 'in.jsonl', tmp_path / 'out.jsonl'
+    source.write_text('{"amount": 10.005}\n{"amount": "10,005"}\n', encoding='utf-8')
+    bulk_convert.run(str(source), str(target), 36.5)
+    assert [json.loads(line)['converted'] for line in target.read_text(encoding='utf-8').splitlines()] == \
+        ['365.18', '365.18']
+
+
+def test_jsonl_numbers_keep_all_their_digits(tmp_path):
+    source, target = tmp_path / 'in.jsonl', tmp_path / 'out.jsonl'
+    source.write_text('{"amount": 12345678901234567.89, "meta": {"fee": 0.10, "n": [1, 2.50]}, "ok": true}\n'
+                      '{"amount": null}\nno es json\n', encoding='utf-8')
+    stats = bulk_convert.run(str(source), str(target), 36.5)
+    lines = target.read_text(encoding='utf-8').splitlines()
+    record = json.loads(lines[0], parse_float=Decimal)
+    assert record['amount'] == Decimal('12345678901234567.89')
+    assert record['converted'] == '450617279895061727.99' # 12345678901234567.89 * 36.5 = 450617279895061727.985
+    assert record['meta'] == {'fee': Decimal('0.10'), 'n': [1, Decimal('2.50')]} and record['ok'] is True
+    assert json.loads(lines[1]) == {'amount': None, 'converted': None}
+    assert lines[2] == 'no es json'
+    assert stats['errors'] == 2 and stats['total_cents'] == 45061727989506172799
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Conversión exacta: el monto se toma con su valor exacto y el resultado se redondea una sola vez.
+from decimal import Decimal
+
+import pytest
+
+import money
+from conversion import USD_TO_VES, VES_TO_USD, convert_cents_batch, convert_money
+from money import ROUND_DOWN, ROUND_HALF_EVEN, Money
+
+
+@pytest.fixture
+def without_numpy(monkeypatch):
+    monkeypatch.setattr(money, 'np', None)
+    monkeypatch.setattr(money, '_numpy_checked', True)
+
+
+@pytest.mark.parametrize('amount', [1.005, '1.005', '1,005', Decimal('1.005')])
+def test_amount_is_not_rounded_before_converting(amount):
+    # 1.005 * 36.5 = 36.6825; redondear antes a 1.01 daría 36.87
+    assert convert_money(amount, 36.5) == Money(3668)
+
+
+def test_ten_dollars_and_half_a_cent():
+    # 10.005 * 36.5 = 365.1825; redondear antes a 10.01 daría 365.37
+    assert convert_money(10.005, 36.5) == Money(36518)
+    assert convert_money(10.005, '36,5', rounding=ROUND_DOWN) == Money(36518)
+
+
+def test_ves_to_usd_rounds_once():
+    # 0.1825 / 36.5 = 0.005 exacto; redondear antes a 0.18 daría 0.0049... -> 0.00
+    assert convert_money('0.1825', 36.5, VES_TO_USD) == Money(1)
+    assert convert_money('0.1825', 36.5, VES_TO_USD, ROUND_HALF_EVEN) == Money(0)
+
+
+def test_money_amounts_are_exact_cents():
+    assert convert_money(Money(101), 36.5) == Money(3687)
+
+
+def test_unknown_direction():
+    with pytest.raises(ValueError):
+        convert_money(1, 36.5, 'eur_to_ves')
+
+
+def test_per_item_path_without_numpy(without_numpy):
+    assert money.load_numpy() is None
+    assert convert_cents_batch([1.005, 10.005], 36.5) == ([3668, 36518], None)
+    assert convert_cents_batch(['1,005', 10.005, 1], [36.5, 36.5, float('nan')]) == ([3668, 36518, 0],
+                                                                                     [True, True, False])
+    assert convert_cents_batch(['0.1825'], 36.5, VES_TO_USD) == ([1], None)
+
+
+@pytest.fixture
+def np():
+    return pytest.importorskip('numpy')
+
+
+def test_batch_rounds_once(np):
+    cents, valid = convert_cents_batch([1.005, 10.005, '10,005', Decimal('10.005')], 36.5)
+    assert cents.tolist() == [3668, 36518, 36518, 36518] and valid is None
+    cents, valid = convert_cents_batch(np.array([10.005, 2.5]), [36.5, 0.0])
+    assert cents.tolist()[0] == 36518 and valid.tolist() == [True, False]
+    assert money.cents_batch([1.005, 2.675, -1.005]).tolist() == [101, 268, -101]
+
+
+def test_batch_matches_convert_money(np):
+    import random
+    rng = random.Random(7)
+    amounts = [round(rng.uniform(-10_000, 10_000), rng.choice([0, 1, 2, 3, 4])) for _ in range(2000)]
+    for rate in (36.5, 36.5372, Decimal('0.0271')):
+        for direction in (USD_TO_VES, VES_TO_USD):
+            for rounding in money.ROUNDING_MODES:
+                expected = [convert_money(a, rate, direction, rounding).cents for a in amounts]
+                # Lista con montos de 3 y 4 decimales (camino exacto) y ndarray de solo 2 decimales (camino rápido)
+                assert convert_cents_batch(amounts, rate, direction, rounding)[0].tolist() == expected
+                two = np.round(np.array(amounts), 2)
+                expected = [convert_money(a, rate, direction, rounding).cents for a in two.tolist()]
+                assert convert_cents_batch(two, rate, direction, rounding)[0].tolist() == expected
+
+
+def test_batch_with_large_amounts_stays_exact(np):
+    cents, _ = convert_cents_batch([10 ** 17, '0.005'], 36.5)
+    assert cents.tolist() == [365 * 10 ** 18, 18]
+
+
+def test_scale_batch_half_even_ties(np):
+    cents = np.array([1, 3, 5, -5], dtype=np.int64)
+    assert money.scale_batch(cents, 1, 2, ROUND_HALF_EVEN).tolist() == [0, 2, 2, -2]
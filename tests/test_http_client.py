@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# HttpClient contra un servidor HTTP local (127.0.0.1) que responde lento, falla o repite respuestas.
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+import http_client # noqa: E402
+from http_client import NOT_MODIFIED, HttpClient # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive: permite comprobar que se reutiliza la conexión
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.client_ports.append(self.client_address[1])
+            hits = server.hits[self.path]
+        if self.path == '/slow':
+            threading.Event().wait(0.5) # No time.sleep: los tests sustituyen el de http_client
+            self._send(200, {'ok': True})
+        elif self.path == '/fail':
+            self._send(500, {'error': 'boom'})
+        elif self.path == '/flaky':
+            # Dos 503 (el segundo con Retry-After) y después la respuesta buena
+            if hits <= 2:
+                self._send(503, {'error': 'busy'}, {'Retry-After': '0.2'} if hits == 2 else None)
+            else:
+                self._send(200, {'hits': hits})
+        elif self.path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self._send(304, None, {'ETag': '"v1"'})
+            else:
+                self._send(200, {'price': 36.5}, {'ETag': '"v1"'})
+        else:
+            self._send(200, {'path': self.path})
+
+    def _send(self, status, payload, headers=None):
+        body = b'' if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.hits = {}
+    httpd.client_ports = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Esperas de backoff pedidas por el cliente (sin dormir), con el jitter en su valor máximo."""
+    delays = []
+    monkeypatch.setattr(http_client.time, 'sleep', delays.append)
+    monkeypatch.setattr(http_client.random, 'uniform', lambda low, high: high)
+    return delays
+
+
+def test_read_timeout_is_retried_then_raised(server, sleeps):
+    client = HttpClient(connect_timeout=1.0, read_timeout=0.1, retries=1)
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get(server.url + '/slow')
+    stats = client.stats()[server.url[len('http://'):]]
+    assert stats['retried'] == 1 and stats['network_error'] == 1
+    assert server.hits['/slow'] == 2
+    assert sleeps == [0.5]
+    client.close()
+
+
+def test_retries_with_exponential_backoff_and_retry_after(server, sleeps):
+    client = HttpClient(retries=2, backoff_base=0.05, backoff_max=1.0)
+    assert client.get_json(server.url + '/flaky') == {'hits': 3}
+    # Intento 0: base * 2^0; intento 1: base * 2^1 = 0.1, pero Retry-After pide 0.2
+    assert sleeps == [0.05, 0.2]
+    stats = client.stats()[server.url[len('http://'):]]
+    assert stats['retried'] == 2 and stats['ok'] == 1
+    client.close()
+
+
+def test_backoff_is_capped(sleeps):
+    client = HttpClient(backoff_base=1.0, backoff_max=3.0)
+    for attempt in range(5):
+        client._sleep_backoff(attempt, retry_after='60')
+    assert sleeps == [3.0] * 5
+
+
+def test_server_errors_raise_after_retries(server, sleeps):
+    client = HttpClient(retries=2, backoff_base=0.01)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(server.url + '/fail')
+    assert server.hits['/fail'] == 3
+    assert len(sleeps) == 2
+    client.close()
+
+
+def test_connection_is_reused_between_requests(server):
+    client = HttpClient(retries=0)
+    for i in range(5):
+        assert client.get_json(f"{server.url}/item/{i}") == {'path': f"/item/{i}"}
+    assert len(set(server.client_ports)) == 1 # Una sola conexión TCP para las cinco peticiones
+    client.close()
+
+
+def test_conditional_get_returns_not_modified(server):
+    client = HttpClient(retries=0)
+    assert client.get_json_if_changed(server.url + '/etag') == {'price': 36.5}
+    assert client.get_json_if_changed(server.url + '/etag') is NOT_MODIFIED
+    assert client.get_validators(server.url + '/etag')['etag'] == '"v1"'
+    stats = client.stats()[server.url[len('http://'):]]
+    assert stats['ok'] == 1 and stats['not_modified'] == 1
+    client.close()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Pruebas de propiedades de parse_amount / parse_decimal con entradas aleatorias (semilla fija,
+# para que un fallo se pueda reproducir) más ejemplos conocidos.
+import math
+import random
+from decimal import Decimal, InvalidOperation
+
+import pytest
+
+from parsing import _fast_path_allowed, _normalize, _parse_formatted, parse_amount, parse_decimal, try_parse_amount
+
+SEED = 20240521
+CASES = 20_000
+# Alfabeto del fuzz: lo que aparece en montos reales más lo que float()/Decimal() toleran y el formato no
+_ALPHABET = list('0123456789') * 4 + list('.,_eE+- ()$') + [' ', ' ', '\t', '٣', '１']
+_WORDS = ['inf', 'nan', 'Infinity', 'sNaN', 'Bs.', 'Bs', 'VES', 'USD', 'bs.s']
+
+
+def _random_text(rng):
+    parts = []
+    for _ in range(rng.randint(1, 12)):
+        parts.append(rng.choice(_WORDS) if rng.random() < 0.03 else rng.choice(_ALPHABET))
+    return ''.join(parts)
+
+
+def _formatted(rng, value, decimal_sep, thousands_sep):
+    """Escribe un Decimal con dos decimales y separadores de miles, como lo haría una persona."""
+    sign = '-' if value < 0 else ''
+    whole, _, cents = f"{abs(value):.2f}".partition('.')
+    groups = []
+    while len(whole) > 3:
+        whole, group = whole[:-3], whole[-3:]
+        groups.insert(0, group)
+    groups.insert(0, whole)
+    text = sign + thousands_sep.join(groups) + decimal_sep + cents
+    return rng.choice(['{}', '$ {}', 'Bs. {}', '{} USD']).format(text)
+
+
+@pytest.fixture(scope='module')
+def fuzz_inputs():
+    rng = random.Random(SEED)
+    return [_random_text(rng) for _ in range(CASES)]
+
+
+def _outcome(func, *args):
+    """Resultado de func o el tipo de excepción, para comparar dos caminos de lectura."""
+    try:
+        value = func(*args)
+    except (ValueError, InvalidOperation, IndexError):
+        return 'error'
+    if isinstance(value, Decimal):
+        return 'nan' if value.is_nan() else value
+    return 'nan' if value != value else value
+
+
+def test_float_fast_path_agrees_with_general_path(fuzz_inputs):
+    checked = 0
+    for text in fuzz_inputs:
+        if not _fast_path_allowed(text, None):
+            continue
+        fast = _outcome(float, text)
+        if fast == 'error':
+            continue
+        checked += 1
+        # Todo lo que acepta el camino rápido lo acepta el general con el mismo valor (o ambos lo rechazan por no finito)
+        general = _outcome(_parse_formatted, text, None)
+        if isinstance(fast, float) and math.isfinite(fast):
+            assert general == fast, text
+        else:
+            assert general == 'error' or not math.isfinite(general), text
+    assert checked > 100
+
+
+def test_decimal_fast_path_agrees_with_normalize(fuzz_inputs):
+    for text in fuzz_inputs:
+        if not _fast_path_allowed(text, None):
+            continue
+        fast = _outcome(lambda t: Decimal(t.strip()), text)
+        if fast in ('error', 'nan') or not fast.is_finite():
+            continue
+        negative, normalized = _normalize(text, None)
+        assert (-Decimal(normalized) if negative else Decimal(normalized)) == fast, text
+
+
+def test_underscore_is_always_rejected(fuzz_inputs):
+    for text in fuzz_inputs + ['1_000', '1_000.50', '-1_0', '1_0e3', '$ 1_000']:
+        if '_' in text:
+            assert try_parse_amount(text) is None, text
+            with pytest.raises(ValueError):
+                parse_decimal(text)
+
+
+def test_parse_decimal_accepts_what_parse_amount_accepts(fuzz_inputs):
+    for text in fuzz_inputs:
+        amount = _outcome(parse_amount, text)
+        exact = _outcome(parse_decimal, text)
+        if amount != 'error' and exact != 'error':
+            assert float(exact) == amount, text
+        elif amount != 'error':
+            assert amount == 0.0, text # Solo "1e-500" y similares: parse_amount los lleva a cero
+        elif exact != 'error':
+            assert not math.isfinite(float(exact)), text # Solo el Decimal exacto representa "1e300"
+    assert parse_amount('1e-500') == 0.0
+    with pytest.raises(ValueError):
+        parse_decimal('1e-500') # Exponente fuera de rango: no se lleva a una fracción de enteros enorme
+
+
+def test_accepted_results_are_finite(fuzz_inputs):
+    for text in fuzz_inputs:
+        value = try_parse_amount(text)
+        assert value is None or math.isfinite(value), text
+
+
+@pytest.mark.parametrize('decimal_sep,thousands_sep', [(',', '.'), ('.', ','), (',', ' '), ('.', ' ')])
+def test_formatted_amounts_round_trip(decimal_sep, thousands_sep):
+    rng = random.Random(SEED)
+    for _ in range(2000):
+        value = Decimal(rng.randint(-10 ** 12, 10 ** 12)) / 100
+        text = _formatted(rng, value, decimal_sep, thousands_sep)
+        assert parse_decimal(text) == value, text
+        assert parse_amount(text) == float(value), text
+
+
+def test_accounting_parentheses_negate(fuzz_inputs):
+    for text in fuzz_inputs:
+        value = try_parse_amount(text)
+        if value is None or text.strip().startswith('('):
+            continue
+        assert try_parse_amount(f"({text.strip()})") == -value, text
+
+
+@pytest.mark.parametrize('text,expected', [
+    ('36,5372', 36.5372),
+    ('36.5372', 36.5372),
+    ('1.234.567,89', 1234567.89),
+    ('1,234,567.89', 1234567.89),
+    ('1 234,5', 1234.5),
+    ('1.07.62', 107.62),
+    ('(1.234,56)', -1234.56),
+    ('Bs. 1.234,56', 1234.56),
+    ('12 USD', 12.0),
+    ('3.65e-1', 0.365),
+    ('+3', 3.0),
+])
+def test_known_formats(text, expected):
+    assert parse_amount(text) == expected
+
+
+@pytest.mark.parametrize('text', ['', 'abc', '1,2,3.4.5', 'inf', 'nan', '1e999', '1_000', '--1'])
+def test_invalid_inputs(text):
+    with pytest.raises(ValueError):
+        parse_amount(text)
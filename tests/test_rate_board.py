@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Tasa compartida entre instancias: publicación, lectura y cierre mientras otro hilo publica.
+import threading
+
+import pytest
+
+from rate_board import RateBoard
+
+
+@pytest.fixture
+def board(tmp_path):
+    board = RateBoard(str(tmp_path / 'board.bin')).open()
+    assert board.enabled
+    yield board
+    board.close()
+
+
+def test_writer_publishes_and_reader_sees_it(board, tmp_path):
+    assert board.acquire_writer()
+    version = board.publish({'USD': 36.5, 'EUR': 40.0}, 1000.0, 'local')
+    reader = RateBoard(board.path).open()
+    assert not reader.acquire_writer() # Solo hay un escritor
+    record = reader.read()
+    assert record.version == version and record.prices == {'USD': 36.5, 'EUR': 40.0}
+    assert record.fetched_at == 1000.0 and record.source == 'local'
+    reader.close()
+
+
+def test_publish_after_close_is_ignored(board):
+    assert board.acquire_writer()
+    board.close()
+    assert board.publish({'USD': 36.5}) is None
+    assert board.read() is None and board.version() == 0
+
+
+def test_close_while_another_thread_publishes(board):
+    assert board.acquire_writer()
+    errors = []
+    started = threading.Event()
+
+    def publish_forever():
+        started.set()
+        try:
+            while board.publish({'USD': 36.5}) is not None:
+                pass
+        except Exception as e: # Antes del cierre con lock: ValueError de mmap cerrado
+            errors.append(e)
+
+    thread = threading.Thread(target=publish_forever)
+    thread.start()
+    started.wait()
+    board.close()
+    thread.join(5)
+    assert not thread.is_alive() and errors == []
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Historial de tasas: búsquedas por fecha mientras los hilos de descarga añaden registros.
+import threading
+
+from rate_history import RateHistory
+
+
+def test_rate_on_returns_the_rate_in_effect(tmp_path):
+    history = RateHistory(str(tmp_path / 'history.bin'))
+    history.append('10/01/2024', 36.5)
+    history.append('05/01/2024', 36.0)
+    assert history.rate_on('04/01/2024') == 0
+    assert history.rate_on('07/01/2024') == 36.0
+    assert history.rate_on('2024-01-31') == 36.5
+    assert history.rate_on('no es fecha') == 0
+
+
+def test_rate_on_waits_for_an_append_in_progress(tmp_path):
+    history = RateHistory(str(tmp_path / 'history.bin'))
+    history.append('05/01/2024', 36.0)
+    results = []
+    with history._lock: # Como un append() a medio insertar en dates y prices
+        reader = threading.Thread(target=lambda: results.append(history.rate_on('07/01/2024')))
+        reader.start()
+        reader.join(timeout=0.2)
+        assert reader.is_alive() and not results
+        history.dates.insert(1, history.dates[0] + 1)
+        history.prices.insert(1, 36.2)
+    reader.join()
+    assert results == [36.2]
+
+
+def test_lookups_stay_consistent_under_concurrent_appends(tmp_path):
+    history = RateHistory(str(tmp_path / 'history.bin'))
+    history.append(800_000, 1.0)
+    errors = []
+
+    def writer():
+        for day in range(1, 500):
+            history.append(800_000 - day, float(day + 1)) # Cada inserción desplaza las dos listas
+
+    def reader():
+        for _ in range(2000):
+            rate = history.rate_on(800_000)
+            if rate != 1.0:
+                errors.append(rate)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors and len(history) == 500
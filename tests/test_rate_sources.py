@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# ProviderPool contra fuentes locales (127.0.0.1) que responden lento, fallan o no traen precio:
+# cancelación del hedging, orden de failover tras errores y preferencia por p50 / tasa de errores.
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('requests')
+
+from fetch_loop import FetchLoop # noqa: E402
+from http_client import HttpClient # noqa: E402
+from rate_sources import ProviderPool, RateProvider # noqa: E402
+
+SLOW_SECONDS = 1.0
+HEDGE_DELAY = 0.2
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """/fast y /slow responden {"price": ...}; /fail responde 503; /empty responde sin precio."""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        name = self.path.strip('/')
+        with self.server.lock:
+            self.server.requests.append(name)
+        if name == 'slow':
+            threading.Event().wait(SLOW_SECONDS)
+        if name == 'fail':
+            status, payload = 503, {'error': 'busy'}
+        elif name == 'empty':
+            status, payload = 200, {}
+        else:
+            status, payload = 200, {'price': '36,50' if name == 'fast' else '40,00'}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = [] # Rutas pedidas, en orden de llegada
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def http():
+    client = HttpClient(connect_timeout=1.0, read_timeout=3.0, retries=0)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def loop():
+    loop = FetchLoop(deliver=lambda callback, result, error: callback(result, error), max_workers=4).start()
+    yield loop
+    loop.stop()
+
+
+def _pool(server, *names):
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    return ProviderPool([RateProvider(name, f"{url}/{name}") for name in names], hedge_delay=HEDGE_DELAY)
+
+
+class _Tracker:
+    """run_blocking que anota qué intentos empezaron y cuáles se cancelaron."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.started = []
+        self.cancelled = []
+
+    async def run_blocking(self, func, provider, *args):
+        self.started.append(provider.name)
+        try:
+            return await self.loop.run_blocking(func, provider, *args)
+        except asyncio.CancelledError:
+            self.cancelled.append(provider.name)
+            raise
+
+
+def _fetch_hedged(loop, pool, http, tracker):
+    start = time.perf_counter()
+    result = loop.submit(pool.fetch_hedged(tracker.run_blocking, http)).result(timeout=10)
+    elapsed = time.perf_counter() - start
+    loop.submit(asyncio.sleep(0.05)).result() # Deja que el bucle procese las cancelaciones
+    return result, elapsed
+
+
+def test_hedge_launches_backup_and_cancels_the_slow_source(server, http, loop):
+    pool = _pool(server, 'slow', 'fast')
+    tracker = _Tracker(loop)
+    (prices, provider), elapsed = _fetch_hedged(loop, pool, http, tracker)
+    assert provider.name == 'fast' and prices == {'USD': 36.5}
+    assert tracker.started == ['slow', 'fast']
+    assert tracker.cancelled == ['slow']
+    assert HEDGE_DELAY <= elapsed < SLOW_SECONDS # No espera a la fuente lenta
+
+
+def test_no_hedge_when_the_preferred_source_answers_in_time(server, http, loop):
+    pool = _pool(server, 'fast', 'slow')
+    tracker = _Tracker(loop)
+    (prices, provider), _ = _fetch_hedged(loop, pool, http, tracker)
+    assert provider.name == 'fast'
+    assert tracker.started == ['fast'] and tracker.cancelled == []
+    assert server.requests == ['fast']
+
+
+def test_hedge_moves_on_immediately_after_an_error(server, http, loop):
+    pool = _pool(server, 'fail', 'fast')
+    tracker = _Tracker(loop)
+    (_, provider), elapsed = _fetch_hedged(loop, pool, http, tracker)
+    assert provider.name == 'fast'
+    assert server.requests == ['fail', 'fast']
+    assert elapsed < HEDGE_DELAY # La falla lanza la siguiente sin esperar hedge_delay
+
+
+def test_hedge_raises_last_error_or_returns_empty(server, http, loop):
+    tracker = _Tracker(loop)
+    with pytest.raises(Exception):
+        _fetch_hedged(loop, _pool(server, 'fail', 'fail'), http, tracker)
+    # Si alguna respondió (sin precio válido) no es un error: no hay tasa
+    assert _fetch_hedged(loop, _pool(server, 'fail', 'empty'), http, tracker)[0] == ({}, None)
+
+
+def test_failover_follows_preference_and_demotes_failing_sources(server, http):
+    pool = _pool(server, 'fail', 'empty', 'fast')
+    for _ in range(3):
+        prices, provider = pool.fetch_failover(http)
+        assert provider.name == 'fast'
+    # Primera consulta en el orden inicial; después 'fail' y 'empty' (100% de errores) pasan al final
+    assert server.requests[:3] == ['fail', 'empty', 'fast']
+    assert [p.name for p in pool.ranked()] == ['fast', 'fail', 'empty']
+    server.requests.clear()
+    assert pool.fetch_failover(http)[1].name == 'fast'
+    assert server.requests == ['fast']
+
+
+def test_failover_raises_last_error_when_all_fail(server, http):
+    pool = _pool(server, 'fail', 'fail')
+    with pytest.raises(Exception):
+        pool.fetch_failover(http)
+    assert pool.stats()['fail']['error_rate'] == 1.0
+
+
+def test_ranking_by_p50_and_error_rate(server, http):
+    pool = _pool(server, 'slow', 'fast', 'unmeasured')
+    pool.attempt(pool.get('slow'), http)
+    for _ in range(3):
+        pool.attempt(pool.get('fast'), http)
+    # Las medidas van primero, de menor a mayor p50; las que no tienen medidas conservan su orden
+    assert [p.name for p in pool.ranked()] == ['fast', 'slow', 'unmeasured']
+    stats = pool.stats()
+    assert stats['fast']['p50_ms'] < stats['slow']['p50_ms']
+    assert stats['unmeasured']['attempts'] == 0
+
+    # Una fuente rápida que falla más de la mitad de las veces pasa detrás de la lenta pero sana
+    for _ in range(4):
+        pool._record(pool.get('fast'), 0.001, False)
+    assert pool.stats()['fast']['error_rate'] > 0.5
+    assert [p.name for p in pool.ranked()] == ['slow', 'unmeasured', 'fast']
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Conversiones de las pantallas (main.py): el monto escrito se lee exacto y solo se redondea el resultado.
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+# main.py crea la ventana al importarse: sin pantalla física y sin leer los argumentos de pytest
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+pytest.importorskip('kivy')
+
+from main import MainScreen, ResultScreen, VesToUsdScreen # noqa: E402
+
+RATE = 36.5
+
+
+def _app():
+    return SimpleNamespace(currency='USD', bcv_rate=RATE, current_conversion_rate=RATE, conversion_date='',
+                           usd_amount=Decimal(0), rate_for_date=lambda date_text, currency='USD': RATE)
+
+
+def _field(text=''):
+    return SimpleNamespace(text=text, hint_text='')
+
+
+def _main_screen(amount):
+    return SimpleNamespace(app=_app(), usd_input=_field(amount), date_input=_field(),
+                           manager=SimpleNamespace(current='main'))
+
+
+def test_usd_amount_is_not_rounded_before_converting():
+    screen = _main_screen('1.005')
+    assert MainScreen.compute_live_result(screen) == ("Bs 36.68",)
+
+    MainScreen.convert_currency(screen, None)
+    assert screen.app.usd_amount == Decimal('1.005') # Exacto, tal como se escribió
+    assert screen.manager.current == 'result'
+
+    result = SimpleNamespace(app=screen.app, bcv_rate_label=_field(), bs_display=_field())
+    ResultScreen.update_bcv_display(result)
+    assert result.bs_display.text == "Bs 36.68" # No 36.87, que sería 1.01 * 36.5
+
+
+def test_invalid_usd_amount_keeps_the_previous_one():
+    screen = _main_screen('abc')
+    assert MainScreen.compute_live_result(screen) == ("Monto inválido",)
+    MainScreen.convert_currency(screen, None)
+    assert (screen.app.usd_amount, screen.manager.current) == (Decimal(0), 'main')
+
+
+def test_ves_amount_is_not_rounded_before_converting():
+    screen = SimpleNamespace(app=_app(), ves_input=_field('0,184'), date_input=_field(), live_conversion=None,
+                             message_label=_field(), usd_result_label=_field())
+    # 0.184 / 36.5 = 0.00504...; redondeando antes el monto a 0.18 daría 0.00
+    assert VesToUsdScreen.compute_live_result(screen) == ("Total en USD: 0.01", "")
+
+    screen.ves_input.text = '0.184'
+    VesToUsdScreen.convert_ves_to_usd(screen, None)
+    assert (screen.usd_result_label.text, screen.message_label.text) == ("Total en USD: 0.01", "")
+
+    screen.ves_input.text = '-1'
+    VesToUsdScreen.convert_ves_to_usd(screen, None)
+    assert screen.message_label.text == "Por favor, ingrese un valor positivo para VES."
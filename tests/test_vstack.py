@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# VStack (main.py): los hijos se vuelven a apilar cuando uno cambia de altura.
+import os
+
+import pytest
+
+# main.py crea la ventana al importarse: sin pantalla física y sin leer los argumentos de pytest
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+pytest.importorskip('kivy')
+
+from kivy.clock import Clock # noqa: E402
+from kivy.uix.widget import Widget # noqa: E402
+
+from main import VStack # noqa: E402
+
+
+def _child(height):
+    return Widget(size_hint=(1, None), height=height)
+
+
+def test_child_resize_restacks_the_children_above():
+    stack = VStack(padding=[0, 5, 0, 5], size=(100, 300))
+    top, bottom = _child(20), _child(30)
+    stack.add_widget(top)
+    stack.add_widget(bottom, gap=10)
+    Clock.tick()
+    assert (bottom.y, top.y, stack.minimum_height) == (5, 45, 70)
+
+    bottom.height = 50
+    Clock.tick()
+    assert (bottom.y, top.y, stack.minimum_height) == (5, 65, 90)
+
+
+def test_child_bindings_are_removed_with_the_child():
+    stack = VStack(size=(100, 300))
+    child = _child(20)
+    stack.add_widget(child)
+    assert stack._trigger_layout in child.get_property_observers('size')
+    stack.remove_widget(child)
+    for name in ('size', 'pos_hint'):
+        assert stack._trigger_layout not in child.get_property_observers(name)